@@ -0,0 +1,20 @@
+"""
+Helpers for the async API views.
+
+Django 5.2 has no async paginator, so ``apaginate`` primes a regular
+``Paginator`` with an ``acount()`` and loads the page with ``async for``.
+Page-number handling (invalid or out-of-range values) therefore matches
+the sync views exactly.
+"""
+
+from django.core.paginator import Paginator
+
+
+async def apaginate(queryset, per_page: int, page_number):
+    """Return ``(paginator, page)`` with ``page.object_list`` already loaded."""
+
+    paginator = Paginator(queryset, per_page)
+    paginator.__dict__["count"] = await queryset.acount()
+    page = paginator.get_page(page_number)
+    page.object_list = [obj async for obj in page.object_list]
+    return paginator, page
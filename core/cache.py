@@ -0,0 +1,141 @@
+"""
+Namespaced, versioned cache keys with single-flight recompute.
+
+Keys are grouped in namespaces (``"pages"``, ``"catalog"``...) that each carry
+a version number stored in the cache. ``bump_namespace`` increments it,
+orphaning every key of that namespace at once without scanning or deleting
+them; old entries simply expire. The version key can itself be culled or
+evicted, so a missing version is re-seeded from the clock (milliseconds)
+rather than restarting at 1, which would revive entries cached under old
+versions.
+
+``get_or_compute`` (and ``aget_or_compute`` for async views) protects hot
+keys from stampedes. When an entry expires
+only one caller recomputes it: threads in this process wait on a lock, and
+other processes see the ``cache.add`` lock and wait briefly for the value
+instead of all hitting the database at the same moment.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+import zlib
+
+from django.core.cache import cache
+
+MISSING = object()
+LOCK_STRIPES = 64
+_local_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+
+def _namespace_key(namespace: str) -> str:
+    return f"ns:{namespace}:version"
+
+
+def _seed_version() -> int:
+    # Larger than any version handed out before, as long as a namespace is
+    # bumped less than once per millisecond on average.
+    return time.time_ns() // 1_000_000
+
+
+def namespace_version(namespace: str) -> int:
+    key = _namespace_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        seed = _seed_version()
+        # Another process may have seeded it first; use theirs.
+        version = seed if cache.add(key, seed, None) else (cache.get(key) or seed)
+    return version
+
+
+def bump_namespace(namespace: str) -> None:
+    try:
+        cache.incr(_namespace_key(namespace))
+    except ValueError:
+        cache.set(_namespace_key(namespace), _seed_version(), None)
+
+
+def versioned_key(namespace: str, *parts) -> str:
+    return ":".join([namespace, f"v{namespace_version(namespace)}", *map(str, parts)])
+
+
+async def anamespace_version(namespace: str) -> int:
+    key = _namespace_key(namespace)
+    version = await cache.aget(key)
+    if version is None:
+        seed = _seed_version()
+        version = seed if await cache.aadd(key, seed, None) else (await cache.aget(key) or seed)
+    return version
+
+
+async def aversioned_key(namespace: str, *parts) -> str:
+    version = await anamespace_version(namespace)
+    return ":".join([namespace, f"v{version}", *map(str, parts)])
+
+
+def get_or_compute(key: str, compute, timeout, *, lock_timeout: int = 30, wait: float = 5.0):
+    """Return the cached value for ``key``, computing it at most once across callers."""
+
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        return value
+
+    with _local_locks[zlib.crc32(key.encode()) % LOCK_STRIPES]:
+        value = cache.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        lock_key = f"{key}:lock"
+        owns_lock = cache.add(lock_key, 1, lock_timeout)
+        if not owns_lock:
+            # Another process is recomputing; give it a moment to publish.
+            deadline = time.monotonic() + wait
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                value = cache.get(key, MISSING)
+                if value is not MISSING:
+                    return value
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+        finally:
+            if owns_lock:
+                cache.delete(lock_key)
+        return value
+
+
+_async_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+async def aget_or_compute(key: str, compute, timeout, *, lock_timeout: int = 30, wait: float = 5.0):
+    """Async ``get_or_compute``: ``compute`` is a coroutine function run by a single caller."""
+
+    value = await cache.aget(key, MISSING)
+    if value is not MISSING:
+        return value
+
+    lock = _async_locks.get(key)
+    if lock is None:
+        lock = _async_locks[key] = asyncio.Lock()
+    async with lock:
+        value = await cache.aget(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        lock_key = f"{key}:lock"
+        owns_lock = await cache.aadd(lock_key, 1, lock_timeout)
+        if not owns_lock:
+            deadline = time.monotonic() + wait
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                value = await cache.aget(key, MISSING)
+                if value is not MISSING:
+                    return value
+        try:
+            value = await compute()
+            await cache.aset(key, value, timeout)
+        finally:
+            if owns_lock:
+                await cache.adelete(lock_key)
+        return value
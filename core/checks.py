@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.checks import Info, Warning, register
+
+from vacathon.db_config import describe_database
+
+
+@register("database_settings")
+def check_database_settings(app_configs, **kwargs):
+    """Flag connection settings that cost a new connection (or lock errors) per request."""
+
+    return database_settings_warnings(settings.DATABASES)
+
+
+def database_settings_warnings(databases):
+    messages = []
+    for alias, config in databases.items():
+        engine = config["ENGINE"]
+        options = config.get("OPTIONS", {})
+        if "postgresql" in engine and not options.get("pool") and config.get("CONN_MAX_AGE", 0) == 0:
+            messages.append(
+                Warning(
+                    f"Database '{alias}' opens a new PostgreSQL connection for every request.",
+                    hint="Set DB_CONN_MAX_AGE (e.g. 60) or DB_POOL=true.",
+                    id="core.W001",
+                )
+            )
+        if "postgresql" in engine and config.get("CONN_MAX_AGE") is None and not config.get("CONN_HEALTH_CHECKS"):
+            messages.append(
+                Warning(
+                    f"Database '{alias}' keeps connections forever without health checks.",
+                    hint="Set DB_CONN_HEALTH_CHECKS=true so dropped connections are replaced.",
+                    id="core.W002",
+                )
+            )
+        if "sqlite3" in engine and "journal_mode=WAL" not in options.get("init_command", ""):
+            messages.append(
+                Warning(
+                    f"SQLite database '{alias}' does not use WAL journaling; concurrent writers will lock.",
+                    hint="Leave SQLITE_JOURNAL_MODE at WAL for development.",
+                    id="core.W003",
+                )
+            )
+    return messages
+
+
+@register("database_settings", deploy=True)
+def report_database_settings(app_configs, **kwargs):
+    """Report the effective connection settings on ``manage.py check --deploy``."""
+
+    return [
+        Info(describe_database(alias, config), id="core.I001")
+        for alias, config in settings.DATABASES.items()
+    ]
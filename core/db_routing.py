@@ -0,0 +1,106 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+Only views wrapped in ``use_read_replica`` read from the replica, and only
+for the catalog and forum apps; sessions, auth and everything written
+alongside a request keep using the primary. ``READ_REPLICA_ALIAS`` set to
+``None`` (no replica configured, or tests) turns routing off entirely.
+
+Replicas lag, so a client that just wrote (registered, posted, liked...)
+gets a short-lived pin cookie from ``ReplicaPinningMiddleware`` and reads
+from the primary until it expires.
+"""
+
+import contextvars
+import functools
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+
+PIN_COOKIE = "vacathon_db_pin"
+
+REPLICA_APPS = {"events", "event_detail", "forum"}
+
+_replica_reads = contextvars.ContextVar("replica_reads", default=False)
+
+
+def replica_alias():
+    return getattr(settings, "READ_REPLICA_ALIAS", None)
+
+
+def is_pinned(request) -> bool:
+    return PIN_COOKIE in request.COOKIES
+
+
+def use_read_replica(view):
+    """Let ``view`` read catalog/forum rows from the replica unless the client is pinned."""
+
+    if iscoroutinefunction(view):
+
+        async def wrapper(request, *args, **kwargs):
+            if not replica_alias() or is_pinned(request):
+                return await view(request, *args, **kwargs)
+            token = _replica_reads.set(True)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+
+        markcoroutinefunction(wrapper)
+    else:
+
+        def wrapper(request, *args, **kwargs):
+            if not replica_alias() or is_pinned(request):
+                return view(request, *args, **kwargs)
+            token = _replica_reads.set(True)
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+
+    return functools.wraps(view)(wrapper)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if not alias or not _replica_reads.get() or model._meta.app_label not in REPLICA_APPS:
+            return None
+        # Reads inside a transaction must see its writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaPinningMiddleware(MiddlewareMixin):
+    """Pin a client to the primary for ``REPLICA_PIN_SECONDS`` after any successful write."""
+
+    def __init__(self, get_response):
+        if not replica_alias():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if request.method in ("GET", "HEAD", "OPTIONS") or response.status_code >= 400:
+            return response
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=getattr(settings, "REPLICA_PIN_SECONDS", 10),
+            httponly=True,
+            secure=settings.SESSION_COOKIE_SECURE,
+            samesite=settings.SESSION_COOKIE_SAMESITE,
+        )
+        return response
@@ -0,0 +1,108 @@
+"""
+Keyed HTML fragment cache for repeated cards and rows.
+
+``render_cached_fragments`` renders one template per object, e.g. an event
+card, and caches each piece under a key built from the object's pk and
+its version attributes (``updated_at``, ``last_activity_at``...). A listing
+page fetches every card with one ``get_many``, renders only the cards whose
+version changed and stores those with one ``set_many``.
+
+Cards also show related rows that carry no version of their own (category
+display names, thread authors). Every key therefore includes the
+``fragments`` namespace version, which ``invalidate_fragments`` bumps when
+such a row changes (``core.signals``).
+"""
+
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from .cache import bump_namespace, namespace_version
+
+
+class FragmentMetrics:
+    """Process-wide hit/miss counters per fragment prefix."""
+
+    def __init__(self):
+        self._counts = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._lock = threading.Lock()
+
+    def record(self, prefix: str, hits: int, misses: int) -> None:
+        with self._lock:
+            counts = self._counts[prefix]
+            counts["hits"] += hits
+            counts["misses"] += misses
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for prefix, counts in self._counts.items():
+                total = counts["hits"] + counts["misses"]
+                result[prefix] = {
+                    **counts,
+                    "hit_ratio": round(counts["hits"] / total, 3) if total else 0.0,
+                }
+            return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+fragment_metrics = FragmentMetrics()
+
+
+def _resolve(obj, path: str):
+    for attr in path.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _version_token(value) -> str:
+    if isinstance(value, datetime):
+        return f"{value.timestamp():.6f}"
+    return str(value)
+
+
+def invalidate_fragments() -> None:
+    bump_namespace("fragments")
+
+
+def fragment_key(prefix: str, template_name: str, obj, version_attrs, generation: int) -> str:
+    version = ":".join(_version_token(_resolve(obj, attr)) for attr in version_attrs)
+    return f"core:fragment:v{generation}:{prefix}:{template_name}:{obj.pk}:{version}"
+
+
+def render_cached_fragments(objects, template_name: str, *, item_name: str, prefix: str, version_attrs, timeout=None):
+    """Return the rendered ``template_name`` for every object, reusing cached pieces."""
+
+    objects = list(objects)
+    if not objects:
+        return []
+    if timeout is None:
+        timeout = getattr(settings, "FRAGMENT_CACHE_TTL", 3600)
+
+    generation = namespace_version("fragments")
+    keys = [fragment_key(prefix, template_name, obj, version_attrs, generation) for obj in objects]
+    cached = cache.get_many(keys)
+    template = None
+    rendered = []
+    fresh = {}
+    for key, obj in zip(keys, objects):
+        html = cached.get(key)
+        if html is None:
+            if template is None:
+                template = get_template(template_name)
+            html = template.render({item_name: obj})
+            fresh[key] = html
+        rendered.append(mark_safe(html))
+
+    if fresh:
+        cache.set_many(fresh, timeout)
+    fragment_metrics.record(prefix, hits=len(objects) - len(fresh), misses=len(fresh))
+    return rendered
@@ -0,0 +1,95 @@
+"""
+Precomputed landing-page data.
+
+The home page shows the same statistics, highlight event and upcoming
+events to every visitor, so they are computed together and cached for
+``HOME_SNAPSHOT_TTL`` seconds in the ``home`` cache namespace. Event writes
+call ``invalidate_home_snapshot`` (see ``core.signals``), so a cache hit
+costs no queries and a miss costs a handful, computed by a single caller
+even when many requests miss at once.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Count, Q, Sum, prefetch_related_objects
+from django.utils import timezone
+
+from events.models import Event
+
+from .cache import bump_namespace, get_or_compute, versioned_key
+
+UPCOMING_LIMIT = 3
+ACTIVE_STATUSES = [Event.Status.UPCOMING, Event.Status.ONGOING]
+
+
+@dataclass
+class HomeSnapshot:
+    total_events: int = 0
+    total_runners: int = 0
+    distinct_cities: int = 0
+    highlight_event: Event | None = None
+    upcoming_events: list[Event] = field(default_factory=list)
+
+
+def snapshot_cache_key(today: date) -> str:
+    return versioned_key("home", "snapshot", today.isoformat())
+
+
+def get_home_snapshot(today: date | None = None) -> HomeSnapshot:
+    today = today or timezone.localdate()
+    return get_or_compute(
+        snapshot_cache_key(today),
+        lambda: build_home_snapshot(today),
+        getattr(settings, "HOME_SNAPSHOT_TTL", 300),
+    )
+
+
+def invalidate_home_snapshot() -> None:
+    bump_namespace("home")
+
+
+def build_home_snapshot(today: date) -> HomeSnapshot:
+    totals = Event.objects.aggregate(
+        total_events=Count("pk"),
+        distinct_cities=Count(
+            "city", distinct=True, filter=Q(city__isnull=False) & ~Q(city="")
+        ),
+        total_runners=Sum("registered_count"),
+    )
+    snapshot = HomeSnapshot(
+        total_events=totals["total_events"],
+        total_runners=totals["total_runners"] or 0,
+        distinct_cities=totals["distinct_cities"],
+    )
+    if not snapshot.total_events:
+        return snapshot
+
+    # One query for the highlight plus the upcoming cards in the common case.
+    active = list(
+        Event.objects.filter(status__in=ACTIVE_STATUSES)
+        .order_by("start_date", "-popularity_score")[: UPCOMING_LIMIT + 1]
+    )
+    if active:
+        highlight, upcoming = active[0], active[1:]
+    else:
+        highlight = (
+            Event.objects.filter(start_date__lte=today)
+            .order_by("-start_date", "-popularity_score")
+            .first()
+        ) or Event.objects.order_by("start_date").first()
+        upcoming = []
+
+    if len(upcoming) < UPCOMING_LIMIT:
+        already_ids = [highlight.pk] + [event.pk for event in upcoming]
+        upcoming.extend(
+            Event.objects.exclude(pk__in=already_ids)
+            .exclude(status__in=ACTIVE_STATUSES)
+            .order_by("start_date")[: UPCOMING_LIMIT - len(upcoming)]
+        )
+
+    snapshot.highlight_event = highlight
+    snapshot.upcoming_events = upcoming
+    prefetch_related_objects([highlight, *upcoming], "categories")
+    return snapshot
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import connections
+
+SLOWEST_STATEMENTS = 5
+SQL_PREVIEW_LENGTH = 300
+
+_active_recorders: ContextVar[tuple] = ContextVar("active_query_recorders", default=())
+
+
+class QueryRecorder:
+    """
+    ``connection.execute_wrapper`` hook that records every statement a
+    request runs: count, total time, repeated SQL and the slowest ones.
+
+    Repeated statements are counted on the parameterised SQL, so the same
+    lookup executed once per row (the classic N+1) shows up as duplicates
+    even though each execution has different parameters.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+        self.slowest: list[tuple[float, str]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            self.statements[sql] += 1
+            if len(self.slowest) < SLOWEST_STATEMENTS or elapsed > self.slowest[-1][0]:
+                self.slowest.append((elapsed, sql))
+                self.slowest.sort(key=lambda item: item[0], reverse=True)
+                del self.slowest[SLOWEST_STATEMENTS:]
+
+    @property
+    def duplicates(self) -> int:
+        return self.count - len(self.statements)
+
+    def server_timing(self, total_seconds: float | None = None) -> str:
+        metrics = [
+            f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"',
+            f'db-dup;desc="{self.duplicates} duplicate queries"',
+        ]
+        if total_seconds is not None:
+            metrics.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+def _dispatch(execute, sql, params, many, context):
+    for recorder in _active_recorders.get():
+        execute = partial(recorder, execute)
+    return execute(sql, params, many, context)
+
+
+def install_dispatch(connection) -> None:
+    """Route ``connection``'s queries to the recorders active in the calling context."""
+
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+@contextmanager
+def recording(recorder: QueryRecorder):
+    """
+    Feed every query run in this context to ``recorder``.
+
+    Connections are per thread, and async views run their ORM calls on an
+    executor thread, so a wrapper installed on the calling thread's
+    connection would miss them. Every connection instead carries the same
+    dispatcher (``core.signals`` installs it when a connection opens), which
+    finds the active recorders through a context variable that
+    ``sync_to_async`` carries over to the executor thread.
+    """
+
+    for alias in connections:
+        install_dispatch(connections[alias])
+    token = _active_recorders.set((*_active_recorders.get(), recorder))
+    try:
+        yield recorder
+    finally:
+        _active_recorders.reset(token)
+
+
+class QueryStatsStore:
+    """Rolling, thread-safe window of recent request samples per view."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name: str, recorder: QueryRecorder, total_seconds: float) -> None:
+        sample = {
+            "queries": recorder.count,
+            "db_ms": recorder.duration * 1000,
+            "total_ms": total_seconds * 1000,
+            "duplicates": recorder.duplicates,
+            "slowest": [
+                (elapsed * 1000, sql[:SQL_PREVIEW_LENGTH]) for elapsed, sql in recorder.slowest
+            ],
+        }
+        with self._lock:
+            samples = self._samples.get(view_name)
+            if samples is None:
+                samples = self._samples[view_name] = deque(maxlen=self.window)
+            samples.append(sample)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self) -> list[dict]:
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+
+        views = []
+        for name, samples in snapshot.items():
+            queries = sorted(sample["queries"] for sample in samples)
+            db_times = sorted(sample["db_ms"] for sample in samples)
+            slowest = {}
+            for sample in samples:
+                for elapsed, sql in sample["slowest"]:
+                    if elapsed > slowest.get(sql, -1):
+                        slowest[sql] = elapsed
+            views.append(
+                {
+                    "view": name,
+                    "requests": len(samples),
+                    "queries_avg": round(sum(queries) / len(queries), 2),
+                    "queries_max": queries[-1],
+                    "db_ms_avg": round(sum(db_times) / len(db_times), 3),
+                    "db_ms_p95": round(_percentile(db_times, 0.95), 3),
+                    "total_ms_avg": round(
+                        sum(sample["total_ms"] for sample in samples) / len(samples), 3
+                    ),
+                    "duplicates_max": max(sample["duplicates"] for sample in samples),
+                    "slowest": [
+                        {"sql": sql, "ms": round(elapsed, 3)}
+                        for sql, elapsed in sorted(
+                            slowest.items(), key=lambda item: item[1], reverse=True
+                        )[:SLOWEST_STATEMENTS]
+                    ],
+                }
+            )
+        views.sort(key=lambda view: view["db_ms_avg"] * view["requests"], reverse=True)
+        return views
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+query_stats = QueryStatsStore()
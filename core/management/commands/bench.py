@@ -0,0 +1,223 @@
+import gc
+import json
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from core.instrumentation import QueryRecorder, recording
+from core.query_budget import ROUTE_BUDGETS, seed_route_dataset
+
+BENCH_ROUTES = [
+    "core:home",
+    "events:json",
+    "event_detail:detail-json",
+    "forum:threads-json",
+    "forum:api-thread-posts",
+    "notifications:inbox-json",
+    "profiles:profile-json",
+]
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))
+    return {
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p95_ms": round(ordered[p95_index], 3),
+        "max_ms": round(ordered[-1], 3),
+        "stdev_ms": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+    }
+
+
+@contextmanager
+def throwaway_dataset(scale: int, stdout=None):
+    """
+    Create a throwaway test database seeded at ``scale`` and yield the
+    ``RouteDataset``, so benchmarks never touch real data and runs are
+    comparable.
+    """
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        started = time.perf_counter()
+        dataset = seed_route_dataset(scale)
+        if stdout is not None:
+            stdout.write(f"Seeded scale {scale} dataset in {time.perf_counter() - started:.1f}s.")
+        yield dataset
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+class Command(BaseCommand):
+    help = "Benchmark the hot endpoints in-process and compare against a stored JSON baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=30, help="Timed runs per endpoint (default: 30).")
+        parser.add_argument("--warmup", type=int, default=5, help="Untimed runs per endpoint (default: 5).")
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=50,
+            help="Dataset scale passed to the route dataset generator (default: 50).",
+        )
+        parser.add_argument(
+            "--route",
+            action="append",
+            choices=BENCH_ROUTES,
+            help="Only benchmark this route (repeatable).",
+        )
+        parser.add_argument(
+            "--baseline",
+            default=str(DEFAULT_BASELINE),
+            help=f"Baseline JSON file (default: {DEFAULT_BASELINE}).",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Write the results as the new baseline instead of comparing.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed relative slowdown of the median before flagging a regression (default: 0.25).",
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help=(
+                "Clear the cache before every timed request, so cached routes (core:home, "
+                "events:json) are measured on their query path instead of as cache hits."
+            ),
+        )
+        parser.add_argument("--output", help="Also write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1 or options["warmup"] < 0:
+            raise CommandError("--iterations must be positive and --warmup non-negative.")
+
+        routes = options["route"] or BENCH_ROUTES
+        budgets = {budget.name: budget for budget in ROUTE_BUDGETS}
+
+        with throwaway_dataset(options["scale"], self.stdout) as dataset:
+            results = {
+                name: self._bench_route(
+                    budgets[name], dataset, options["warmup"], options["iterations"], cold=options["cold"]
+                )
+                for name in routes
+            }
+
+        report = {
+            "scale": options["scale"],
+            "iterations": options["iterations"],
+            "warmup": options["warmup"],
+            "cold": options["cold"],
+            "routes": results,
+        }
+        if options["output"]:
+            self._write_json(Path(options["output"]), report)
+
+        baseline_path = Path(options["baseline"])
+        if options["save_baseline"]:
+            self._write_json(baseline_path, report)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}."))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; run with --save-baseline to create one.")
+            return
+        self._compare(report, json.loads(baseline_path.read_text()), options["threshold"])
+
+    def _bench_route(self, budget, dataset, warmup, iterations, *, cold=False):
+        client = Client()
+        if budget.user == "member":
+            client.force_login(dataset.member)
+        elif budget.user == "staff":
+            client.force_login(dataset.staff)
+        url = reverse(budget.name, kwargs=budget.kwargs(dataset))
+
+        for _ in range(warmup):
+            client.get(url)
+
+        samples = []
+        recorder = QueryRecorder()
+        # Like timeit, keep the garbage collector from landing in random samples.
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(iterations):
+                if cold:
+                    cache.clear()
+                with recording(recorder):
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    samples.append((time.perf_counter() - started) * 1000)
+                if response.status_code != budget.expected_status:
+                    raise CommandError(f"{budget.name} returned {response.status_code} for {url}.")
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        stats = summarize(samples)
+        stats["queries"] = recorder.count // iterations
+        self.stdout.write(
+            f"  {budget.name:<28} median {stats['median_ms']:>8.2f}ms  "
+            f"p95 {stats['p95_ms']:>8.2f}ms  {stats['queries']} queries"
+        )
+        return stats
+
+    def _compare(self, report, baseline, threshold):
+        regressions = []
+        for name, current in report["routes"].items():
+            previous = baseline.get("routes", {}).get(name)
+            if not previous:
+                self.stdout.write(f"  {name}: not in baseline")
+                continue
+            change = (current["median_ms"] - previous["median_ms"]) / previous["median_ms"]
+            line = (
+                f"  {name}: median {previous['median_ms']:.2f}ms -> {current['median_ms']:.2f}ms "
+                f"({change:+.0%}), queries {previous['queries']} -> {current['queries']}"
+            )
+            if change > threshold or current["queries"] > previous["queries"]:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if baseline.get("cold", False) != report.get("cold", False):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Baseline was recorded {'cold' if baseline.get('cold') else 'warm'}, "
+                    f"this run was {'cold' if report.get('cold') else 'warm'}; use the same --cold setting."
+                )
+            )
+        if baseline.get("scale") != report["scale"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Baseline was recorded at scale {baseline.get('scale')}, this run used {report['scale']}."
+                )
+            )
+        if regressions:
+            raise CommandError(f"Regressions beyond {threshold:.0%}: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def _write_json(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
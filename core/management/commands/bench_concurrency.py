@@ -0,0 +1,199 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncRequestFactory, Client, RequestFactory
+from django.urls import ResolverMatch, reverse
+
+from core.management.commands.bench import summarize, throwaway_dataset
+from core.middleware import sync_only_middleware
+from core.query_budget import ROUTE_BUDGETS
+from event_detail.views import (
+    event_availability_json,
+    event_availability_json_async,
+    event_detail_json,
+    event_detail_json_async,
+)
+from events.views import events_json, events_json_async
+from forum.views import threads_json, threads_json_async
+from notifications.views import notifications_json, notifications_json_async
+
+# route name -> (sync view, async view)
+ASYNC_API_ROUTES = {
+    "events:json": (events_json, events_json_async),
+    "event_detail:detail-json": (event_detail_json, event_detail_json_async),
+    "event_detail:availability-json": (event_availability_json, event_availability_json_async),
+    "forum:threads-json": (threads_json, threads_json_async),
+    "notifications:inbox-json": (notifications_json, notifications_json_async),
+}
+
+# wsgi:      sync view on a pool of N threads (gunicorn gthread / runserver).
+# asgi:      async view, N requests in flight on one event loop (uvicorn with ASYNC_API_VIEWS).
+# asgi-sync: sync view adapted the way ASGI runs it without ASYNC_API_VIEWS.
+MODES = ("wsgi", "asgi", "asgi-sync")
+
+
+class ViewHandler(BaseHandler):
+    """
+    The project's real ``MIDDLEWARE`` stack in front of one fixed view,
+    loaded in sync (WSGI) or async (ASGI) mode. Sync-only middleware is
+    adapted exactly as under a real server, so its cost shows up here.
+    """
+
+    def __init__(self, view, view_kwargs, *, is_async):
+        super().__init__()
+        self.view = view
+        self.view_kwargs = view_kwargs
+        self.load_middleware(is_async=is_async)
+
+    def resolve_request(self, request):
+        match = ResolverMatch(self.view, (), self.view_kwargs)
+        request.resolver_match = match
+        return match
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync (WSGI) and async (ASGI) JSON API views under concurrent load, "
+        "in-process through the full middleware stack against a throwaway seeded database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            action="append",
+            help="Requests in flight at once (repeatable; default: 1, 8 and 32).",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Requests per route and level (default: 200).")
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=20,
+            help="Dataset scale passed to the route dataset generator (default: 20).",
+        )
+        parser.add_argument(
+            "--route",
+            action="append",
+            choices=sorted(ASYNC_API_ROUTES),
+            help="Only benchmark this route (repeatable).",
+        )
+        parser.add_argument("--mode", action="append", choices=MODES, help="Only run this mode (repeatable).")
+        parser.add_argument("--output", help="Also write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        levels = options["concurrency"] or [1, 8, 32]
+        if options["requests"] < 1 or min(levels) < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+
+        routes = options["route"] or list(ASYNC_API_ROUTES)
+        modes = options["mode"] or list(MODES)
+        budgets = {budget.name: budget for budget in ROUTE_BUDGETS}
+
+        blocking = sync_only_middleware()
+        if blocking:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Sync-only middleware puts every ASGI request on a thread: {', '.join(blocking)}."
+                )
+            )
+
+        results = {}
+        with throwaway_dataset(options["scale"], self.stdout) as dataset:
+            for name in routes:
+                budget = budgets[name]
+                user = {"member": dataset.member, "staff": dataset.staff}.get(budget.user)
+                cookies = self._session_cookies(user)
+                kwargs = budget.kwargs(dataset)
+                url = reverse(name, kwargs=kwargs)
+                sync_view, async_view = ASYNC_API_ROUTES[name]
+                results[name] = {}
+                for mode in modes:
+                    results[name][mode] = {}
+                    view = async_view if mode == "asgi" else sync_view
+                    handler = ViewHandler(view, kwargs, is_async=mode != "wsgi")
+                    for level in levels:
+                        call = (url, cookies, budget.expected_status)
+                        stats = self._run(mode, handler, call, level, options["requests"])
+                        results[name][mode][str(level)] = stats
+                        self.stdout.write(
+                            f"  {name:<32} {mode:<9} c={level:<4} {stats['throughput_rps']:>9.1f} req/s  "
+                            f"median {stats['median_ms']:>8.2f}ms  p95 {stats['p95_ms']:>8.2f}ms"
+                        )
+
+        report = {
+            "scale": options["scale"],
+            "requests": options["requests"],
+            "concurrency": levels,
+            "sync_only_middleware": blocking,
+            "routes": results,
+        }
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+    def _session_cookies(self, user):
+        if user is None:
+            return {}
+        client = Client()
+        client.force_login(user)
+        return {settings.SESSION_COOKIE_NAME: client.cookies[settings.SESSION_COOKIE_NAME].value}
+
+    def _run(self, mode, handler, call, concurrency, total):
+        # Every run starts cold so cached routes (events:json) pay one rebuild.
+        cache.clear()
+        if mode == "wsgi":
+            samples, elapsed = self._run_threads(handler, call, concurrency, total)
+        else:
+            samples, elapsed = asyncio.run(self._run_async(handler, call, concurrency, total))
+        stats = summarize(samples)
+        stats["throughput_rps"] = round(total / elapsed, 1)
+        return stats
+
+    def _run_threads(self, handler, call, concurrency, total):
+        url, cookies, expected_status = call
+        factory = RequestFactory()
+        for key, value in cookies.items():
+            factory.cookies[key] = value
+
+        def one_request(_):
+            request = factory.get(url)
+            started = time.perf_counter()
+            response = handler.get_response(request)
+            duration = (time.perf_counter() - started) * 1000
+            if response.status_code != expected_status:
+                raise CommandError(f"{url} returned {response.status_code}.")
+            return duration
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(one_request, range(total)))
+        return samples, time.perf_counter() - started
+
+    async def _run_async(self, handler, call, concurrency, total):
+        url, cookies, expected_status = call
+        factory = AsyncRequestFactory()
+        for key, value in cookies.items():
+            factory.cookies[key] = value
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one_request():
+            async with slots:
+                request = factory.get(url)
+                started = time.perf_counter()
+                response = await handler.get_response_async(request)
+                duration = (time.perf_counter() - started) * 1000
+            if response.status_code != expected_status:
+                raise CommandError(f"{url} returned {response.status_code}.")
+            return duration
+
+        started = time.perf_counter()
+        samples = await asyncio.gather(*(one_request() for _ in range(total)))
+        return list(samples), time.perf_counter() - started
@@ -0,0 +1,579 @@
+import random
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.page_cache import invalidate_event_pages
+from event_detail.models import AidStation, EventSchedule, RouteSegment
+from events.models import Event, EventCategory
+from forum.models import ForumPost, ForumThread
+from notifications.models import Notification
+from profiles.models import UserProfile, UserRaceHistory
+from profiles.stats import rebuild as rebuild_dashboard_stats
+from registrations.models import EventRegistration
+
+User = get_user_model()
+
+CATEGORY_SPECS = [
+    ("5k", "5K Fun Run", Decimal("5.00")),
+    ("10k", "10K Run", Decimal("10.00")),
+    ("21k", "Half Marathon", Decimal("21.10")),
+    ("42k", "Full Marathon", Decimal("42.20")),
+    ("50k", "50K Ultra", Decimal("50.00")),
+    ("100k", "100K Ultra", Decimal("100.00")),
+]
+
+CITIES = [
+    ("Jakarta", "Indonesia"),
+    ("Bandung", "Indonesia"),
+    ("Surabaya", "Indonesia"),
+    ("Denpasar", "Indonesia"),
+    ("Yogyakarta", "Indonesia"),
+    ("Singapore", "Singapore"),
+    ("Kuala Lumpur", "Malaysia"),
+    ("Bangkok", "Thailand"),
+    ("Tokyo", "Japan"),
+    ("Sydney", "Australia"),
+    ("Berlin", "Germany"),
+    ("Boston", "United States"),
+]
+
+TITLE_WORDS = ["Sunrise", "Coastal", "Highland", "Heritage", "Night", "Volcano", "River", "Jungle"]
+TITLE_KINDS = ["Marathon", "Ultra", "Trail Run", "City Run", "Relay"]
+
+# (status, weight) mixes observed on real events.
+REGISTRATION_STATUS_MIX = [
+    (EventRegistration.Status.CONFIRMED, 55),
+    (EventRegistration.Status.PENDING, 25),
+    (EventRegistration.Status.WAITLISTED, 8),
+    (EventRegistration.Status.CANCELLED, 7),
+    (EventRegistration.Status.REJECTED, 5),
+]
+
+HISTORY_STATUS_BY_REGISTRATION = {
+    EventRegistration.Status.CONFIRMED: UserRaceHistory.Status.UPCOMING,
+    EventRegistration.Status.CANCELLED: UserRaceHistory.Status.DNS,
+    EventRegistration.Status.REJECTED: UserRaceHistory.Status.DNS,
+}
+
+
+def zipf_cum_weights(size: int, exponent: float) -> list[float]:
+    """Cumulative power-law weights: item ``i`` is drawn proportionally to 1 / (i + 1) ** exponent."""
+
+    return list(accumulate(1.0 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+def draw_index(rng: random.Random, cum_weights: list[float]) -> int:
+    return bisect_left(cum_weights, rng.random() * cum_weights[-1])
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk inserts keep generated created_at values instead of ``now()``."""
+
+    patched = []
+    for model in models:
+        for model_field in model._meta.concrete_fields:
+            for flag in ("auto_now", "auto_now_add"):
+                if getattr(model_field, flag, False):
+                    setattr(model_field, flag, False)
+                    patched.append((model_field, flag))
+    try:
+        yield
+    finally:
+        for model_field, flag in patched:
+            setattr(model_field, flag, True)
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible synthetic dataset for load testing and benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument("--events", type=int, default=200, help="Number of events (default: 200).")
+        parser.add_argument("--users", type=int, default=1000, help="Number of users (default: 1000).")
+        parser.add_argument(
+            "--registrations",
+            type=int,
+            help="Number of registrations (default: 3 per user).",
+        )
+        parser.add_argument("--threads", type=int, help="Number of forum threads (default: 3 per event).")
+        parser.add_argument("--posts", type=int, help="Number of forum posts (default: 8 per thread).")
+        parser.add_argument("--likes", type=int, help="Number of post likes (default: 2 per post).")
+        parser.add_argument(
+            "--notifications",
+            type=int,
+            help="Extra system notifications on top of one per registration (default: 1 per user).",
+        )
+        parser.add_argument(
+            "--anchor-date",
+            type=date.fromisoformat,
+            help="Date the schedule is generated around (default: today).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows per bulk insert (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.seed = options["seed"]
+        self.batch_size = options["batch_size"]
+        self.anchor = options.get("anchor_date") or timezone.localdate()
+        self.anchor_dt = timezone.make_aware(datetime.combine(self.anchor, datetime.min.time()))
+
+        counts = {
+            "events": options["events"],
+            "users": options["users"],
+        }
+        counts["registrations"] = options.get("registrations")
+        if counts["registrations"] is None:
+            counts["registrations"] = counts["users"] * 3
+        counts["threads"] = options.get("threads")
+        if counts["threads"] is None:
+            counts["threads"] = counts["events"] * 3
+        counts["posts"] = options.get("posts")
+        if counts["posts"] is None:
+            counts["posts"] = counts["threads"] * 8
+        counts["likes"] = options.get("likes")
+        if counts["likes"] is None:
+            counts["likes"] = counts["posts"] * 2
+        counts["notifications"] = options.get("notifications")
+        if counts["notifications"] is None:
+            counts["notifications"] = counts["users"]
+
+        if any(value < 0 for value in counts.values()) or self.batch_size < 1:
+            raise CommandError("Counts must be non-negative and --batch-size positive.")
+        if counts["events"] < 1 or counts["users"] < 1:
+            raise CommandError("--events and --users must be at least 1.")
+
+        self.username_prefix = f"gen{self.seed}_"
+        if User.objects.filter(username__startswith=self.username_prefix).exists():
+            raise CommandError(
+                f"A dataset for seed {self.seed} already exists; pick another --seed."
+            )
+
+        self.timings: list[tuple[str, int, float]] = []
+        started = time.perf_counter()
+        with transaction.atomic(), explicit_timestamps(
+            Event, User, UserProfile, EventRegistration, UserRaceHistory,
+            ForumThread, ForumPost, Notification,
+        ):
+            categories = self._step("categories", self._create_categories)
+            event_ids = self._step("events", lambda: self._create_events(counts["events"], categories))
+            self._step("event details", lambda: self._create_event_details(event_ids))
+            user_ids = self._step("users", lambda: self._create_users(counts["users"]))
+            profile_ids = self._step("profiles", lambda: self._create_profiles(user_ids))
+            registrations = self._step(
+                "registrations",
+                lambda: self._create_registrations(counts["registrations"], event_ids, user_ids, categories),
+            )
+            self._step("race history", lambda: self._create_history(registrations, profile_ids))
+            self._step("event counters", lambda: self._refresh_event_counters(event_ids))
+            # Bulk inserts skip the signals that keep the dashboard rollups current.
+            self._step("dashboard stats", lambda: sum(rebuild_dashboard_stats()))
+            thread_ids = self._step("threads", lambda: self._create_threads(counts["threads"], event_ids, user_ids))
+            post_ids = self._step("posts", lambda: self._create_posts(counts["posts"], thread_ids, user_ids))
+            self._step("likes", lambda: self._create_likes(counts["likes"], post_ids, user_ids))
+            self._step(
+                "notifications",
+                lambda: self._create_notifications(counts["notifications"], registrations, user_ids),
+            )
+
+        # Bulk inserts bypass the Event signals.
+        invalidate_event_pages()
+        elapsed = time.perf_counter() - started
+        total_rows = sum(rows for _, rows, _ in self.timings)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {total_rows} rows in {elapsed:.1f}s "
+                f"({total_rows / elapsed if elapsed else total_rows:.0f} rows/s, seed {self.seed})."
+            )
+        )
+
+    def _step(self, label, func):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        rows = result if isinstance(result, int) else len(result)
+        self.timings.append((label, rows, elapsed))
+        self.stdout.write(f"  {label}: {rows} rows in {elapsed:.2f}s")
+        return result
+
+    def _bulk_create(self, model, objects):
+        created = []
+        for start in range(0, len(objects), self.batch_size):
+            created.extend(model.objects.bulk_create(objects[start:start + self.batch_size]))
+        return created
+
+    def _random_moment(self, start_offset_days: int, end_offset_days: int) -> datetime:
+        seconds = self.rng.randint(start_offset_days * 86400, end_offset_days * 86400)
+        return self.anchor_dt + timedelta(seconds=seconds)
+
+    def _create_categories(self):
+        categories = []
+        for name, display_name, distance_km in CATEGORY_SPECS:
+            category, _ = EventCategory.objects.get_or_create(
+                display_name=display_name,
+                defaults={"name": name, "distance_km": distance_km},
+            )
+            categories.append(category)
+        return categories
+
+    def _create_events(self, total, categories):
+        rng = self.rng
+        slugs = Event.slug_allocator()
+        event_ids = []
+        through = Event.categories.through
+        for start in range(0, total, self.batch_size):
+            events = []
+            for index in range(start, min(start + self.batch_size, total)):
+                city, country = rng.choice(CITIES)
+                start_offset = rng.randint(-365, 365)
+                start_date = self.anchor + timedelta(days=start_offset)
+                end_date = start_date + timedelta(days=rng.randint(0, 2))
+                if end_date < self.anchor:
+                    status = Event.Status.COMPLETED
+                elif start_date > self.anchor:
+                    status = Event.Status.UPCOMING
+                else:
+                    status = Event.Status.ONGOING
+                title = f"{city} {rng.choice(TITLE_WORDS)} {rng.choice(TITLE_KINDS)} {start_date.year} #{index}"
+                published = min(start_offset, 0)
+                created_at = self._random_moment(published - 240, published - 60)
+                events.append(
+                    Event(
+                        title=title,
+                        description=f"Synthetic load-test event {index} in {city}.",
+                        city=city,
+                        country=country,
+                        venue=f"{city} Stadium",
+                        start_date=start_date,
+                        end_date=end_date if end_date != start_date else None,
+                        registration_open_date=start_date - timedelta(days=rng.randint(90, 180)),
+                        registration_deadline=start_date - timedelta(days=rng.randint(7, 30)),
+                        status=status,
+                        popularity_score=int(1000 / (1 + index % 97)),
+                        participant_limit=rng.choice([500, 1000, 2500, 5000, 10000]),
+                        featured=rng.random() < 0.05,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                )
+            slugs.prime(event.title for event in events)
+            for event in events:
+                event.slug = slugs.allocate(event.title)
+            created = Event.objects.bulk_create(events)
+            event_ids.extend(event.pk for event in created)
+            through.objects.bulk_create(
+                [
+                    through(event_id=event.pk, eventcategory_id=category.pk)
+                    for event in created
+                    for category in rng.sample(categories, rng.randint(1, 3))
+                ]
+            )
+        return event_ids
+
+    def _create_event_details(self, event_ids):
+        rng = self.rng
+        rows = 0
+        for start in range(0, len(event_ids), self.batch_size):
+            schedules, stations, segments = [], [], []
+            for event_id in event_ids[start:start + self.batch_size]:
+                race_day = self._random_moment(-365, 365)
+                for slot in range(rng.randint(2, 4)):
+                    moment = race_day + timedelta(hours=slot * 3)
+                    schedules.append(
+                        EventSchedule(
+                            event_id=event_id,
+                            title=f"Session {slot + 1}",
+                            start_time=moment,
+                            end_time=moment + timedelta(hours=2),
+                        )
+                    )
+                for marker in range(1, rng.randint(3, 8) + 1):
+                    stations.append(
+                        AidStation(
+                            event_id=event_id,
+                            name=f"Aid Station {marker}",
+                            kilometer_marker=Decimal(marker * 5),
+                            supplies="Water, electrolytes, fruit",
+                            is_medical=marker % 3 == 0,
+                        )
+                    )
+                for order in range(1, rng.randint(3, 6) + 1):
+                    segments.append(
+                        RouteSegment(
+                            event_id=event_id,
+                            order=order,
+                            title=f"Segment {order}",
+                            description="Rolling roads with aid every 5 km.",
+                            distance_km=Decimal(rng.randint(3, 12)),
+                            elevation_gain=rng.randint(0, 600),
+                        )
+                    )
+            for model, objects in ((EventSchedule, schedules), (AidStation, stations), (RouteSegment, segments)):
+                rows += len(self._bulk_create(model, objects))
+        return rows
+
+    def _create_users(self, total):
+        # Hashing once keeps user creation fast; every generated account
+        # logs in with the password "password".
+        password = make_password("password")
+        users = [
+            User(
+                username=f"{self.username_prefix}{index}",
+                email=f"{self.username_prefix}{index}@example.com",
+                password=password,
+                date_joined=self._random_moment(-730, 0),
+            )
+            for index in range(total)
+        ]
+        return [user.pk for user in self._bulk_create(User, users)]
+
+    def _create_profiles(self, user_ids):
+        rng = self.rng
+        profiles = []
+        for user_id in user_ids:
+            city, country = rng.choice(CITIES)
+            moment = self._random_moment(-730, 0)
+            profiles.append(
+                UserProfile(
+                    user_id=user_id,
+                    display_name=f"Runner {user_id}",
+                    city=city,
+                    country=country,
+                    favorite_distance=rng.choice(UserProfile.DISTANCE_CHOICES)[0],
+                    created_at=moment,
+                    updated_at=moment,
+                )
+            )
+        created = self._bulk_create(UserProfile, profiles)
+        return {profile.user_id: profile.pk for profile in created}
+
+    def _create_registrations(self, total, event_ids, user_ids, categories):
+        rng = self.rng
+        event_weights = zipf_cum_weights(len(event_ids), 0.8)
+        status_values = [status for status, _ in REGISTRATION_STATUS_MIX]
+        status_weights = list(accumulate(weight for _, weight in REGISTRATION_STATUS_MIX))
+        capacity = len(event_ids) * len(user_ids)
+        total = min(total, capacity)
+
+        seen = set()
+        registrations = []
+        attempts = 0
+        while len(registrations) < total and attempts < total * 20:
+            attempts += 1
+            user_id = user_ids[rng.randrange(len(user_ids))]
+            event_id = event_ids[draw_index(rng, event_weights)]
+            if (user_id, event_id) in seen:
+                continue
+            seen.add((user_id, event_id))
+            index = len(registrations)
+            status = rng.choices(status_values, cum_weights=status_weights)[0]
+            category = rng.choice(categories)
+            created_at = self._random_moment(-365, 0)
+            registrations.append(
+                EventRegistration(
+                    reference_code=f"GEN{self.seed % 100000:05d}{index:010X}",
+                    user_id=user_id,
+                    event_id=event_id,
+                    category=category,
+                    distance_label=category.display_name,
+                    phone_number="+620000000000",
+                    emergency_contact_name="Emergency Contact",
+                    emergency_contact_phone="+620000000001",
+                    status=status,
+                    payment_status=(
+                        EventRegistration.PaymentStatus.PAID
+                        if status == EventRegistration.Status.CONFIRMED and rng.random() < 0.9
+                        else EventRegistration.PaymentStatus.UNPAID
+                    ),
+                    form_payload={"submitted_via": "generator"},
+                    created_at=created_at,
+                    updated_at=created_at,
+                    confirmed_at=(
+                        created_at + timedelta(days=rng.randint(0, 5))
+                        if status == EventRegistration.Status.CONFIRMED
+                        else None
+                    ),
+                    cancelled_at=(
+                        created_at + timedelta(days=rng.randint(1, 30))
+                        if status == EventRegistration.Status.CANCELLED
+                        else None
+                    ),
+                )
+            )
+        # bulk_create skips EventRegistration.save(), so history rows,
+        # counters and notifications are generated separately below.
+        return self._bulk_create(EventRegistration, registrations)
+
+    def _create_history(self, registrations, profile_ids):
+        rng = self.rng
+        completed_ids = set(
+            Event.objects.filter(
+                pk__in={registration.event_id for registration in registrations},
+                status=Event.Status.COMPLETED,
+            ).values_list("pk", flat=True)
+        )
+        history = []
+        for registration in registrations:
+            status = HISTORY_STATUS_BY_REGISTRATION.get(
+                registration.status, UserRaceHistory.Status.REGISTERED
+            )
+            finish_time = None
+            if status == UserRaceHistory.Status.UPCOMING and registration.event_id in completed_ids:
+                if rng.random() < 0.9:
+                    status = UserRaceHistory.Status.COMPLETED
+                    finish_time = timedelta(minutes=rng.randint(25, 900))
+                else:
+                    status = UserRaceHistory.Status.DNF
+            history.append(
+                UserRaceHistory(
+                    profile_id=profile_ids[registration.user_id],
+                    event_id=registration.event_id,
+                    category=registration.distance_label,
+                    registration_date=registration.created_at.date(),
+                    status=status,
+                    finish_time=finish_time,
+                    updated_at=registration.created_at,
+                )
+            )
+        return len(self._bulk_create(UserRaceHistory, history))
+
+    def _refresh_event_counters(self, event_ids):
+        active = (
+            EventRegistration.objects.filter(
+                event=OuterRef("pk"),
+                status__in=EventRegistration.SLOT_STATUSES,
+            )
+            .order_by()
+            .values("event")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Event.objects.filter(pk__in=event_ids).update(
+            registered_count=Coalesce(Subquery(active), 0)
+        )
+
+    def _create_threads(self, total, event_ids, user_ids):
+        rng = self.rng
+        slugs = ForumThread.slug_allocator()
+        event_weights = zipf_cum_weights(len(event_ids), 1.0)
+        thread_ids = []
+        for start in range(0, total, self.batch_size):
+            threads = []
+            for index in range(start, min(start + self.batch_size, total)):
+                created_at = self._random_moment(-365, 0)
+                threads.append(
+                    ForumThread(
+                        event_id=event_ids[draw_index(rng, event_weights)],
+                        author_id=user_ids[rng.randrange(len(user_ids))],
+                        title=f"{rng.choice(TITLE_WORDS)} race tips #{index}",
+                        body="Synthetic discussion thread.",
+                        created_at=created_at,
+                        updated_at=created_at,
+                        last_activity_at=created_at,
+                        is_pinned=rng.random() < 0.02,
+                        view_count=int(5000 / (1 + index % 500)),
+                    )
+                )
+            slugs.prime(thread.title for thread in threads)
+            for thread in threads:
+                thread.slug = slugs.allocate(thread.title)
+            thread_ids.extend(thread.pk for thread in ForumThread.objects.bulk_create(threads))
+        return thread_ids
+
+    def _create_posts(self, total, thread_ids, user_ids):
+        if not thread_ids:
+            return []
+        rng = self.rng
+        thread_weights = zipf_cum_weights(len(thread_ids), 1.1)
+        roots_by_thread: dict[int, list[int]] = {}
+        post_ids = []
+        reply_share = 0.3
+        root_total = total - int(total * reply_share)
+
+        for phase_total, replies in ((root_total, False), (total - root_total, True)):
+            for start in range(0, phase_total, self.batch_size):
+                posts = []
+                for _ in range(start, min(start + self.batch_size, phase_total)):
+                    thread_id = thread_ids[draw_index(rng, thread_weights)]
+                    parent_id = None
+                    if replies and roots_by_thread.get(thread_id):
+                        parent_id = rng.choice(roots_by_thread[thread_id])
+                    created_at = self._random_moment(-365, 0)
+                    posts.append(
+                        ForumPost(
+                            thread_id=thread_id,
+                            author_id=user_ids[rng.randrange(len(user_ids))],
+                            parent_id=parent_id,
+                            content="Synthetic forum reply.",
+                            created_at=created_at,
+                            updated_at=created_at,
+                        )
+                    )
+                for post in ForumPost.objects.bulk_create(posts):
+                    post_ids.append(post.pk)
+                    if not replies:
+                        roots_by_thread.setdefault(post.thread_id, []).append(post.pk)
+        return post_ids
+
+    def _create_likes(self, total, post_ids, user_ids):
+        if not post_ids:
+            return 0
+        rng = self.rng
+        through = ForumPost.likes.through
+        post_weights = zipf_cum_weights(len(post_ids), 1.2)
+        total = min(total, len(post_ids) * len(user_ids))
+        seen = set()
+        attempts = 0
+        while len(seen) < total and attempts < total * 20:
+            attempts += 1
+            seen.add((post_ids[draw_index(rng, post_weights)], user_ids[rng.randrange(len(user_ids))]))
+        likes = [through(forumpost_id=post_id, user_id=user_id) for post_id, user_id in sorted(seen)]
+        return len(self._bulk_create(through, likes))
+
+    def _create_notifications(self, extra_total, registrations, user_ids):
+        rng = self.rng
+        notifications = []
+        for registration in registrations:
+            is_read = rng.random() < 0.6
+            notifications.append(
+                Notification(
+                    recipient_id=registration.user_id,
+                    title="Registration received",
+                    message="Your registration is pending confirmation.",
+                    category=Notification.Category.REGISTRATION,
+                    link_url=f"/register/account/registrations/{registration.reference_code}/",
+                    is_read=is_read,
+                    created_at=registration.created_at,
+                    read_at=registration.created_at + timedelta(days=1) if is_read else None,
+                )
+            )
+        for _ in range(extra_total):
+            created_at = self._random_moment(-180, 0)
+            notifications.append(
+                Notification(
+                    recipient_id=user_ids[rng.randrange(len(user_ids))],
+                    title="Community update",
+                    message="New events were added near you.",
+                    category=Notification.Category.SYSTEM,
+                    is_read=rng.random() < 0.4,
+                    created_at=created_at,
+                )
+            )
+        return len(self._bulk_create(Notification, notifications))
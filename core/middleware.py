@@ -0,0 +1,105 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.module_loading import import_string
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .instrumentation import QueryRecorder, query_stats, recording
+
+
+def sync_only_middleware(middleware=None) -> list[str]:
+    """
+    Entries of ``MIDDLEWARE`` that cannot run natively under ASGI. Django
+    adapts each one onto a thread, which puts every request (async views
+    included) back on a thread, so this should stay empty.
+    """
+
+    return [
+        path
+        for path in (settings.MIDDLEWARE if middleware is None else middleware)
+        if not getattr(import_string(path), "async_capable", False)
+    ]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Record query count, DB time and duplicate SQL for every request when
+    ``QUERY_INSTRUMENTATION`` is on, exposing them as ``Server-Timing``
+    headers and in the rolling summary served by ``core:query-stats``.
+
+    When the setting is off the middleware removes itself at startup, so
+    it adds no per-request cost. It runs natively under WSGI and ASGI, and
+    counts the queries async views run on executor threads as well.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        query_stats.window = getattr(settings, "QUERY_INSTRUMENTATION_WINDOW", query_stats.window)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with recording(recorder):
+            response = self.get_response(request)
+        return self._finish(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with recording(recorder):
+            response = await self.get_response(request)
+        return self._finish(request, response, recorder, time.perf_counter() - started)
+
+    @staticmethod
+    def _finish(request, response, recorder, total):
+        response["Server-Timing"] = recorder.server_timing(total)
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else "<unresolved>"
+        if view_name != "core:query-stats":
+            query_stats.record(view_name, recorder, total)
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    ``WhiteNoiseMiddleware`` that also runs natively under ASGI.
+
+    WhiteNoise's middleware is sync-only; under uvicorn it would put every
+    request on a thread. Here only static file hits are served through
+    ``sync_to_async``; everything else goes straight to the async chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,102 @@
+"""
+Full-page cache for public pages.
+
+Anonymous GET/HEAD requests to views using ``AnonymousPageCacheMixin`` are
+served from the cache without rendering ``base.html`` or running context
+processors. Authenticated visitors still get a live response (their menu
+and unread badge differ), but the shared page body can be cached with
+``{% cache ... page_cache_version %}`` in the template.
+
+Pages live in the ``pages`` cache namespace; ``invalidate_public_pages``
+bumps its version (Event writes do so through ``core.signals``), orphaning
+every cached page at once.
+"""
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from .cache import bump_namespace, namespace_version
+from .home_snapshot import invalidate_home_snapshot
+
+
+def page_cache_generation() -> int:
+    return namespace_version("pages")
+
+
+def invalidate_public_pages() -> None:
+    bump_namespace("pages")
+
+
+def invalidate_event_pages() -> None:
+    """Drop everything built from event data: home snapshot, public pages and catalog."""
+    invalidate_home_snapshot()
+    invalidate_public_pages()
+    bump_namespace("catalog")
+
+
+def page_cache_key(request, generation: int) -> str:
+    return f"pages:v{generation}:{request.get_host()}:{request.get_full_path()}"
+
+
+def _is_cacheable_request(request) -> bool:
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if request.user.is_authenticated:
+        return False
+    # Flash messages are per visitor and are consumed by rendering.
+    return not len(get_messages(request))
+
+
+def _is_cacheable_response(request, response) -> bool:
+    return (
+        response.status_code == 200
+        and not response.cookies
+        # The rendered page contains a per-visitor CSRF token.
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and "private" not in response.get("Cache-Control", "")
+    )
+
+
+class AnonymousPageCacheMixin:
+    """Serve anonymous visitors a cached copy of the rendered page."""
+
+    page_cache_timeout = None
+
+    def get_page_cache_timeout(self) -> int:
+        if self.page_cache_timeout is not None:
+            return self.page_cache_timeout
+        return getattr(settings, "PAGE_CACHE_TTL", 600)
+
+    def dispatch(self, request, *args, **kwargs):
+        self.page_cache_version = page_cache_generation()
+        if not _is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(request, self.page_cache_version)
+        cached = cache.get(key)
+        if cached is not None:
+            cached["X-Page-Cache"] = "hit"
+            return cached
+
+        response = super().dispatch(request, *args, **kwargs)
+        # Shared caches must not hand this anonymous copy to signed-in users.
+        patch_vary_headers(response, ["Cookie"])
+        response["X-Page-Cache"] = "miss"
+
+        def store(rendered):
+            if _is_cacheable_response(request, rendered):
+                cache.set(key, rendered, self.get_page_cache_timeout())
+
+        if hasattr(response, "add_post_render_callback"):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["page_cache_version"] = self.page_cache_version
+        context["page_cache_timeout"] = self.get_page_cache_timeout()
+        return context
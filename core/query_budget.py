@@ -0,0 +1,292 @@
+"""
+Query-budget harness.
+
+``query_budget`` caps the number of queries a block (or test) may run::
+
+    with query_budget(4):
+        client.get(url)
+
+``ROUTE_BUDGETS`` is the declarative budget for every read-only named route
+of the project. ``measure_route_queries`` runs a budget entry against a
+seeded dataset (see ``seed_route_dataset``), which lets the test suite
+compare query counts at two dataset sizes and catch N+1 regressions: a
+route whose query count grows with the data is looping over queries.
+"""
+
+from contextlib import ContextDecorator
+from dataclasses import dataclass, field
+from datetime import date
+from io import StringIO
+from typing import Callable
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.urls import reverse
+
+from .instrumentation import QueryRecorder
+
+# Namespaces whose named routes must all appear in ROUTE_BUDGETS or SKIPPED_ROUTES.
+BUDGETED_NAMESPACES = (
+    "core",
+    "events",
+    "event_detail",
+    "forum",
+    "notifications",
+    "profiles",
+    "registrations",
+)
+
+SMALL_SCALE = 1
+LARGE_SCALE = 4
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def describe_statements(recorder: QueryRecorder, limit: int = 5) -> str:
+    lines = [
+        f"  {count}x {sql[:200]}" for sql, count in recorder.statements.most_common(limit)
+    ]
+    return "\n".join(lines)
+
+
+class query_budget(ContextDecorator):
+    """Fail when the wrapped block or function runs more than ``max_queries`` queries."""
+
+    def __init__(self, max_queries: int, *, using: str = "default", label: str = ""):
+        self.max_queries = max_queries
+        self.using = using
+        self.label = label
+
+    def __enter__(self):
+        from django.db import connections
+
+        self.recorder = QueryRecorder()
+        self._wrapper = connections[self.using].execute_wrapper(self.recorder)
+        self._wrapper.__enter__()
+        return self.recorder
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._wrapper.__exit__(exc_type, exc, traceback)
+        if exc_type is None and self.recorder.count > self.max_queries:
+            label = f"{self.label}: " if self.label else ""
+            raise QueryBudgetExceeded(
+                f"{label}{self.recorder.count} queries executed, budget is {self.max_queries} "
+                f"({self.recorder.duplicates} duplicates). Most repeated:\n"
+                f"{describe_statements(self.recorder)}"
+            )
+        return False
+
+
+@dataclass
+class RouteDataset:
+    member: object
+    staff: object
+    event: object
+    thread: object
+    post: object
+    registration: object
+    achievement: object
+    scale: int
+
+
+@dataclass(frozen=True)
+class RouteBudget:
+    """
+    Budget for one named route.
+
+    ``kwargs`` builds the URL kwargs from a ``RouteDataset``; ``user`` is
+    one of ``"anonymous"``, ``"member"`` or ``"staff"``; ``growth`` is the
+    number of extra queries tolerated at the larger dataset size (for
+    routes that legitimately branch on data, e.g. "next page" lookups).
+    """
+
+    name: str
+    max_queries: int
+    user: str = "anonymous"
+    kwargs: Callable[[RouteDataset], dict] = field(default=lambda data: {})
+    growth: int = 0
+    expected_status: int = 200
+
+
+ROUTE_BUDGETS = [
+    RouteBudget("core:home", 5),
+    RouteBudget("core:about", 0),
+    RouteBudget("core:query-stats", 2, user="staff"),
+    RouteBudget("events:list", 7, user="member"),
+    RouteBudget("events:json", 4),
+    RouteBudget("event_detail:detail", 12, user="member", kwargs=lambda d: {"slug": d.event.slug}),
+    RouteBudget("event_detail:detail-json", 6, kwargs=lambda d: {"slug": d.event.slug}),
+    RouteBudget("event_detail:availability-json", 1, kwargs=lambda d: {"slug": d.event.slug}),
+    RouteBudget("forum:index", 6, user="member"),
+    RouteBudget("forum:thread-create", 4, user="member"),
+    RouteBudget("forum:thread-detail", 19, user="member", kwargs=lambda d: {"slug": d.thread.slug}),
+    RouteBudget("forum:threads-json", 1),
+    RouteBudget("forum:api-thread-detail", 5, kwargs=lambda d: {"slug": d.thread.slug}),
+    RouteBudget("forum:api-thread-posts", 3, kwargs=lambda d: {"slug": d.thread.slug}),
+    RouteBudget("forum:api-reports", 4, user="staff"),
+    RouteBudget("notifications:inbox", 6, user="member"),
+    RouteBudget("notifications:inbox-json", 4, user="member"),
+    RouteBudget("profiles:dashboard", 8, user="member"),
+    RouteBudget("profiles:admin-dashboard", 6, user="staff"),
+    RouteBudget("profiles:admin-dashboard-stats-json", 5, user="staff"),
+    RouteBudget("profiles:edit", 4, user="member"),
+    RouteBudget("profiles:settings", 6, user="member"),
+    RouteBudget("profiles:profile-json", 5, user="member"),
+    RouteBudget("profiles:api-bootstrap", 12, user="member"),
+    RouteBudget("profiles:achievements", 4, user="member"),
+    RouteBudget("profiles:register", 0),
+    RouteBudget("profiles:login", 0),
+    RouteBudget("profiles:admin-event-list", 5, user="staff"),
+    RouteBudget("profiles:admin-event-add", 4, user="staff"),
+    RouteBudget("profiles:admin-event-edit", 6, user="staff", kwargs=lambda d: {"event_id": d.event.pk}),
+    RouteBudget("profiles:admin-participant-list", 6, user="staff"),
+    RouteBudget("profiles:admin-participant-list-json", 5, user="staff"),
+    RouteBudget("profiles:admin-export-start-list", 4, user="staff"),
+    RouteBudget("profiles:admin-export-registrations", 3, user="staff"),
+    RouteBudget("profiles:admin-forum", 5, user="staff"),
+    RouteBudget("registrations:start", 8, user="member", kwargs=lambda d: {"slug": d.event.slug}),
+    RouteBudget("registrations:mine", 5, user="member"),
+    RouteBudget(
+        "registrations:detail", 5, user="member", kwargs=lambda d: {"reference": d.registration.reference_code}
+    ),
+    RouteBudget("registrations:mine-json", 3, user="member"),
+    RouteBudget(
+        "registrations:detail-json", 4, user="member", kwargs=lambda d: {"reference": d.registration.reference_code}
+    ),
+]
+
+# Routes that only accept writes (or log the client out) are not replayed.
+SKIPPED_ROUTES = {
+    "forum:post-create": "POST only",
+    "forum:post-like": "POST only",
+    "forum:post-report": "POST only",
+    "forum:api-thread-create": "POST only",
+    "forum:api-thread-delete": "POST only",
+    "forum:api-post-delete": "POST only",
+    "forum:api-report-resolve": "POST only",
+    "notifications:mark-read": "mutates state",
+    "notifications:mark-all-read": "mutates state",
+    "profiles:achievement-delete": "DELETE only",
+    "profiles:logout": "ends the session",
+    "profiles:admin-event-delete": "mutates state",
+    "profiles:admin-participant-bulk": "mutates state",
+    "profiles:admin-participant-bulk-json": "mutates state",
+    "profiles:admin-participant-confirm": "mutates state",
+    "profiles:admin-participant-delete": "mutates state",
+    "profiles:admin-forum-delete": "mutates state",
+    "profiles:admin-forum-pinned": "mutates state",
+    "profiles:admin-forum-resolve": "mutates state",
+    "profiles:api-login": "POST only",
+    "profiles:api-logout": "ends the session",
+    "profiles:api-register": "POST only",
+    "profiles:api-profile-update": "POST only",
+    "profiles:api-account-update": "POST only",
+    "profiles:api-account-password": "POST only",
+    "profiles:api-account-delete": "POST only",
+    "registrations:register-ajax": "POST only",
+}
+
+
+def named_routes(namespaces=BUDGETED_NAMESPACES) -> set[str]:
+    """Every ``namespace:name`` reachable from the root URLconf for the given namespaces."""
+
+    from django.urls import get_resolver
+
+    names = set()
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            if hasattr(pattern, "url_patterns"):
+                namespace = pattern.namespace
+                walk(pattern.url_patterns, f"{prefix}{namespace}:" if namespace else prefix)
+            elif pattern.name and prefix:
+                names.add(f"{prefix}{pattern.name}")
+
+    walk(get_resolver().url_patterns, "")
+    return {name for name in names if name.split(":", 1)[0] in namespaces}
+
+
+def seed_route_dataset(scale: int, *, seed: int = 4242) -> RouteDataset:
+    """
+    Generate a dataset whose per-object fan-out (registrations per user and
+    event, posts per thread, likes, notifications, reports) grows with
+    ``scale``, and pick the busiest objects as route targets.
+    """
+
+    from django.contrib.auth import get_user_model
+
+    from events.models import Event
+    from forum.models import ForumPost, ForumThread, PostReport
+    from profiles.models import RunnerAchievement, UserProfile
+    from registrations.models import EventRegistration
+
+    call_command(
+        "generate_dataset",
+        seed=seed,
+        events=2 + scale,
+        users=4 + 2 * scale,
+        registrations=12 * scale,
+        threads=2 + scale,
+        posts=10 * scale,
+        likes=12 * scale,
+        notifications=4 * scale,
+        anchor_date=date(2026, 1, 15),
+        stdout=StringIO(),
+    )
+
+    User = get_user_model()
+    users = User.objects.filter(username__startswith=f"gen{seed}_")
+    member = users.annotate(total=Count("event_registrations")).order_by("-total", "pk").first()
+    staff = users.exclude(pk=member.pk).order_by("pk").first()
+    staff.is_staff = True
+    staff.save(update_fields=["is_staff"])
+
+    thread = ForumThread.objects.annotate(total=Count("posts")).order_by("-total", "pk").first()
+    posts = list(ForumPost.objects.filter(thread__in=ForumThread.objects.all()).order_by("pk")[: 2 * scale])
+    PostReport.objects.bulk_create(
+        PostReport(post=post, reporter=member, reason="Spam") for post in posts
+    )
+
+    profile = UserProfile.objects.get(user=member)
+    achievements = RunnerAchievement.objects.bulk_create(
+        RunnerAchievement(profile=profile, title=f"Finisher #{index}") for index in range(2 * scale)
+    )
+
+    return RouteDataset(
+        member=member,
+        staff=staff,
+        event=Event.objects.annotate(total=Count("registrations")).order_by("-total", "pk").first(),
+        thread=thread,
+        post=thread.posts.order_by("pk").first(),
+        registration=EventRegistration.objects.filter(user=member).order_by("created_at").last(),
+        achievement=achievements[0],
+        scale=scale,
+    )
+
+
+def measure_route_queries(client, budget: RouteBudget, dataset: RouteDataset) -> QueryRecorder:
+    """Request ``budget``'s route as its user and return the recorded queries."""
+
+    client.logout()
+    if budget.user == "member":
+        client.force_login(dataset.member)
+    elif budget.user == "staff":
+        client.force_login(dataset.staff)
+    cache.clear()
+
+    url = reverse(budget.name, kwargs=budget.kwargs(dataset))
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        response = client.get(url)
+        if response.streaming:
+            # Streamed bodies query while they are consumed.
+            b"".join(response.streaming_content)
+    if response.status_code != budget.expected_status:
+        raise AssertionError(
+            f"{budget.name} returned {response.status_code}, expected {budget.expected_status}"
+        )
+    return recorder
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from events.models import Event, EventCategory
+
+from .fragments import invalidate_fragments
+from .instrumentation import install_dispatch
+from .page_cache import invalidate_event_pages
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_pages_on_event_write(sender, **kwargs):
+    invalidate_event_pages()
+
+
+@receiver(m2m_changed, sender=Event.categories.through)
+def invalidate_pages_on_event_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        instance._cleared_event_ids = list(instance.events.values_list("pk", flat=True))
+    if not action.startswith("post_"):
+        return
+    # Category changes do not touch updated_at, which versions cached event cards.
+    if not reverse:
+        event_ids = [instance.pk]
+    elif action == "post_clear":
+        event_ids = getattr(instance, "_cleared_event_ids", [])
+    else:
+        event_ids = pk_set or []
+    Event.objects.filter(pk__in=event_ids).update(updated_at=timezone.now())
+    invalidate_event_pages()
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def invalidate_fragments_on_category_write(sender, **kwargs):
+    # Event cards list category display names.
+    invalidate_fragments()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_fragments_on_user_write(sender, created, update_fields=None, **kwargs):
+    # Thread rows show the author's username; new accounts have no threads
+    # yet and logins only touch last_login.
+    if not created and (update_fields is None or "username" in update_fields):
+        invalidate_fragments()
+
+
+@receiver(connection_created)
+def install_query_dispatch(sender, connection, **kwargs):
+    install_dispatch(connection)
@@ -0,0 +1,113 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+SLUG_SAVE_ATTEMPTS = 5
+
+
+def build_base_slug(text: str, *, max_length: int | None = None, fallback: str = "") -> str:
+    base_slug = slugify(text or "")
+    if max_length:
+        base_slug = base_slug[:max_length].rstrip("-")
+    return base_slug or fallback
+
+
+def _pick_free_slug(base_slug: str, *taken_sets: set[str]) -> str:
+    def is_taken(slug: str) -> bool:
+        return any(slug in taken for taken in taken_sets)
+
+    if not is_taken(base_slug):
+        return base_slug
+    counter = 1
+    while is_taken(f"{base_slug}-{counter}"):
+        counter += 1
+    return f"{base_slug}-{counter}"
+
+
+def _prefix_filter(base_slug: str) -> Q:
+    if connection.vendor == "sqlite":
+        # SQLite's LIKE cannot use the unique slug index. Slug characters
+        # all sort above "." except "-", so this range matches exactly
+        # ``base`` and ``base-*`` using the index.
+        return Q(slug__gte=base_slug, slug__lt=f"{base_slug}.")
+    return Q(slug=base_slug) | Q(slug__startswith=f"{base_slug}-")
+
+
+def allocate_unique_slug(model, base_slug: str, *, exclude_pk=None) -> str:
+    """Return the first free ``base``/``base-N`` slug using a single prefix query."""
+
+    queryset = model._default_manager.filter(_prefix_filter(base_slug)).order_by()
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    taken = set(queryset.values_list("slug", flat=True))
+    return _pick_free_slug(base_slug, taken)
+
+
+def save_with_unique_slug(instance, base_slug: str, save, *args, **kwargs):
+    """
+    Allocate ``instance.slug`` and run ``save``, retrying when a concurrent
+    writer grabbed the same slug between the lookup and the insert.
+    """
+
+    model = type(instance)
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        instance.slug = allocate_unique_slug(model, base_slug, exclude_pk=instance.pk)
+        try:
+            with transaction.atomic():
+                return save(*args, **kwargs)
+        except IntegrityError:
+            slug_taken = (
+                model._default_manager.filter(slug=instance.slug)
+                .exclude(pk=instance.pk)
+                .exists()
+            )
+            if not slug_taken or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                raise
+            if instance._state.adding:
+                instance.pk = None
+
+
+class SlugAllocator:
+    """
+    In-memory slug allocator for bulk inserts.
+
+    Taken slugs are loaded once per base (or in batches through ``prime``)
+    and every allocation is remembered, so a whole import can be slugged
+    without any per-row queries.
+    """
+
+    def __init__(self, model, *, max_length: int | None = None, fallback: str = ""):
+        self.model = model
+        self.max_length = max_length
+        self.fallback = fallback
+        self._taken: dict[str, set[str]] = {}
+        self._allocated: set[str] = set()
+
+    def prime(self, texts, *, batch_size: int = 200) -> None:
+        bases = sorted(
+            {self.base_for(text) for text in texts} - set(self._taken)
+        )
+        for start in range(0, len(bases), batch_size):
+            batch = bases[start:start + batch_size]
+            condition = Q()
+            for base_slug in batch:
+                condition |= _prefix_filter(base_slug)
+                self._taken[base_slug] = set()
+            for slug in self.model._default_manager.filter(condition).order_by().values_list(
+                "slug", flat=True
+            ):
+                prefixes = [slug] + [slug[:index] for index, char in enumerate(slug) if char == "-"]
+                for prefix in prefixes:
+                    if prefix in self._taken:
+                        self._taken[prefix].add(slug)
+
+    def base_for(self, text: str) -> str:
+        return build_base_slug(text, max_length=self.max_length, fallback=self.fallback)
+
+    def allocate(self, text: str) -> str:
+        base_slug = self.base_for(text)
+        if base_slug not in self._taken:
+            self.prime([text])
+        slug = _pick_free_slug(base_slug, self._taken[base_slug], self._allocated)
+        self._allocated.add(slug)
+        return slug
@@ -0,0 +1,24 @@
+from django import template
+
+from core.fragments import render_cached_fragments
+
+register = template.Library()
+
+
+@register.simple_tag
+def cached_fragments(objects, template_name, item_name, prefix, version):
+    """
+    Render ``template_name`` once per object through the fragment cache.
+
+    ``version`` is a comma-separated list of (dotted) attributes whose values
+    change whenever the fragment's output would, e.g.
+    ``{% cached_fragments events "events/partials/event_card.html" "event" "event-card" "updated_at" as cards %}``.
+    """
+
+    return render_cached_fragments(
+        objects,
+        template_name,
+        item_name=item_name,
+        prefix=prefix,
+        version_attrs=[attr.strip() for attr in version.split(",") if attr.strip()],
+    )
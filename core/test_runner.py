@@ -0,0 +1,47 @@
+import unittest
+
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner
+
+
+def clear_caches():
+    for cache in caches.all(initialized_only=True):
+        cache.clear()
+
+
+class CacheIsolatingResultMixin:
+    def startTest(self, test):
+        clear_caches()
+        super().startTest(test)
+
+
+class CacheIsolatingRemoteTestResult(CacheIsolatingResultMixin, RemoteTestResult):
+    pass
+
+
+class CacheIsolatingRemoteTestRunner(RemoteTestRunner):
+    resultclass = CacheIsolatingRemoteTestResult
+
+
+class CacheIsolatingParallelTestSuite(ParallelTestSuite):
+    # Workers run their tests through ``runner_class``; the parent only
+    # replays the recorded events afterwards, so its result class can't
+    # clear the workers' caches.
+    runner_class = CacheIsolatingRemoteTestRunner
+
+
+class CacheIsolatingRunner(DiscoverRunner):
+    """
+    Start every test with empty caches.
+
+    Cached snapshots, pages and catalog entries outlive the per-test
+    transaction rollback, and the invalidation signals never fire for
+    rolled-back rows, so without this a test could read another test's data.
+    Works with ``--parallel`` too: each worker clears its own caches.
+    """
+
+    parallel_test_suite = CacheIsolatingParallelTestSuite
+
+    def get_resultclass(self):
+        base = super().get_resultclass() or unittest.TextTestResult
+        return type(f"CacheIsolating{base.__name__}", (CacheIsolatingResultMixin, base), {})
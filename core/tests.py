@@ -1,14 +1,53 @@
-from datetime import timedelta
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
+from pathlib import Path
 from unittest.mock import patch
 
-from django.test import TestCase, RequestFactory
+from asgiref.sync import async_to_sync
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, RequestFactory, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
 
 from events.models import Event, EventCategory
+from forum.models import ForumPost, ForumThread
+from notifications.models import Notification
+from profiles.models import UserProfile, UserRaceHistory
+from registrations.models import EventRegistration
+from core.cache import aget_or_compute, aversioned_key, bump_namespace, get_or_compute, versioned_key
+from core.checks import database_settings_warnings, report_database_settings
+from core.db_routing import PIN_COOKIE, ReadReplicaRouter
+from core.fragments import fragment_metrics, render_cached_fragments
+from core.home_snapshot import build_home_snapshot, get_home_snapshot
+from core.instrumentation import QueryRecorder, query_stats
+from core.management.commands.bench import Command as BenchCommand, summarize
+from core.query_budget import (
+    LARGE_SCALE,
+    ROUTE_BUDGETS,
+    SKIPPED_ROUTES,
+    SMALL_SCALE,
+    QueryBudgetExceeded,
+    RouteDataset,
+    describe_statements,
+    measure_route_queries,
+    named_routes,
+    query_budget,
+    seed_route_dataset,
+)
+from core.slugs import SlugAllocator, allocate_unique_slug, build_base_slug
 from core.views import HomeView, AboutView
+from vacathon.cache_config import build_caches
+from vacathon.db_config import build_databases, describe_database
 
 User = get_user_model()
 
@@ -17,6 +56,8 @@ class HomeViewTests(TestCase):
     """Comprehensive tests for HomeView."""
 
     def setUp(self):
+        # The home snapshot is cached; rolled-back test data never invalidates it.
+        cache.clear()
         self.factory = RequestFactory()
         self.today = timezone.localdate()
         self.category = EventCategory.objects.create(
@@ -347,6 +388,9 @@ class HomeViewTests(TestCase):
 class AboutViewTests(TestCase):
     """Comprehensive tests for AboutView."""
 
+    def setUp(self):
+        cache.clear()
+
     def test_about_view_renders_successfully(self):
         """Test about page renders with correct status code."""
         response = self.client.get(reverse("core:about"))
@@ -401,6 +445,7 @@ class HomeViewEdgeCasesTests(TestCase):
     """Test edge cases and boundary conditions for HomeView."""
 
     def setUp(self):
+        cache.clear()
         self.today = timezone.localdate()
 
     def test_home_view_with_null_registered_count(self):
@@ -508,4 +553,922 @@ class URLConfigTests(TestCase):
     def test_about_url_resolves(self):
         """Test about URL resolves correctly."""
         url = reverse("core:about")
-        self.assertEqual(url, "/about/")
\ No newline at end of file
+        self.assertEqual(url, "/about/")
+
+
+class SlugAllocationTests(TestCase):
+    """Tests for the shared slug allocator."""
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+    def _create_event(self, title, **kwargs):
+        return Event.objects.create(
+            title=title,
+            city="Jakarta",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+            **kwargs,
+        )
+
+    def test_build_base_slug_truncates_and_falls_back(self):
+        """Test base slugs are truncated and fall back when empty."""
+        self.assertEqual(build_base_slug("Hello World", max_length=5), "hello")
+        self.assertEqual(build_base_slug("Hello World", max_length=6), "hello")
+        self.assertEqual(build_base_slug("!!!", fallback="thread"), "thread")
+
+    def test_allocate_uses_single_query(self):
+        """Test the next free suffix is found with one prefix query."""
+        for _ in range(5):
+            self._create_event("City Run")
+
+        with self.assertNumQueries(1):
+            slug = allocate_unique_slug(Event, "city-run")
+        self.assertEqual(slug, "city-run-5")
+
+    def test_allocate_fills_gaps_and_ignores_other_prefixes(self):
+        """Test freed suffixes are reused and longer slugs do not interfere."""
+        self._create_event("City Run")
+        self._create_event("City Run", slug="city-run-2")
+        self._create_event("City Run 2025")
+
+        self.assertEqual(allocate_unique_slug(Event, "city-run"), "city-run-1")
+
+    def test_event_save_retries_when_slug_taken_concurrently(self):
+        """Test a slug grabbed between lookup and insert triggers a retry."""
+        self._create_event("Race Day")
+        stale_results = iter(["race-day", "race-day-1"])
+
+        def fake_allocate(model, base_slug, *, exclude_pk=None):
+            return next(stale_results)
+
+        with patch("core.slugs.allocate_unique_slug", side_effect=fake_allocate):
+            event = self._create_event("Race Day")
+
+        self.assertEqual(event.slug, "race-day-1")
+        self.assertEqual(Event.objects.filter(slug__startswith="race-day").count(), 2)
+
+    def test_slug_allocator_preallocates_in_memory(self):
+        """Test bulk allocation only queries once per primed batch."""
+        self._create_event("Desert Ultra")
+        allocator = SlugAllocator(Event, max_length=200, fallback="event")
+        allocator.prime(["Desert Ultra", "Mountain Trail"])
+
+        with self.assertNumQueries(0):
+            slugs = [
+                allocator.allocate("Desert Ultra"),
+                allocator.allocate("Desert Ultra"),
+                allocator.allocate("Mountain Trail"),
+                allocator.allocate("Mountain Trail"),
+            ]
+
+        self.assertEqual(
+            slugs,
+            ["desert-ultra-1", "desert-ultra-2", "mountain-trail", "mountain-trail-1"],
+        )
+
+    def test_slug_allocator_avoids_cross_base_collisions(self):
+        """Test slugs allocated under one base are not reused by another."""
+        allocator = SlugAllocator(Event)
+        allocator.prime(["Loop", "Loop 1"])
+        first = allocator.allocate("Loop")
+        second = allocator.allocate("Loop")
+        third = allocator.allocate("Loop 1")
+
+        self.assertEqual([first, second], ["loop", "loop-1"])
+        self.assertNotIn(third, {first, second})
+
+
+class GenerateDatasetCommandTests(TestCase):
+    """Tests for the synthetic dataset generator."""
+
+    def _generate(self, seed=7):
+        call_command(
+            "generate_dataset",
+            seed=seed,
+            events=6,
+            users=12,
+            registrations=30,
+            threads=5,
+            posts=20,
+            likes=15,
+            notifications=4,
+            anchor_date=date(2026, 1, 15),
+            stdout=StringIO(),
+        )
+
+    def _snapshot(self):
+        return (
+            list(Event.objects.order_by("slug").values_list("slug", "start_date", "registered_count")),
+            list(
+                EventRegistration.objects.order_by("reference_code").values_list(
+                    "reference_code", "user__username", "event__slug", "status"
+                )
+            ),
+            list(ForumThread.objects.order_by("slug").values_list("slug", "event__slug", "view_count")),
+        )
+
+    def test_generates_requested_volumes(self):
+        """Test the generator creates the requested row counts with valid relations."""
+        self._generate()
+
+        self.assertEqual(Event.objects.count(), 6)
+        self.assertEqual(User.objects.filter(username__startswith="gen7_").count(), 12)
+        self.assertEqual(UserProfile.objects.count(), 12)
+        self.assertEqual(EventRegistration.objects.count(), 30)
+        self.assertEqual(UserRaceHistory.objects.count(), 30)
+        self.assertEqual(ForumThread.objects.count(), 5)
+        self.assertEqual(ForumPost.objects.count(), 20)
+        self.assertEqual(ForumPost.likes.through.objects.count(), 15)
+        self.assertEqual(Notification.objects.count(), 34)
+        for event in Event.objects.all():
+            self.assertEqual(
+                event.registered_count,
+                event.registrations.filter(
+                    status__in=["pending", "confirmed"]
+                ).count(),
+            )
+
+    def test_same_seed_is_reproducible(self):
+        """Test rerunning with the same seed on a clean database yields the same data."""
+        self._generate()
+        first = self._snapshot()
+        ForumThread.objects.all().delete()
+        Event.objects.all().delete()
+        User.objects.all().delete()
+
+        self._generate()
+
+        self.assertEqual(self._snapshot(), first)
+
+    def test_refuses_to_generate_same_seed_twice(self):
+        """Test the command refuses to duplicate an existing dataset."""
+        self._generate()
+        with self.assertRaises(CommandError):
+            self._generate()
+
+
+class QueryInstrumentationTests(TestCase):
+    """Tests for the opt-in query instrumentation middleware."""
+
+    def setUp(self):
+        cache.clear()
+        query_stats.clear()
+        self.admin = User.objects.create_user("ops", password="secret", is_staff=True)
+
+    def tearDown(self):
+        query_stats.clear()
+
+    def test_disabled_by_default(self):
+        """Test no Server-Timing header or samples are produced when disabled."""
+        response = self.client.get(reverse("core:home"))
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(query_stats.summary(), [])
+
+    @override_settings(QUERY_INSTRUMENTATION=True)
+    def test_server_timing_header_and_summary(self):
+        """Test enabled instrumentation reports queries per view."""
+        response = self.client.get(reverse("core:home"))
+
+        self.assertIn("Server-Timing", response)
+        self.assertRegex(response["Server-Timing"], r'db;dur=[\d.]+;desc="\d+ queries"')
+
+        self.client.force_login(self.admin)
+        stats = self.client.get(reverse("core:query-stats")).json()
+
+        self.assertTrue(stats["enabled"])
+        home = next(view for view in stats["views"] if view["view"] == "core:home")
+        self.assertEqual(home["requests"], 1)
+        self.assertGreater(home["queries_max"], 0)
+        self.assertTrue(home["slowest"])
+
+    def test_recorder_counts_duplicate_statements(self):
+        """Test repeated parameterised SQL is reported as duplicates."""
+        for index in range(3):
+            EventCategory.objects.create(
+                name=f"cat-{index}", distance_km=Decimal("5.00"), display_name=f"Cat {index}"
+            )
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for index in range(3):
+                EventCategory.objects.get(name=f"cat-{index}")
+            Event.objects.count()
+
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.duplicates, 2)
+        self.assertIn("desc=\"4 queries\"", recorder.server_timing())
+
+    def test_summary_endpoint_requires_staff(self):
+        """Test non-staff users cannot read the query summary."""
+        member = User.objects.create_user("runner", password="secret")
+        self.client.force_login(member)
+
+        response = self.client.get(reverse("core:query-stats"))
+
+        self.assertEqual(response.status_code, 302)
+
+
+class RouteQueryBudgetTests(TestCase):
+    """Query budgets for every read-only named route, at two dataset sizes."""
+
+    def test_every_named_route_has_a_budget_or_skip_reason(self):
+        """Test new routes cannot be added without declaring a query budget."""
+        budgeted = {budget.name for budget in ROUTE_BUDGETS}
+
+        self.assertEqual(budgeted & set(SKIPPED_ROUTES), set())
+        self.assertEqual(named_routes() - budgeted - set(SKIPPED_ROUTES), set())
+        self.assertEqual((budgeted | set(SKIPPED_ROUTES)) - named_routes(), set())
+
+    def test_route_query_counts_stay_flat_as_data_grows(self):
+        """Test each route stays within budget and does not scale queries with data."""
+        counts = {}
+        for scale in (SMALL_SCALE, LARGE_SCALE):
+            with transaction.atomic():
+                dataset = seed_route_dataset(scale)
+                for budget in ROUTE_BUDGETS:
+                    counts.setdefault(budget.name, []).append(
+                        measure_route_queries(self.client, budget, dataset)
+                    )
+                transaction.set_rollback(True)
+
+        for budget in ROUTE_BUDGETS:
+            small, large = counts[budget.name]
+            with self.subTest(route=budget.name):
+                self.assertLessEqual(
+                    max(small.count, large.count),
+                    budget.max_queries,
+                    f"{budget.name} is over budget:\n{describe_statements(large)}",
+                )
+                self.assertLessEqual(
+                    large.count,
+                    small.count + budget.growth,
+                    f"{budget.name} runs more queries on the larger dataset "
+                    f"({small.count} -> {large.count}):\n{describe_statements(large)}",
+                )
+
+    def test_query_budget_context_manager(self):
+        """Test query_budget raises with the repeated statements when exceeded."""
+        with query_budget(1):
+            Event.objects.count()
+
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with query_budget(1, label="events"):
+                Event.objects.count()
+                Event.objects.count()
+        self.assertIn("events: 2 queries executed, budget is 1", str(ctx.exception))
+        self.assertIn("2x SELECT COUNT(*)", str(ctx.exception))
+
+    def test_query_budget_decorator(self):
+        """Test query_budget also works as a function decorator."""
+
+        @query_budget(0)
+        def run_query():
+            return Event.objects.exists()
+
+        with self.assertRaises(QueryBudgetExceeded):
+            run_query()
+
+
+class BenchCommandTests(TestCase):
+    """Tests for the endpoint benchmark statistics and baseline comparison."""
+
+    def _report(self, median_ms, queries=3):
+        return {"scale": 10, "routes": {"events:json": {"median_ms": median_ms, "queries": queries}}}
+
+    def test_summarize_statistics(self):
+        """Test the benchmark summary reports order statistics in milliseconds."""
+        stats = summarize([5.0, 1.0, 3.0, 2.0, 4.0])
+
+        self.assertEqual(stats["min_ms"], 1.0)
+        self.assertEqual(stats["median_ms"], 3.0)
+        self.assertEqual(stats["mean_ms"], 3.0)
+        self.assertEqual(stats["p95_ms"], 5.0)
+        self.assertEqual(stats["max_ms"], 5.0)
+
+    def test_compare_flags_slowdown_beyond_threshold(self):
+        """Test a median slowdown above the threshold is a regression."""
+        command = BenchCommand(stdout=StringIO())
+
+        command._compare(self._report(11.0), self._report(10.0), 0.25)
+        with self.assertRaisesMessage(CommandError, "events:json"):
+            command._compare(self._report(13.0), self._report(10.0), 0.25)
+
+    def test_compare_flags_extra_queries(self):
+        """Test running more queries than the baseline is a regression even when fast."""
+        command = BenchCommand(stdout=StringIO())
+
+        with self.assertRaises(CommandError):
+            command._compare(self._report(9.0, queries=4), self._report(10.0), 0.25)
+
+    def test_cold_mode_measures_the_query_path(self):
+        """Test --cold clears the cache before each timed request, so cached routes still query."""
+        from core.query_budget import SMALL_SCALE, seed_route_dataset
+
+        dataset = seed_route_dataset(SMALL_SCALE)
+        budget = next(budget for budget in ROUTE_BUDGETS if budget.name == "events:json")
+        command = BenchCommand(stdout=StringIO())
+
+        warm = command._bench_route(budget, dataset, 1, 3)
+        cold = command._bench_route(budget, dataset, 1, 3, cold=True)
+
+        self.assertEqual(warm["queries"], 0)
+        self.assertGreater(cold["queries"], 0)
+
+
+class ConcurrencyBenchCommandTests(TransactionTestCase):
+    """Tests for the WSGI/ASGI concurrency benchmark (views run on other threads, so data is committed)."""
+
+    def test_concurrency_benchmark_runs_each_mode(self):
+        """Test the concurrency benchmark drives sync and async views and writes a report."""
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "concurrency.json"
+            with patch("core.management.commands.bench.seed_route_dataset", return_value=self._dataset()), \
+                    patch("core.management.commands.bench.setup_test_environment"), \
+                    patch("core.management.commands.bench.teardown_test_environment"), \
+                    patch.object(connection.creation, "create_test_db"), \
+                    patch.object(connection.creation, "destroy_test_db"), \
+                    patch("core.management.commands.bench.connections"):
+                call_command(
+                    "bench_concurrency",
+                    route=["event_detail:availability-json"],
+                    concurrency=[1, 4],
+                    requests=6,
+                    output=str(output),
+                    stdout=StringIO(),
+                )
+            report = json.loads(output.read_text())
+
+        route = report["routes"]["event_detail:availability-json"]
+        self.assertEqual(set(route), {"wsgi", "asgi", "asgi-sync"})
+        self.assertEqual(set(route["asgi"]), {"1", "4"})
+        self.assertGreater(route["wsgi"]["4"]["throughput_rps"], 0)
+
+    def _dataset(self):
+        event = Event.objects.create(
+            title="Bench Run",
+            city="Jakarta",
+            start_date=timezone.localdate() + timedelta(days=10),
+            registration_deadline=timezone.localdate() + timedelta(days=5),
+        )
+        return RouteDataset(
+            member=None, staff=None, event=event, thread=None, post=None,
+            registration=None, achievement=None, scale=1,
+        )
+
+
+class AsgiMiddlewareTests(TestCase):
+    """Tests that the middleware stack runs natively under ASGI."""
+
+    def test_every_middleware_is_async_capable(self):
+        """Test no MIDDLEWARE entry forces ASGI requests back onto a thread."""
+        from core.middleware import sync_only_middleware
+
+        self.assertEqual(sync_only_middleware(), [])
+        self.assertEqual(
+            sync_only_middleware(["whitenoise.middleware.WhiteNoiseMiddleware"]),
+            ["whitenoise.middleware.WhiteNoiseMiddleware"],
+        )
+
+    @override_settings(QUERY_INSTRUMENTATION=True)
+    async def test_async_chain_serves_instrumented_requests(self):
+        """Test an async request through the full stack counts the view's queries."""
+        from django.test import AsyncClient
+
+        await cache.aclear()
+        response = await AsyncClient().get(reverse("events:json"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('desc="0 queries"', response["Server-Timing"])
+
+    @override_settings(QUERY_INSTRUMENTATION=True)
+    async def test_async_orm_queries_are_counted(self):
+        """Test queries run by async ORM calls on executor threads are recorded."""
+        from django.http import HttpResponse
+
+        from core.middleware import QueryInstrumentationMiddleware
+
+        async def view(request):
+            await Event.objects.acount()
+            await EventCategory.objects.acount()
+            return HttpResponse()
+
+        middleware = QueryInstrumentationMiddleware(view)
+        response = await middleware(RequestFactory().get("/"))
+
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+
+
+class HomeSnapshotTests(TestCase):
+    """Tests for the cached landing-page snapshot."""
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+    def _create_event(self, title, days_ahead, **extra):
+        return Event.objects.create(
+            title=title,
+            description="Race description",
+            city=extra.pop("city", "Jakarta"),
+            start_date=self.today + timedelta(days=days_ahead),
+            registration_deadline=self.today + timedelta(days=days_ahead - 1),
+            status=extra.pop("status", Event.Status.UPCOMING),
+            **extra,
+        )
+
+    def test_snapshot_combines_stats_highlight_and_upcoming(self):
+        """Test the snapshot matches what the home page used to compute per request."""
+        first = self._create_event("First Run", 10, registered_count=5, popularity_score=1)
+        second = self._create_event("Second Run", 20, registered_count=7, city="Bandung")
+        past = self._create_event("Past Run", -30, status=Event.Status.COMPLETED, city="")
+
+        snapshot = build_home_snapshot(self.today)
+
+        self.assertEqual(snapshot.total_events, 3)
+        self.assertEqual(snapshot.total_runners, 12)
+        self.assertEqual(snapshot.distinct_cities, 2)
+        self.assertEqual(snapshot.highlight_event, first)
+        self.assertEqual(snapshot.upcoming_events, [second, past])
+
+    def test_snapshot_hit_runs_no_queries(self):
+        """Test a cached snapshot is returned without touching the database."""
+        self._create_event("Cached Run", 10)
+        get_home_snapshot()
+
+        with self.assertNumQueries(0):
+            snapshot = get_home_snapshot()
+        self.assertEqual(snapshot.highlight_event.title, "Cached Run")
+
+    def test_signed_in_home_page_uses_snapshot(self):
+        """Test signed-in visitors get the snapshot without the stats queries."""
+        self._create_event("Cached Run", 10)
+        user = User.objects.create_user("runner", password="secret")
+        self.client.force_login(user)
+        self.client.get(reverse("core:home"))
+
+        # Session, user and the unread-notifications badge only.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("core:home"))
+        self.assertEqual(response.context["highlight_event"].title, "Cached Run")
+
+    def test_event_writes_invalidate_snapshot(self):
+        """Test saving an event or updating its counter refreshes the snapshot."""
+        event = self._create_event("Original Title", 10)
+        self.assertEqual(get_home_snapshot().highlight_event.title, "Original Title")
+
+        event.title = "Renamed Title"
+        event.save()
+        self.assertEqual(get_home_snapshot().highlight_event.title, "Renamed Title")
+
+        user = User.objects.create_user("runner", password="secret")
+        EventRegistration.objects.create(
+            user=user,
+            event=event,
+            phone_number="0800",
+            emergency_contact_name="Contact",
+            emergency_contact_phone="0801",
+        )
+        self.assertEqual(get_home_snapshot().total_runners, 1)
+
+
+class AnonymousPageCacheTests(TestCase):
+    """Tests for the anonymous full-page cache on public pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+    def _create_event(self, title):
+        return Event.objects.create(
+            title=title,
+            description="Race description",
+            city="Jakarta",
+            start_date=self.today + timedelta(days=10),
+            registration_deadline=self.today + timedelta(days=5),
+            status=Event.Status.UPCOMING,
+        )
+
+    def test_anonymous_hit_served_without_queries(self):
+        """Test the second anonymous request is a cache hit with no queries."""
+        self._create_event("Harbour Marathon")
+        first = self.client.get(reverse("core:home"))
+
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse("core:home"))
+
+        self.assertEqual(first["X-Page-Cache"], "miss")
+        self.assertEqual(second["X-Page-Cache"], "hit")
+        self.assertIn("Cookie", second["Vary"])
+        self.assertContains(second, "Harbour Marathon")
+
+    def test_event_write_invalidates_cached_pages(self):
+        """Test saving an event orphans cached public pages."""
+        event = self._create_event("Harbour Marathon")
+        self.client.get(reverse("core:home"))
+
+        event.title = "Lagoon Marathon"
+        event.save()
+        response = self.client.get(reverse("core:home"))
+
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "Lagoon Marathon")
+
+    def test_signed_in_visitors_bypass_page_cache(self):
+        """Test authenticated requests render live with their own menu."""
+        self.client.get(reverse("core:about"))
+        staff = User.objects.create_user("ops", password="secret", is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.get(reverse("core:about"))
+
+        self.assertNotIn("X-Page-Cache", response)
+        self.assertContains(response, "Admin Dashboard")
+
+    def test_query_string_is_part_of_key(self):
+        """Test different query strings are cached separately."""
+        self.client.get(reverse("core:about"))
+
+        response = self.client.get(reverse("core:about") + "?ref=newsletter")
+
+        self.assertEqual(response["X-Page-Cache"], "miss")
+
+
+class FragmentCacheTests(TestCase):
+    """Tests for the keyed event-card / thread-row fragment cache."""
+
+    def setUp(self):
+        cache.clear()
+        fragment_metrics.clear()
+        self.today = timezone.localdate()
+        self.events = [
+            Event.objects.create(
+                title=f"Card Run {index}",
+                description="Race description",
+                city="Jakarta",
+                start_date=self.today + timedelta(days=10 + index),
+                registration_deadline=self.today + timedelta(days=5),
+            )
+            for index in range(3)
+        ]
+
+    def _render(self):
+        return render_cached_fragments(
+            Event.objects.order_by("pk"),
+            "events/partials/event_card.html",
+            item_name="event",
+            prefix="event-card",
+            version_attrs=["updated_at"],
+        )
+
+    def test_second_render_is_served_from_cache(self):
+        """Test unchanged cards are reused and counted as hits."""
+        first = self._render()
+        second = self._render()
+
+        self.assertEqual(first, second)
+        self.assertIn("Card Run 0", second[0])
+        self.assertEqual(fragment_metrics.snapshot()["event-card"]["hits"], 3)
+        self.assertEqual(fragment_metrics.snapshot()["event-card"]["misses"], 3)
+
+    def test_only_changed_card_is_rerendered(self):
+        """Test bumping updated_at invalidates just that card."""
+        self._render()
+        event = self.events[1]
+        event.title = "Renamed Run"
+        event.save()
+
+        cards = self._render()
+
+        self.assertIn("Renamed Run", cards[1])
+        self.assertEqual(fragment_metrics.snapshot()["event-card"]["misses"], 4)
+
+    def test_category_change_bumps_event_version(self):
+        """Test adding a category refreshes the card's version."""
+        event = self.events[0]
+        before = event.updated_at
+        category = EventCategory.objects.create(
+            name="10k", distance_km=Decimal("10.00"), display_name="10K Run"
+        )
+
+        category.events.add(event)
+
+        event.refresh_from_db()
+        self.assertGreater(event.updated_at, before)
+        self.assertIn("10K Run", self._render()[0])
+
+    def test_category_rename_rerenders_cards(self):
+        """Test renaming a category refreshes cards that list it."""
+        category = EventCategory.objects.create(
+            name="10k", distance_km=Decimal("10.00"), display_name="10K Run"
+        )
+        category.events.add(self.events[0])
+        self._render()
+
+        category.display_name = "10K Road Race"
+        category.save()
+
+        self.assertIn("10K Road Race", self._render()[0])
+
+    def test_author_rename_rerenders_thread_rows(self):
+        """Test renaming a thread author refreshes the cached thread row."""
+        user = User.objects.create_user("pacer", password="secret")
+        ForumThread.objects.create(event=self.events[0], author=user, title="Pacing", body="Plan")
+
+        def render_rows():
+            return render_cached_fragments(
+                ForumThread.objects.select_related("event", "author"),
+                "forum/partials/thread_row.html",
+                item_name="thread",
+                prefix="thread-row",
+                version_attrs=["last_activity_at", "event.updated_at"],
+            )
+
+        self.assertIn("Started by pacer", render_rows()[0])
+
+        user.username = "tempo"
+        user.save()
+
+        self.assertIn("Started by tempo", render_rows()[0])
+
+    def test_event_list_renders_cached_cards(self):
+        """Test the event listing page renders through the fragment cache."""
+        user = User.objects.create_user("runner", password="secret")
+        self.client.force_login(user)
+
+        self.client.get(reverse("events:list"))
+        response = self.client.get(reverse("events:list"))
+
+        self.assertContains(response, "Card Run 2")
+        self.assertEqual(fragment_metrics.snapshot()["event-card"]["hits"], 3)
+
+
+class CacheSubsystemTests(TestCase):
+    """Tests for cache configuration, namespaces and single-flight recompute."""
+
+    def test_build_caches_defaults_to_locmem(self):
+        """Test development gets a namespaced LocMem cache."""
+        config = build_caches({}, Path("/srv/app"))["default"]
+
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+        self.assertEqual(config["KEY_PREFIX"], "vacathon")
+        self.assertEqual(config["VERSION"], 1)
+
+    def test_build_caches_shared_backends(self):
+        """Test file, database and redis backends are configured from the environment."""
+        file_config = build_caches({"CACHE_BACKEND": "file"}, Path("/srv/app"))["default"]
+        db_config = build_caches(
+            {"CACHE_BACKEND": "db", "CACHE_VERSION": "3", "CACHE_KEY_PREFIX": "staging"},
+            Path("/srv/app"),
+        )["default"]
+        redis_config = build_caches(
+            {"CACHE_BACKEND": "redis", "REDIS_URL": "redis://cache:6379/1"}, Path("/srv/app")
+        )["default"]
+
+        self.assertEqual(file_config["LOCATION"], "/srv/app/.cache/django")
+        self.assertEqual(db_config["BACKEND"], "django.core.cache.backends.db.DatabaseCache")
+        self.assertEqual((db_config["KEY_PREFIX"], db_config["VERSION"]), ("staging", 3))
+        self.assertEqual(redis_config["LOCATION"], "redis://cache:6379/1")
+        with self.assertRaises(ValueError):
+            build_caches({"CACHE_BACKEND": "memcached"}, Path("/srv/app"))
+
+    def test_auto_backend_uses_redis_only_when_installed(self):
+        """Test auto falls back to LocMem when the redis client is missing."""
+        env = {"REDIS_URL": "redis://cache:6379/1"}
+        with patch("vacathon.cache_config.redis_available", return_value=False):
+            self.assertIn("LocMemCache", build_caches(env, Path("/srv/app"))["default"]["BACKEND"])
+        with patch("vacathon.cache_config.redis_available", return_value=True):
+            self.assertIn("RedisCache", build_caches(env, Path("/srv/app"))["default"]["BACKEND"])
+
+    def test_bumping_namespace_orphans_its_keys(self):
+        """Test versioned keys change only for the bumped namespace."""
+        catalog_key = versioned_key("catalog", "page", 1)
+        pages_key = versioned_key("pages", "home")
+
+        bump_namespace("catalog")
+
+        self.assertNotEqual(versioned_key("catalog", "page", 1), catalog_key)
+        self.assertEqual(versioned_key("pages", "home"), pages_key)
+
+    def test_evicted_namespace_version_never_revives_old_keys(self):
+        """Test a culled version key is re-seeded above every version handed out before."""
+        first = versioned_key("catalog", "page", 1)
+        bump_namespace("catalog")
+        second = versioned_key("catalog", "page", 1)
+
+        cache.delete("ns:catalog:version")
+        time.sleep(0.01)  # versions are seeded from the millisecond clock
+
+        self.assertNotIn(versioned_key("catalog", "page", 1), {first, second})
+
+    def test_parallel_workers_clear_caches_between_tests(self):
+        """Test --parallel workers run tests through a cache-clearing result class."""
+        from core.test_runner import CacheIsolatingRunner
+
+        result_class = CacheIsolatingRunner.parallel_test_suite.runner_class.resultclass
+        cache.set("leftover", 1)
+
+        result_class().startTest(self)
+
+        self.assertIsNone(cache.get("leftover"))
+
+    def test_get_or_compute_is_single_flight(self):
+        """Test concurrent misses on one key compute the value once."""
+        calls = []
+        started = threading.Barrier(8)
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        def worker(results):
+            started.wait()
+            results.append(get_or_compute("hot-key", compute, 60))
+
+        results = []
+        threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 8)
+
+    def test_aget_or_compute_is_single_flight(self):
+        """Test concurrent async misses on one key await a single computation."""
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "value"
+
+        async def run():
+            key = await aversioned_key("catalog", "async-hot-key")
+            return await asyncio.gather(*(aget_or_compute(key, compute, 60) for _ in range(8)))
+
+        results = async_to_sync(run)()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 8)
+        self.assertEqual(cache.get(versioned_key("catalog", "async-hot-key")), "value")
+
+    def test_events_catalog_is_cached_and_invalidated(self):
+        """Test events:json serves cached pages until an event changes."""
+        event = Event.objects.create(
+            title="Catalog Run",
+            description="Race description",
+            city="Jakarta",
+            start_date=timezone.localdate() + timedelta(days=10),
+            registration_deadline=timezone.localdate() + timedelta(days=5),
+        )
+        self.client.get(reverse("events:json"))
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse("events:json")).json()
+        self.assertEqual(cached["results"][0]["title"], "Catalog Run")
+
+        event.title = "Renamed Catalog Run"
+        event.save()
+        fresh = self.client.get(reverse("events:json")).json()
+        self.assertEqual(fresh["results"][0]["title"], "Renamed Catalog Run")
+
+
+class DatabaseSettingsTests(TestCase):
+    """Tests for environment-driven connection settings and their startup checks."""
+
+    def test_production_uses_persistent_connections_with_health_checks(self):
+        """Test PostgreSQL keeps connections for a minute and pings them by default."""
+        config = build_databases({"DB_NAME": "vacathon"}, Path("/srv/app"), production=True)["default"]
+
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(config["CONN_MAX_AGE"], 60)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+        self.assertEqual(config["OPTIONS"]["connect_timeout"], 5)
+        self.assertNotIn("pool", config["OPTIONS"])
+
+    def test_pool_replaces_persistent_connections(self):
+        """Test DB_POOL configures psycopg's pool and turns CONN_MAX_AGE off."""
+        env = {"DB_POOL": "true", "DB_POOL_MAX_SIZE": "20", "DB_CONN_MAX_AGE": "600"}
+        with patch("vacathon.db_config.psycopg_pool_available", return_value=True):
+            config = build_databases(env, Path("/srv/app"), production=True)["default"]
+
+        self.assertEqual(config["OPTIONS"]["pool"], {"min_size": 2, "max_size": 20, "timeout": 10})
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+
+        with patch("vacathon.db_config.psycopg_pool_available", return_value=False):
+            with self.assertRaises(ValueError):
+                build_databases({"DB_POOL": "true"}, Path("/srv/app"), production=True)
+            auto = build_databases({"DB_POOL": "auto"}, Path("/srv/app"), production=True)["default"]
+        self.assertNotIn("pool", auto["OPTIONS"])
+
+    def test_sqlite_uses_wal_and_busy_timeout(self):
+        """Test development SQLite connections get WAL, a busy timeout and immediate transactions."""
+        config = build_databases({}, Path("/srv/app"), production=False)["default"]
+
+        self.assertEqual(config["NAME"], "/srv/app/db.sqlite3")
+        self.assertEqual(config["OPTIONS"]["timeout"], 5)
+        self.assertEqual(config["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+        self.assertIn("PRAGMA journal_mode=WAL;", config["OPTIONS"]["init_command"])
+        self.assertIn("PRAGMA synchronous=NORMAL;", config["OPTIONS"]["init_command"])
+
+    def test_pragmas_apply_to_live_connection(self):
+        """Test the configured pragmas run on the test database connection."""
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite pragmas only")
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_checks_flag_connection_per_request(self):
+        """Test the startup check warns when PostgreSQL would reconnect on every request."""
+        databases = {
+            "default": build_databases({"DB_CONN_MAX_AGE": "0"}, Path("/srv/app"), production=True)["default"],
+            "dev": build_databases({"SQLITE_JOURNAL_MODE": "DELETE"}, Path("/srv/app"), production=False)["default"],
+        }
+
+        ids = [message.id for message in database_settings_warnings(databases)]
+
+        self.assertEqual(ids, ["core.W001", "core.W003"])
+        healthy = build_databases({}, Path("/srv/app"), production=True)
+        self.assertEqual(database_settings_warnings(healthy), [])
+
+    def test_deploy_check_reports_effective_settings(self):
+        """Test check --deploy reports each alias's effective connection settings."""
+        config = build_databases({"DB_CONN_MAX_AGE": "120"}, Path("/srv/app"), production=True)["default"]
+
+        summary = describe_database("default", config)
+
+        self.assertIn("default: postgresql", summary)
+        self.assertIn("CONN_MAX_AGE=120", summary)
+        self.assertIn("health_checks=on", summary)
+        self.assertTrue(all(message.id == "core.I001" for message in report_database_settings(None)))
+
+
+@override_settings(READ_REPLICA_ALIAS="replica", REPLICA_PIN_SECONDS=7)
+class ReadReplicaRoutingTests(TransactionTestCase):
+    """Tests for replica reads from designated views with read-your-writes pinning."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.event_fields = {
+            "slug": "city-marathon",
+            "city": "Jakarta",
+            "start_date": timezone.localdate() + timedelta(days=30),
+            "registration_deadline": timezone.localdate() + timedelta(days=20),
+        }
+        # The replica lags behind: it still has the old title.
+        Event.objects.using("replica").create(title="Replica Marathon", **self.event_fields)
+        self.event = Event.objects.create(title="Primary Marathon", **self.event_fields)
+        self.url = reverse("event_detail:detail-json", kwargs={"slug": "city-marathon"})
+
+    def test_designated_views_read_from_replica(self):
+        """Test read-only API views are served from the replica alias."""
+        self.assertEqual(self.client.get(self.url).json()["title"], "Replica Marathon")
+        availability = reverse("event_detail:availability-json", kwargs={"slug": "city-marathon"})
+        self.assertEqual(self.client.get(availability).status_code, 200)
+
+    def test_other_reads_use_primary(self):
+        """Test reads outside designated views and writes always use the primary."""
+        self.assertEqual(Event.objects.get(slug="city-marathon").title, "Primary Marathon")
+        self.assertEqual(ReadReplicaRouter().db_for_write(Event), "default")
+
+    def test_write_pins_client_to_primary(self):
+        """Test a successful write sets the pin cookie so the next reads see it."""
+        user = get_user_model().objects.create_user(username="liker", password="pass12345")
+        thread = ForumThread.objects.create(event=self.event, author=user, title="Pacing", body="Plan")
+        post = ForumPost.objects.create(thread=thread, author=user, content="Even splits")
+        self.client.force_login(user)
+
+        response = self.client.post(reverse("forum:post-like", kwargs={"post_id": post.pk}))
+
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 7)
+        self.assertEqual(self.client.get(self.url).json()["title"], "Primary Marathon")
+
+    def test_failed_write_does_not_pin(self):
+        """Test rejected writes leave the client reading from the replica."""
+        user = get_user_model().objects.create_user(username="liker", password="pass12345")
+        self.client.force_login(user)
+
+        response = self.client.post(reverse("forum:post-like", kwargs={"post_id": 999}))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(self.client.get(self.url).json()["title"], "Replica Marathon")
+
+    def test_replica_alias_configuration(self):
+        """Test the replica alias comes from the environment and tests always get a second SQLite file."""
+        production = build_databases(
+            {"DB_HOST": "primary", "DB_REPLICA_HOST": "replica-1"}, Path("/srv/app"), production=True
+        )
+        testing = build_databases({}, Path("/srv/app"), production=False, testing=True)
+
+        self.assertEqual(production["replica"]["HOST"], "replica-1")
+        self.assertEqual(production["replica"]["TEST"], {"MIRROR": "default"})
+        self.assertNotIn("replica", build_databases({}, Path("/srv/app"), production=False))
+        self.assertEqual(testing["replica"]["TEST"]["NAME"], "/srv/app/test_db_replica.sqlite3")
+
@@ -6,4 +6,5 @@ app_name = "core"
 urlpatterns = [
     path("", views.HomeView.as_view(), name="home"),
     path("about/", views.AboutView.as_view(), name="about"),
+    path("internal/query-stats/", views.query_stats_json, name="query-stats"),
 ]
@@ -1,15 +1,21 @@
 from urllib.parse import quote_plus
 
-from django.db.models import Sum
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.http import JsonResponse
 from django.urls import NoReverseMatch, reverse
 from django.utils import timezone
 from django.utils.text import Truncator
+from django.views.decorators.http import require_GET
 from django.views.generic import TemplateView
 
-from events.models import Event
+from .fragments import fragment_metrics
+from .home_snapshot import get_home_snapshot
+from .instrumentation import query_stats
+from .page_cache import AnonymousPageCacheMixin
 
 
-class HomeView(TemplateView):
+class HomeView(AnonymousPageCacheMixin, TemplateView):
     template_name = "core/home.html"
 
     def get_context_data(self, **kwargs):
@@ -17,26 +23,14 @@ class HomeView(TemplateView):
         today = timezone.localdate()
         context["current_year"] = today.year
 
-        events_qs = Event.objects.prefetch_related("categories").order_by("start_date")
-
-        total_events = events_qs.count()
-        distinct_cities = (
-            events_qs.exclude(city__isnull=True)
-            .exclude(city="")
-            .values("city")
-            .distinct()
-            .count()
-        )
-        total_runners = (
-            events_qs.aggregate(total=Sum("registered_count")).get("total") or 0
-        )
-
-        highlight_event = self._get_highlight_event(events_qs, today)
+        snapshot = get_home_snapshot(today)
+        highlight_event = snapshot.highlight_event
+        context["snapshot_date"] = today.isoformat()
 
         context["stats"] = [
-            {"label": "Events", "value": total_events},
-            {"label": "Registered Runners", "value": total_runners},
-            {"label": "Active Cities", "value": distinct_cities},
+            {"label": "Events", "value": snapshot.total_events},
+            {"label": "Registered Runners", "value": snapshot.total_runners},
+            {"label": "Active Cities", "value": snapshot.distinct_cities},
             {"label": "Partners & Sponsors", "value": 14},
         ]
 
@@ -54,39 +48,9 @@ class HomeView(TemplateView):
             "https://www.youtube.com/embed/aZ9HQJoMPWc?si=PjB2VCz3BuYbw8t2"
         )
 
-        context["upcoming_events"] = self._get_upcoming_events(events_qs, highlight_event)
+        context["upcoming_events"] = snapshot.upcoming_events
         return context
 
-    def _get_highlight_event(self, events_qs, today):
-        upcoming = events_qs.filter(
-            status__in=[Event.Status.UPCOMING, Event.Status.ONGOING],
-        ).order_by("start_date", "-popularity_score")
-        highlight = upcoming.first()
-        if highlight:
-            return highlight
-        fallback = (
-            events_qs.filter(start_date__lte=today)
-            .order_by("-start_date", "-popularity_score")
-            .first()
-        )
-        return fallback or events_qs.first()
-
-    def _get_upcoming_events(self, events_qs, highlight_event):
-        exclude_ids = []
-        if highlight_event:
-            exclude_ids.append(highlight_event.pk)
-
-        prioritized = events_qs.filter(
-            status__in=[Event.Status.UPCOMING, Event.Status.ONGOING]
-        ).exclude(pk__in=exclude_ids)
-
-        events = list(prioritized[:3])
-        if len(events) < 3:
-            already_ids = exclude_ids + [event.pk for event in events]
-            fallback = events_qs.exclude(pk__in=already_ids)
-            events.extend(list(fallback[: 3 - len(events)]))
-        return events
-
     def _build_highlight_headline(self, highlight_event):
         if highlight_event:
             return f"Why run {highlight_event.title}?"
@@ -177,7 +141,7 @@ class HomeView(TemplateView):
             return ""
 
 
-class AboutView(TemplateView):
+class AboutView(AnonymousPageCacheMixin, TemplateView):
     template_name = "core/about.html"
 
     def get_context_data(self, **kwargs):
@@ -192,3 +156,22 @@ class AboutView(TemplateView):
             "Prama Ardend Narendradhipa",
         ]
         return context
+
+
+def _is_admin(user):
+    return user.is_staff or user.is_superuser
+
+
+@login_required
+@user_passes_test(_is_admin)
+@require_GET
+def query_stats_json(request):
+    """Rolling per-view query statistics plus fragment cache hit/miss counters."""
+    return JsonResponse(
+        {
+            "enabled": getattr(settings, "QUERY_INSTRUMENTATION", False),
+            "window": query_stats.window,
+            "views": query_stats.summary(),
+            "fragments": fragment_metrics.snapshot(),
+        }
+    )
@@ -1,13 +1,22 @@
+import json
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.http import Http404
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
 from django.urls import reverse
 from django.utils import timezone
 
 from events.models import Event, EventCategory
 from event_detail.models import AidStation, EventDocument, EventSchedule, RouteSegment
+from event_detail.views import (
+    event_availability_json,
+    event_availability_json_async,
+    event_detail_json,
+    event_detail_json_async,
+)
 
 User = get_user_model()
 
@@ -794,4 +803,61 @@ class EventDetailURLTests(TestCase):
         # Just verify URL is not empty and contains the slug and availability
         self.assertTrue(url)
         self.assertIn('test-event', url)
-        self.assertIn('availability', url)
\ No newline at end of file
+        self.assertIn('availability', url)
+
+
+class EventDetailJSONAsyncViewTests(TestCase):
+    """Tests for the async twins of the event detail and availability APIs."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.event = Event.objects.create(
+            title="Async Marathon",
+            city="Jakarta",
+            country="Indonesia",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+            participant_limit=500,
+            registered_count=125,
+        )
+        self.event.categories.add(
+            EventCategory.objects.create(name="21k", distance_km=Decimal("21.10"), display_name="Half")
+        )
+        EventSchedule.objects.create(
+            event=self.event, title="Race Start", start_time=timezone.now() + timedelta(days=30)
+        )
+        AidStation.objects.create(
+            event=self.event, name="Station 1", kilometer_marker=Decimal("10.00"), supplies="Water"
+        )
+
+    def _call(self, sync_view, async_view, url_name, slug):
+        url = reverse(url_name, kwargs={'slug': slug})
+        sync_response = sync_view(RequestFactory().get(url), slug=slug)
+        async_response = async_to_sync(async_view)(AsyncRequestFactory().get(url), slug=slug)
+        return sync_response, async_response
+
+    def test_async_detail_matches_sync(self):
+        """Test the async detail view returns the same payload as the sync view."""
+        sync_response, async_response = self._call(
+            event_detail_json, event_detail_json_async, 'event_detail:detail-json', self.event.slug
+        )
+        self.assertEqual(async_response.status_code, 200)
+        self.assertJSONEqual(async_response.content, sync_response.content.decode())
+
+    def test_async_availability_matches_sync(self):
+        """Test the async availability view returns the same payload as the sync view."""
+        sync_response, async_response = self._call(
+            event_availability_json,
+            event_availability_json_async,
+            'event_detail:availability-json',
+            self.event.slug,
+        )
+        self.assertJSONEqual(async_response.content, sync_response.content.decode())
+        self.assertEqual(json.loads(async_response.content)['remaining'], 375)
+
+    def test_async_views_raise_404_for_unknown_slug(self):
+        """Test the async views raise Http404 like get_object_or_404."""
+        request = AsyncRequestFactory().get('/')
+        for view in (event_detail_json_async, event_availability_json_async):
+            with self.subTest(view=view.__name__), self.assertRaises(Http404):
+                async_to_sync(view)(request, slug='missing')
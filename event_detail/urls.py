@@ -1,11 +1,26 @@
+from django.conf import settings
 from django.urls import path
 
-from .views import EventDetailView, event_availability_json, event_detail_json
+from .views import (
+    EventDetailView,
+    event_availability_json,
+    event_availability_json_async,
+    event_detail_json,
+    event_detail_json_async,
+)
 
 app_name = "event_detail"
 
 urlpatterns = [
     path("events/<slug:slug>/", EventDetailView.as_view(), name="detail"),
-    path("events/<slug:slug>/api/", event_detail_json, name="detail-json"),
-    path("events/<slug:slug>/availability/", event_availability_json, name="availability-json"),
+    path(
+        "events/<slug:slug>/api/",
+        event_detail_json_async if settings.ASYNC_API_VIEWS else event_detail_json,
+        name="detail-json",
+    ),
+    path(
+        "events/<slug:slug>/availability/",
+        event_availability_json_async if settings.ASYNC_API_VIEWS else event_availability_json,
+        name="availability-json",
+    ),
 ]
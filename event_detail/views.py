@@ -1,13 +1,14 @@
 from urllib.parse import quote_plus
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.views.decorators.http import require_GET
 from django.views.generic import DetailView
 from django.urls import NoReverseMatch, reverse
 
+from core.db_routing import use_read_replica
 from events.models import Event
 
 
@@ -99,16 +100,34 @@ class EventDetailView(LoginRequiredMixin, DetailView):
         return f"https://www.google.com/maps?q={query}&output=embed"
 
 
+DETAIL_JSON_PREFETCH = ("categories", "route_segments", "aid_stations", "schedules", "documents")
+
+
+async def _aget_event_or_404(queryset, **lookup):
+    try:
+        return await queryset.aget(**lookup)
+    except Event.DoesNotExist:
+        raise Http404("No Event matches the given query.")
+
+
 @require_GET
+@use_read_replica
 def event_detail_json(request, slug):
-    event = get_object_or_404(
-        Event.objects.prefetch_related(
-            "categories", "route_segments", "aid_stations", "schedules", "documents"
-        ),
-        slug=slug,
+    event = get_object_or_404(Event.objects.prefetch_related(*DETAIL_JSON_PREFETCH), slug=slug)
+    return JsonResponse(_event_detail_payload(event))
+
+
+@require_GET
+@use_read_replica
+async def event_detail_json_async(request, slug):
+    event = await _aget_event_or_404(
+        Event.objects.prefetch_related(*DETAIL_JSON_PREFETCH), slug=slug
     )
+    return JsonResponse(_event_detail_payload(event))
+
 
-    data = {
+def _event_detail_payload(event):
+    return {
         "id": event.id,
         "title": event.title,
         "description": event.description,
@@ -185,12 +204,22 @@ def event_detail_json(request, slug):
         ],
     }
 
-    return JsonResponse(data)
-
 
 @require_GET
+@use_read_replica
 def event_availability_json(request, slug):
     event = get_object_or_404(Event, slug=slug)
+    return JsonResponse(_availability_payload(event))
+
+
+@require_GET
+@use_read_replica
+async def event_availability_json_async(request, slug):
+    event = await _aget_event_or_404(Event.objects.all(), slug=slug)
+    return JsonResponse(_availability_payload(event))
+
+
+def _availability_payload(event):
     capacity = event.participant_limit or 0
     registered = event.registered_count or 0
     remaining = max(capacity - registered, 0) if capacity else None
@@ -198,18 +227,16 @@ def event_availability_json(request, slug):
     if capacity:
         capacity_ratio = min(100, round((registered / capacity) * 100))
 
-    return JsonResponse(
-        {
-            "event_id": event.id,
-            "capacity": capacity,
-            "registered": registered,
-            "remaining": remaining,
-            "capacity_ratio": capacity_ratio,
-            "is_registration_open": event.is_registration_open,
-            "registration_deadline": event.registration_deadline.isoformat(),
-            "registration_open_date": event.registration_open_date.isoformat()
-            if event.registration_open_date
-            else None,
-            "status": event.status,
-        }
-    )
+    return {
+        "event_id": event.id,
+        "capacity": capacity,
+        "registered": registered,
+        "remaining": remaining,
+        "capacity_ratio": capacity_ratio,
+        "is_registration_open": event.is_registration_open,
+        "registration_deadline": event.registration_deadline.isoformat(),
+        "registration_open_date": event.registration_open_date.isoformat()
+        if event.registration_open_date
+        else None,
+        "status": event.status,
+    }
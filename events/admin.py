@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Event, EventCategory
+from .models import Event, EventCategory, ImportRun
 
 
 @admin.register(EventCategory)
@@ -27,3 +27,19 @@ class EventAdmin(admin.ModelAdmin):
     @admin.display(boolean=True)
     def is_registration_open(self, obj):
         return obj.is_registration_open
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "source",
+        "status",
+        "started_at",
+        "finished_at",
+        "batches_committed",
+        "created_count",
+        "updated_count",
+        "skipped_count",
+    )
+    list_filter = ("status",)
+    search_fields = ("source", "source_hash")
@@ -27,22 +27,32 @@ class EventFilterForm(forms.Form):
         label="Sort",
     )
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, category_choices=None, **kwargs):
         super().__init__(*args, **kwargs)
         status_choices = [("", "Any status")] + list(Event.Status.choices)
         self.fields["status"].choices = status_choices
 
-        category_choices = [("", "All distances")]
-        category_choices.extend(
-            (category.id, category.display_name)
-            for category in EventCategory.objects.order_by("distance_km")
-        )
-        self.fields["category"].choices = category_choices
+        if category_choices is None:
+            category_choices = [
+                (category.id, category.display_name)
+                for category in EventCategory.objects.order_by("distance_km")
+            ]
+        self.fields["category"].choices = [("", "All distances"), *category_choices]
 
         for field in self.fields.values():
             existing_class = field.widget.attrs.get("class", "")
             field.widget.attrs["class"] = f"{existing_class} control".strip()
 
+    @classmethod
+    async def abuild(cls, data=None):
+        """Build the form from an async view, loading category choices with the async ORM."""
+
+        category_choices = [
+            (category.id, category.display_name)
+            async for category in EventCategory.objects.order_by("distance_km")
+        ]
+        return cls(data, category_choices=category_choices)
+
     def filter_queryset(self, queryset):
         if not self.is_valid():
             return queryset
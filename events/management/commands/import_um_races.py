@@ -1,341 +1,57 @@
 import csv
+import hashlib
 import random
-import re
-from collections import OrderedDict
-from dataclasses import dataclass, field
-from datetime import date, datetime, timedelta
-from decimal import Decimal, ROUND_HALF_UP
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
 from pathlib import Path
-from typing import Iterable, Optional, Tuple
+from typing import Optional, Tuple
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
 from django.utils.text import slugify
 
-from events.models import Event, EventCategory
-
-
-@dataclass
-class EventRecord:
-    """Aggregated information for a single event coming from the CSV dataset."""
-
-    year: int
-    base_name: str
-    country_code: Optional[str]
-    country: str
-    original_name: str
-    date_label: str
-    original_start_date: date
-    original_end_date: Optional[date]
-    finishers: int = 0
-    distance_labels: set[str] = field(default_factory=set)
-    rows: int = 0
-    generated_start_date: Optional[date] = None
-    generated_end_date: Optional[date] = None
-    registration_open_date: Optional[date] = None
-    registration_close_date: Optional[date] = None
-
-    def add_distance(self, distance: Optional[str]) -> None:
-        if distance:
-            self.distance_labels.add(distance.strip())
-
-    def increase_finishers(self, value: Optional[int]) -> None:
-        if value is None:
-            return
-        self.finishers = max(self.finishers, value)
-
-    @property
-    def title(self) -> str:
-        return f"{self.base_name} {self.year}"
-
-    @property
-    def city(self) -> str:
-        return self.base_name
-
-    @property
-    def venue(self) -> str:
-        return self.base_name
-
-    def build_description(self) -> str:
-        title_text = self.original_name
-
-        def _format_location() -> str:
-            parts = []
-            if self.base_name:
-                parts.append(self.base_name)
-            if self.country and self.country != "Unknown":
-                parts.append(self.country)
-            return ", ".join(parts) if parts else "this destination"
-
-        def _format_date_range() -> str:
-            if not self.generated_start_date:
-                return ""
-            start = self.generated_start_date
-            end = self.generated_end_date or self.generated_start_date
-            if start == end:
-                return start.strftime("%B %d, %Y")
-            if start.year == end.year and start.month == end.month:
-                return f"{start.strftime('%B %d')}-{end.strftime('%d, %Y')}"
-            return f"{start.strftime('%B %d, %Y')} - {end.strftime('%B %d, %Y')}"
-
-        def _highlight_distance() -> Optional[str]:
-            if not self.distance_labels:
-                return None
-            sortable: list[tuple[Decimal | int, str]] = []
-            for label in self.distance_labels:
-                distance_value = parse_distance_km(label)
-                if distance_value is not None:
-                    sortable.append((distance_value, label))
-                else:
-                    sortable.append((Decimal("0"), label))
-            sortable.sort(key=lambda item: (item[0], len(item[1]), item[1].lower()), reverse=True)
-            return sortable[0][1]
-
-        location_text = _format_location()
-        date_range_text = _format_date_range()
-        highlighted_distance = _highlight_distance()
-
-        if self.generated_start_date and self.generated_end_date and self.generated_end_date != self.generated_start_date:
-            adventure_label = f"{(self.generated_end_date - self.generated_start_date).days + 1}-day ultra adventure"
-        elif self.generated_start_date:
-            adventure_label = "single-day ultra challenge"
-        else:
-            adventure_label = "signature ultra challenge"
-
-        distance_phrase = (
-            f"a {highlighted_distance} journey"
-            if highlighted_distance
-            else "an unforgettable endurance journey"
-        )
-
-        lines: list[str] = []
-        lines.append(
-            f"Step into one of the most demanding yet rewarding endurance challenges -- {title_text}. "
-            f"Test your physical and mental limits across {location_text}, where every mile is a story of grit, determination, and discovery."
-        )
-
-        if date_range_text:
-            lines.append(
-                f"This {adventure_label} ({date_range_text}) offers {distance_phrase} designed for both elite ultrarunners and determined first-timers. "
-                f"With exceptional course support, scenic terrain, and a tight-knit endurance community, {self.base_name or 'this race'} delivers more than a run -- it's an experience that transforms."
-            )
-        else:
-            lines.append(
-                f"This {adventure_label} offers {distance_phrase} designed for both elite ultrarunners and determined first-timers. "
-                f"With exceptional course support, scenic terrain, and a tight-knit endurance community, {self.base_name or 'this race'} delivers more than a run -- it's an experience that transforms."
-            )
-
-        if self.finishers:
-            lines.append(
-                f"Join a legacy of finishers celebrated for their courage, camaraderie, and perseverance. "
-                f"Historical results showcase {self.finishers} athletes who have already conquered the course."
-            )
-        else:
-            lines.append(
-                "Join a legacy of finishers celebrated for their courage, camaraderie, and perseverance."
-            )
-
-        if self.registration_open_date:
-            open_text = self.registration_open_date.strftime("%B %d, %Y")
-            lines.append(
-                f"Registration opens {open_text}, giving you space to prepare, train, and plan your ultimate ultra-running adventure."
-            )
-        if self.registration_close_date:
-            close_text = self.registration_close_date.strftime("%B %d, %Y")
-            lines.append(f"Secure your spot before registration closes on {close_text}.")
-
-        lines.append(f"Ready to go beyond your limits? {location_text} awaits.")
-
-        return "\n\n".join(lines)
-
-
-COUNTRY_OVERRIDES = {
-    "ARG": "Argentina",
-    "AUS": "Australia",
-    "AUT": "Austria",
-    "BEL": "Belgium",
-    "BRA": "Brazil",
-    "CAN": "Canada",
-    "CHE": "Switzerland",
-    "CHI": "Chile",
-    "CHN": "China",
-    "CZE": "Czech Republic",
-    "DEU": "Germany",
-    "DNK": "Denmark",
-    "ESP": "Spain",
-    "EST": "Estonia",
-    "FIN": "Finland",
-    "FRA": "France",
-    "GBR": "United Kingdom",
-    "HUN": "Hungary",
-    "IRL": "Ireland",
-    "ITA": "Italy",
-    "JPN": "Japan",
-    "MEX": "Mexico",
-    "NED": "Netherlands",
-    "NOR": "Norway",
-    "NZL": "New Zealand",
-    "POL": "Poland",
-    "PRT": "Portugal",
-    "ROU": "Romania",
-    "SWE": "Sweden",
-    "USA": "United States",
-}
-
-
-def normalize_country(code: Optional[str]) -> str:
-    if not code:
-        return "Unknown"
-    normalized = code.strip().upper()
-    return COUNTRY_OVERRIDES.get(normalized, normalized)
-
-
-def parse_year(value: Optional[str]) -> Optional[int]:
-    if value is None:
-        return None
-    text = value.strip()
-    if not text:
-        return None
-    try:
-        return int(float(text))
-    except ValueError:
-        return None
-
-
-def parse_int(value: Optional[str]) -> Optional[int]:
-    if value is None:
-        return None
-    text = value.strip()
-    if not text:
-        return None
-    try:
-        return int(float(text))
-    except ValueError:
-        return None
-
-
-def split_event_name(raw_name: str) -> Tuple[str, Optional[str]]:
-    name = raw_name.strip()
-    if name.endswith(")") and "(" in name:
-        prefix, _, suffix = name.rpartition("(")
-        country_candidate = suffix.rstrip(")")
-        country_candidate = country_candidate.strip()
-        if len(country_candidate) in {2, 3} and country_candidate.isalpha():
-            return prefix.strip(), country_candidate.upper()
-    return name, None
-
-
-def parse_event_dates(label: str, fallback_year: int) -> Tuple[Optional[date], Optional[date]]:
-    """
-    Parse event dates that are expressed in several shorthand formats:
-    - 06.01.2018
-    - 05.-06.01.2018
-    - 23.-25.03.2018
-    - 23.03.-08.04.2018
-    - 28.12.-02.01.2019
-    """
-
-    if not label:
-        return None, None
-
-    cleaned = label.strip().replace("\u2013", "-").replace("\u2014", "-")
-    cleaned = cleaned.replace(" ", "")
-    cleaned = cleaned.replace("/", ".")
-
-    parts = cleaned.split("-")
-    if len(parts) == 1:
-        single = _parse_date_fragment(parts[0], fallback_year=fallback_year)
-        return single, single
-
-    start_fragment = parts[0]
-    end_fragment = parts[-1]
-
-    end_date = _parse_date_fragment(end_fragment, fallback_year=fallback_year)
-    start_date = _parse_date_fragment(
-        start_fragment,
-        fallback_year=end_date.year if end_date else fallback_year,
-        inherit_month=end_date.month if end_date else None,
-    )
-
-    if start_date and end_date and start_date > end_date:
-        # Handle cases crossing the year boundary (e.g., 28.12.-02.01.2019).
-        adjusted_year = start_date.year - 1
-        try:
-            start_date = start_date.replace(year=adjusted_year)
-        except ValueError:
-            pass
-
-    if start_date and not end_date:
-        return start_date, start_date
-    if end_date and not start_date:
-        return end_date, end_date
-
-    return start_date, end_date
-
-
-def _parse_date_fragment(
-    fragment: str,
-    *,
-    fallback_year: int,
-    inherit_month: Optional[int] = None,
-) -> Optional[date]:
-    if not fragment:
-        return None
-
-    token = fragment.strip(".")
-    if not token:
-        return None
-
-    bits = [part for part in token.split(".") if part]
-
-    if len(bits) == 3:
-        day_txt, month_txt, year_txt = bits
-    elif len(bits) == 2:
-        day_txt, month_txt = bits
-        year_txt = str(fallback_year)
-    elif len(bits) == 1:
-        day_txt = bits[0]
-        month_txt = str(inherit_month if inherit_month else 1)
-        year_txt = str(fallback_year)
-    else:
-        return None
-
-    try:
-        day = int(day_txt)
-        month = int(month_txt)
-        year = int(year_txt)
-        return datetime(year, month, day).date()
-    except ValueError:
-        return None
-
-
-DISTANCE_RE = re.compile(r"(?P<value>\d+(?:\.\d+)?)(?P<unit>km|mi|h)$", re.IGNORECASE)
-
-
-def parse_distance_km(label: str) -> Optional[Decimal]:
-    if not label:
-        return None
-    text = label.strip().lower()
-    match = DISTANCE_RE.match(text)
-    if not match:
-        if "h" in text:
-            return Decimal("0")
-        return None
-
-    value = Decimal(match.group("value"))
-    unit = match.group("unit").lower()
-
-    if unit == "km":
-        return value
-    if unit == "mi":
-        return (value * Decimal("1.60934")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    # Hour-based events get a nominal zero distance, but we still keep the label.
-    return Decimal("0")
-
-
-def quantize_distance(value: Decimal) -> Decimal:
-    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+from core.page_cache import invalidate_event_pages
+from events.models import Event, EventCategory, ImportedRecord, ImportRun
+from events.um_races import (
+    EventKey,
+    EventRecord,
+    add_parser_stats,
+    aggregate_rows,
+    chunked,
+    diff_parser_stats,
+    enable_parser_timing,
+    file_sha256,
+    merge_aggregates,
+    parse_csv_range,
+    parse_distance_km,
+    parser_stats,
+    plan_byte_ranges,
+    quantize_distance,
+)
+
+
+EVENT_DATA_FIELDS = [
+    "description",
+    "city",
+    "country",
+    "venue",
+    "start_date",
+    "end_date",
+    "registration_open_date",
+    "registration_deadline",
+    "status",
+    "popularity_score",
+    "participant_limit",
+    "registered_count",
+    "featured",
+    "banner_image",
+]
 
 
 class Command(BaseCommand):
@@ -358,6 +74,33 @@ class Command(BaseCommand):
             action="store_true",
             help="Preview the events without creating database records.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of events written per bulk transaction (default: 500).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue the last interrupted run of the same file from its last committed batch.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rewrite every event, even when its content fingerprint is unchanged.",
+        )
+        parser.add_argument(
+            "--parser-stats",
+            action="store_true",
+            help="Report cache hit rates and time spent in each memoized parser.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Parse the CSV in N worker processes (default: 1, parse serially).",
+        )
 
     def handle(self, *args, **options):
         csv_path = Path(options["csv"])
@@ -368,160 +111,358 @@ class Command(BaseCommand):
 
         limit = options.get("limit")
         dry_run = options.get("dry_run", False)
-
-        aggregated_events: OrderedDict[Tuple, EventRecord] = OrderedDict()
+        batch_size = options.get("batch_size") or 500
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        workers = options.get("workers") or 1
+        if workers < 1:
+            raise CommandError("--workers must be a positive integer.")
 
         self.stdout.write(f"Reading data from {csv_path}...")
 
-        with open(csv_path, newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                record = self._extract_event_record(row)
-                if record is None:
-                    continue
-
-                key = (
-                    record.year,
-                    record.base_name.lower(),
-                    record.country_code or "",
-                    record.original_start_date,
-                    record.original_end_date,
-                )
-
-                existing = aggregated_events.get(key)
-                if existing is None:
-                    if limit and len(aggregated_events) >= limit:
-                        continue
-                    aggregated_events[key] = record
-                    existing = record
-                else:
-                    existing.increase_finishers(record.finishers)
+        self.show_parser_stats = options.get("parser_stats", False)
+        enable_parser_timing(self.show_parser_stats)
+        self.worker_parser_stats: dict[str, dict[str, float]] = {}
+        stats_before = parser_stats()
 
-                existing.add_distance(row.get("Event distance/length"))
-                existing.rows += 1
+        started = time.perf_counter()
+        aggregated_events: dict[EventKey, EventRecord] = {}
+        if workers > 1:
+            rows_read = self._read_parallel(csv_path, aggregated_events, limit=limit, workers=workers)
+        else:
+            with open(csv_path, newline="", encoding="utf-8") as csvfile:
+                rows_read = aggregate_rows(csv.DictReader(csvfile), aggregated_events, limit=limit)
+        parse_seconds = time.perf_counter() - started
 
         if not aggregated_events:
             self.stdout.write(self.style.WARNING("No events could be parsed from the dataset."))
             return
 
+        self.stdout.write(
+            f"Read {rows_read} rows in {parse_seconds:.1f}s "
+            f"({self._rate(rows_read, parse_seconds)} rows/s)."
+        )
         self.stdout.write(f"Prepared {len(aggregated_events)} unique events.")
 
-        created = 0
-        updated = 0
-        dry_run_messages = []
-        category_cache: dict[str, EventCategory] = {}
-
+        # Records sharing a title update the same Event rows, so the last one wins.
+        records_by_title: dict[str, EventRecord] = {}
         for record in aggregated_events.values():
-            (
-                generated_start,
-                generated_end,
-                registration_open,
-                registration_deadline,
-            ) = self._generate_schedule(record)
-
-            record.generated_start_date = generated_start
-            record.generated_end_date = generated_end
-            record.registration_open_date = registration_open
-            record.registration_close_date = registration_deadline
-
-            if dry_run:
-                end_label = (
-                    generated_end.isoformat() if generated_end else generated_start.isoformat()
-                )
-                dry_run_messages.append(
-                    f"[DRY RUN] Would upsert event: {record.title} "
-                    f"({generated_start.isoformat()} - {end_label}) "
-                    f"[registration {registration_open.isoformat()} -> {registration_deadline.isoformat()}]"
-                )
-                continue
-
-            event_data = {
-                "description": record.build_description(),
-                "city": record.city,
-                "country": record.country,
-                "venue": record.venue,
-                "start_date": generated_start,
-                "end_date": generated_end,
-                "registration_open_date": registration_open,
-                "registration_deadline": registration_deadline,
-                "status": self._determine_status(generated_start, generated_end),
-                "popularity_score": max(record.finishers, 0),
-                "participant_limit": max(record.finishers, 0),
-                "registered_count": max(record.finishers, 0),
-                "featured": False,
-                "banner_image": "",
-            }
-
-            with transaction.atomic():
-                events_qs = Event.objects.filter(title=record.title).order_by("created_at", "id")
-                if events_qs.exists():
-                    event = events_qs.first()
-                    created_flag = False
-                else:
-                    event = Event(title=record.title)
-                    created_flag = True
-
-                for field, value in event_data.items():
-                    setattr(event, field, value)
-
-                if created_flag:
-                    event.save()
-                    created += 1
-                else:
-                    event.save(update_fields=list(event_data.keys()))
-                    updated += 1
-
-                categories = self._get_categories_for_record(record, category_cache)
-                event.categories.set(categories)
-
-                duplicates_qs = events_qs.exclude(pk=event.pk)
-                duplicates = list(duplicates_qs)
-                for duplicate in duplicates:
-                    for field, value in event_data.items():
-                        setattr(duplicate, field, value)
-                    duplicate.save(update_fields=list(event_data.keys()))
-                    duplicate.categories.set(categories)
-                if duplicates:
-                    updated += len(duplicates)
+            self._apply_schedule(record)
+            records_by_title[record.title] = record
 
         if dry_run:
-            for message in dry_run_messages:
-                self.stdout.write(message)
+            for record in aggregated_events.values():
+                end_date = record.generated_end_date or record.generated_start_date
+                self.stdout.write(
+                    f"[DRY RUN] Would upsert event: {record.title} "
+                    f"({record.generated_start_date.isoformat()} - {end_date.isoformat()}) "
+                    f"[registration {record.registration_open_date.isoformat()} -> "
+                    f"{record.registration_close_date.isoformat()}]"
+                )
             self.stdout.write(self.style.WARNING("Dry run completed. No database changes were made."))
+            self._report_parser_stats(stats_before)
             return
 
+        records = list(records_by_title.values())
+        batches = list(chunked(records, batch_size))
+        run, first_batch = self._start_run(
+            csv_path,
+            limit=limit,
+            batch_size=batch_size,
+            total_records=len(records),
+            resume=options.get("resume", False),
+        )
+
+        write_started = time.perf_counter()
+        categories = self._resolve_categories(
+            {
+                label
+                for batch in batches[first_batch:]
+                for record in batch
+                for label in record.distance_labels
+            },
+            batch_size=batch_size,
+        )
+
+        slugs = Event.slug_allocator()
+        full = options.get("full", False)
+        created = 0
+        updated = 0
+        skipped = 0
+        try:
+            for index in range(first_batch, len(batches)):
+                batch_created, batch_updated, batch_skipped = self._write_batch(
+                    batches[index],
+                    categories,
+                    slugs,
+                    batch_size,
+                    run=run,
+                    batch_index=index,
+                    full=full,
+                )
+                created += batch_created
+                updated += batch_updated
+                skipped += batch_skipped
+                elapsed = time.perf_counter() - write_started
+                titles_done = min((index + 1) * batch_size, len(records))
+                self.stdout.write(
+                    f"  {titles_done}/{len(records)} titles processed "
+                    f"({self._rate(created + updated, elapsed)} events/s)"
+                )
+        except BaseException:
+            ImportRun.objects.filter(pk=run.pk).update(
+                status=ImportRun.Status.FAILED, finished_at=timezone.now()
+            )
+            raise
+
+        ImportRun.objects.filter(pk=run.pk).update(
+            status=ImportRun.Status.COMPLETED, finished_at=timezone.now()
+        )
+        # Bulk writes bypass the Event signals.
+        invalidate_event_pages()
+
+        write_seconds = time.perf_counter() - write_started
         self.stdout.write(self.style.SUCCESS(f"Created {created} events."))
         if updated:
             self.stdout.write(self.style.SUCCESS(f"Updated {updated} events."))
+        if skipped:
+            self.stdout.write(f"Skipped {skipped} unchanged events.")
+        self.stdout.write(
+            f"Finished in {parse_seconds + write_seconds:.1f}s "
+            f"(parse {parse_seconds:.1f}s, write {write_seconds:.1f}s, "
+            f"{self._rate(created + updated, write_seconds)} events/s)."
+        )
+        self._report_parser_stats(stats_before)
+
+    def _report_parser_stats(self, stats_before: dict) -> None:
+        if not self.show_parser_stats:
+            return
+        stats = diff_parser_stats(parser_stats(), stats_before)
+        enable_parser_timing(False)
+        add_parser_stats(stats, self.worker_parser_stats)
+        self.stdout.write("Parser stats:")
+        for name, values in sorted(stats.items()):
+            calls = values["hits"] + values["misses"]
+            hit_rate = (values["hits"] / calls * 100) if calls else 0.0
+            self.stdout.write(
+                f"  {name}: {int(calls)} calls, {int(values['misses'])} distinct, "
+                f"{hit_rate:.1f}% hits, {values['seconds']:.2f}s"
+            )
+
+    def _start_run(
+        self,
+        csv_path: Path,
+        *,
+        limit: Optional[int],
+        batch_size: int,
+        total_records: int,
+        resume: bool,
+    ) -> Tuple[ImportRun, int]:
+        source_hash = file_sha256(csv_path)
+        options_hash = hashlib.sha256(f"{limit}|{batch_size}".encode()).hexdigest()
+
+        if resume:
+            run = ImportRun.objects.filter(
+                source_hash=source_hash,
+                options_hash=options_hash,
+                status__in=[ImportRun.Status.RUNNING, ImportRun.Status.FAILED],
+            ).first()
+            if run is not None:
+                ImportRun.objects.filter(pk=run.pk).update(
+                    status=ImportRun.Status.RUNNING, finished_at=None
+                )
+                self.stdout.write(
+                    f"Resuming import run #{run.pk} after batch "
+                    f"{run.batches_committed}/{-(-total_records // batch_size)}."
+                )
+                return run, run.batches_committed
+            self.stdout.write(
+                self.style.WARNING("No interrupted run matches this file and options; starting a new import.")
+            )
 
-    def _extract_event_record(self, row: dict) -> Optional[EventRecord]:
-        year = parse_year(row.get("Year of event"))
-        raw_name = (row.get("Event name") or "").strip()
-        date_label = (row.get("Event dates") or "").strip()
-
-        if not year or not raw_name or not date_label:
-            return None
-
-        base_name, country_code = split_event_name(raw_name)
-        country = normalize_country(country_code)
-
-        original_start, original_end = parse_event_dates(date_label, fallback_year=year)
-        if original_start is None:
-            return None
-
-        finishers = parse_int(row.get("Event number of finishers")) or 0
-
-        return EventRecord(
-            year=year,
-            base_name=base_name,
-            country_code=country_code,
-            country=country,
-            original_name=raw_name,
-            date_label=date_label,
-            original_start_date=original_start,
-            original_end_date=original_end,
-            finishers=finishers,
+        run = ImportRun.objects.create(
+            source=str(csv_path)[-255:],
+            source_hash=source_hash,
+            options_hash=options_hash,
+            total_records=total_records,
+            batch_size=batch_size,
         )
+        return run, 0
+
+    def _read_parallel(
+        self,
+        csv_path: Path,
+        aggregated: dict[EventKey, EventRecord],
+        *,
+        limit: Optional[int],
+        workers: int,
+    ) -> int:
+        # Several ranges per worker keep the pool busy when row density varies.
+        fieldnames, data_start, ranges = plan_byte_ranges(csv_path, workers * 4)
+        rows_read = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    parse_csv_range,
+                    str(csv_path),
+                    start,
+                    end,
+                    fieldnames,
+                    data_start,
+                    self.show_parser_stats,
+                )
+                for start, end in ranges
+            ]
+            # Merge in file order so the aggregates match a serial run.
+            for future in futures:
+                chunk_rows, partial, chunk_stats = future.result()
+                rows_read += chunk_rows
+                merge_aggregates(aggregated, partial, limit=limit)
+                add_parser_stats(self.worker_parser_stats, chunk_stats)
+        return rows_read
+
+    @staticmethod
+    def _rate(count: int, seconds: float) -> str:
+        if seconds <= 0:
+            return str(count)
+        return f"{count / seconds:.0f}"
+
+    def _apply_schedule(self, record: EventRecord) -> None:
+        (
+            record.generated_start_date,
+            record.generated_end_date,
+            record.registration_open_date,
+            record.registration_close_date,
+        ) = self._generate_schedule(record)
+
+    def _build_event_data(self, record: EventRecord) -> dict:
+        finishers = max(record.finishers, 0)
+        return {
+            "description": record.build_description(),
+            "city": record.city,
+            "country": record.country,
+            "venue": record.venue,
+            "start_date": record.generated_start_date,
+            "end_date": record.generated_end_date,
+            "registration_open_date": record.registration_open_date,
+            "registration_deadline": record.registration_close_date,
+            "status": self._determine_status(record.generated_start_date, record.generated_end_date),
+            "popularity_score": finishers,
+            "participant_limit": finishers,
+            "registered_count": finishers,
+            "featured": False,
+            "banner_image": "",
+        }
+
+    def _write_batch(
+        self,
+        records: list[EventRecord],
+        categories: dict[str, EventCategory],
+        slugs,
+        batch_size: int,
+        *,
+        run: ImportRun,
+        batch_index: int,
+        full: bool,
+    ) -> Tuple[int, int, int]:
+        fingerprints = {record.title: record.fingerprint() for record in records}
+        received = len(records)
+
+        existing: dict[str, list[Event]] = defaultdict(list)
+        for event in Event.objects.filter(title__in=list(fingerprints)).order_by("created_at", "id"):
+            existing[event.title].append(event)
+
+        skipped_titles: set[str] = set()
+        if not full:
+            known = dict(
+                ImportedRecord.objects.filter(key__in=list(fingerprints)).values_list(
+                    "key", "content_hash"
+                )
+            )
+            # An unchanged row whose event was deleted since is re-created.
+            skipped_titles = {
+                title
+                for title, fingerprint in fingerprints.items()
+                if known.get(title) == fingerprint and title in existing
+            }
+            records = [record for record in records if record.title not in skipped_titles]
+        skipped = received - len(records)
+
+        slugs.prime(record.title for record in records if record.title not in existing)
+
+        now = timezone.now()
+        to_create: list[Event] = []
+        to_update: list[Event] = []
+        assignments: list[Tuple[list[Event], list[EventCategory]]] = []
+
+        for record in records:
+            event_data = self._build_event_data(record)
+            events = existing.get(record.title)
+            if events:
+                for event in events:
+                    for field_name, value in event_data.items():
+                        setattr(event, field_name, value)
+                    event.updated_at = now
+                to_update.extend(events)
+            else:
+                event = Event(title=record.title, slug=slugs.allocate(record.title), **event_data)
+                to_create.append(event)
+                events = [event]
+            assignments.append(
+                (events, [categories[label] for label in sorted(record.distance_labels)])
+            )
+
+        through_model = Event.categories.through
+        with transaction.atomic():
+            Event.objects.bulk_create(to_create, batch_size=batch_size)
+            # Existing rows are rewritten with one ON CONFLICT upsert per batch;
+            # bulk_update's CASE expressions are far slower for wide rows.
+            Event.objects.bulk_create(
+                to_update,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=EVENT_DATA_FIELDS + ["updated_at"],
+            )
+            through_model.objects.filter(event_id__in=[event.pk for event in to_update]).delete()
+            through_model.objects.bulk_create(
+                [
+                    through_model(event_id=event.pk, eventcategory_id=category.pk)
+                    for events, event_categories in assignments
+                    for event in events
+                    for category in event_categories
+                ],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+            ImportedRecord.objects.bulk_create(
+                [
+                    ImportedRecord(key=record.title, content_hash=fingerprints[record.title], run=run)
+                    for record in records
+                ],
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["key"],
+                update_fields=["content_hash", "run", "updated_at"],
+            )
+            if skipped_titles:
+                # Skipped events keep the schedule they were imported with,
+                # but their status has to follow the calendar. updated_at
+                # versions the cached event cards, so it moves with it.
+                status = self._status_expression()
+                Event.objects.filter(title__in=skipped_titles).alias(derived_status=status).exclude(
+                    status=F("derived_status")
+                ).update(status=status, updated_at=now)
+            # Checkpoint in the same transaction so --resume never skips
+            # a batch whose writes were rolled back.
+            ImportRun.objects.filter(pk=run.pk).update(
+                batches_committed=batch_index + 1,
+                created_count=F("created_count") + len(to_create),
+                updated_count=F("updated_count") + len(to_update),
+                skipped_count=F("skipped_count") + skipped,
+            )
+
+        return len(to_create), len(to_update), skipped
 
     def _generate_schedule(
         self,
@@ -570,40 +511,78 @@ class Command(BaseCommand):
             return Event.Status.ONGOING
         return Event.Status.COMPLETED
 
-    def _get_categories_for_record(
-        self,
-        record: EventRecord,
-        cache: dict[str, EventCategory],
-    ) -> Iterable[EventCategory]:
-        categories = []
-        for label in sorted(record.distance_labels):
-            cached = cache.get(label)
-            if cached:
-                categories.append(cached)
-                continue
+    @staticmethod
+    def _status_expression():
+        """``_determine_status`` as a database expression over the stored dates."""
+
+        today = date.today()
+        return Case(
+            When(start_date__gt=today, then=Value(Event.Status.UPCOMING)),
+            When(
+                Q(end_date__gte=today) | Q(end_date__isnull=True, start_date=today),
+                then=Value(Event.Status.ONGOING),
+            ),
+            default=Value(Event.Status.COMPLETED),
+        )
 
+    def _resolve_categories(
+        self,
+        labels: set[str],
+        *,
+        batch_size: int,
+    ) -> dict[str, EventCategory]:
+        ordered_labels = sorted(labels)
+        categories: dict[str, EventCategory] = {}
+        for batch in chunked(ordered_labels, batch_size):
+            for category in EventCategory.objects.filter(display_name__in=batch):
+                categories[category.display_name] = category
+
+        to_update = []
+        for label, category in categories.items():
             distance_km = parse_distance_km(label)
-            distance_value = quantize_distance(distance_km) if distance_km is not None else Decimal("0")
-
-            name_slug = slugify(label)[:100]
-            if not name_slug:
-                name_slug = slugify(label.replace(":", "-"))[:100]
-            if not name_slug:
-                name_slug = f"distance-{abs(hash(label))}"
-
-            category, created = EventCategory.objects.get_or_create(
-                display_name=label,
-                defaults={
-                    "name": name_slug[:100],
-                    "distance_km": distance_value,
-                },
+            if distance_km is not None and category.distance_km == Decimal("0"):
+                category.distance_km = quantize_distance(distance_km)
+                to_update.append(category)
+
+        missing = [label for label in ordered_labels if label not in categories]
+        candidates = {label: self._category_name(label) for label in missing}
+        used_names: set[str] = set()
+        for batch in chunked(sorted(set(candidates.values())), batch_size):
+            used_names.update(
+                EventCategory.objects.filter(name__in=batch).values_list("name", flat=True)
             )
 
-            if not created and distance_km is not None and category.distance_km == Decimal("0"):
-                category.distance_km = distance_value
-                category.save(update_fields=["distance_km"])
+        to_create = []
+        for label in missing:
+            name = candidates[label]
+            suffix = 2
+            while name in used_names:
+                tail = f"-{suffix}"
+                name = f"{candidates[label][:100 - len(tail)]}{tail}"
+                suffix += 1
+            used_names.add(name)
 
-            cache[label] = category
-            categories.append(category)
+            distance_km = parse_distance_km(label)
+            to_create.append(
+                EventCategory(
+                    display_name=label,
+                    name=name,
+                    distance_km=quantize_distance(distance_km) if distance_km is not None else Decimal("0"),
+                )
+            )
 
+        with transaction.atomic():
+            EventCategory.objects.bulk_update(to_update, ["distance_km"], batch_size=batch_size)
+            EventCategory.objects.bulk_create(to_create, batch_size=batch_size)
+
+        categories.update((category.display_name, category) for category in to_create)
         return categories
+
+    @staticmethod
+    def _category_name(label: str) -> str:
+        name_slug = slugify(label)[:100]
+        if not name_slug:
+            name_slug = slugify(label.replace(":", "-"))[:100]
+        if not name_slug:
+            name_slug = f"distance-{abs(hash(label))}"
+        return name_slug[:100]
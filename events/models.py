@@ -1,6 +1,7 @@
 from django.db import models
 from django.urls import NoReverseMatch, reverse
-from django.utils.text import slugify
+
+from core.slugs import SlugAllocator, save_with_unique_slug
 
 
 class EventCategory(models.Model):
@@ -62,15 +63,14 @@ class Event(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Event.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            base_slug = self.slug_allocator().base_for(self.title)
+            return save_with_unique_slug(self, base_slug, super().save, *args, **kwargs)
         super().save(*args, **kwargs)
 
+    @classmethod
+    def slug_allocator(cls) -> SlugAllocator:
+        return SlugAllocator(cls, max_length=200, fallback="event")
+
     def get_absolute_url(self):
         try:
             return reverse("event_detail:detail", kwargs={"slug": self.slug})
@@ -94,3 +94,51 @@ class Event(models.Model):
             return (self.end_date - self.start_date).days + 1
         return None
 
+
+class ImportRun(models.Model):
+    """Ledger entry for one run of a bulk event import."""
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    source = models.CharField(max_length=255)
+    source_hash = models.CharField(max_length=64)
+    options_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING)
+    total_records = models.PositiveIntegerField(default=0)
+    batch_size = models.PositiveIntegerField(default=0)
+    batches_committed = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["source_hash", "status"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Import {self.source} ({self.status})"
+
+
+class ImportedRecord(models.Model):
+    """Content fingerprint of the last imported version of a source record."""
+
+    key = models.CharField(max_length=255, unique=True)
+    content_hash = models.CharField(max_length=64)
+    run = models.ForeignKey(
+        ImportRun,
+        on_delete=models.SET_NULL,
+        related_name="records",
+        null=True,
+        blank=True,
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.key
@@ -1,13 +1,32 @@
-from datetime import timedelta
+import csv
+import json
+import tempfile
+from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
+from pathlib import Path
 
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
 from django.urls import reverse
 from django.utils import timezone
 
 from events.forms import EventFilterForm
-from events.models import Event, EventCategory
+from events.management.commands.import_um_races import Command as ImportUmRacesCommand
+from events.models import Event, EventCategory, ImportedRecord, ImportRun
+from events.views import events_json, events_json_async
+from events.um_races import (
+    aggregate_rows,
+    merge_aggregates,
+    parse_csv_range,
+    parse_distance_km,
+    parse_event_dates,
+    plan_byte_ranges,
+)
 
 User = get_user_model()
 
@@ -438,6 +457,46 @@ class EventsJSONViewTests(TestCase):
         self.assertEqual(data['results'][0]['title'], "Jakarta Event")
 
 
+class EventsJSONAsyncViewTests(TestCase):
+    """Tests for the async twin of events_json."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        category = EventCategory.objects.create(
+            name="42k", distance_km=Decimal("42.00"), display_name="Full Marathon"
+        )
+        for i in range(12):
+            event = Event.objects.create(
+                title=f"Event {i}",
+                city="Jakarta" if i % 2 else "Bandung",
+                country="Indonesia",
+                start_date=self.today + timedelta(days=30 + i),
+                registration_deadline=self.today + timedelta(days=20 + i),
+            )
+            event.categories.add(category)
+
+    def _payloads(self, query):
+        url = reverse('events:json') + query
+        sync_response = events_json(RequestFactory().get(url))
+        async_response = async_to_sync(events_json_async)(AsyncRequestFactory().get(url))
+        return json.loads(sync_response.content), json.loads(async_response.content)
+
+    def test_async_payload_matches_sync(self):
+        """Test the async view returns the same catalog page as the sync view."""
+        for query in ('', '?page=2', '?city=Jakarta&sort_by=latest', '?page=99', '?page=abc'):
+            with self.subTest(query=query):
+                sync_payload, async_payload = self._payloads(query)
+                self.assertEqual(async_payload, sync_payload)
+
+    def test_async_view_filters_by_category(self):
+        """Test category choices loaded by the async form still validate the filter."""
+        category = EventCategory.objects.get(name="42k")
+        sync_payload, async_payload = self._payloads(f'?category={category.id}')
+
+        self.assertEqual(async_payload['pagination']['total'], 12)
+        self.assertEqual(async_payload, sync_payload)
+
+
 class EventModelEdgeCasesTests(TestCase):
     """Test edge cases for Event model."""
 
@@ -799,3 +858,298 @@ class EventFilterFormTests(TestCase):
         )
 
 
+UM_RACES_HEADER = [
+    "Year of event",
+    "Event dates",
+    "Event name",
+    "Event distance/length",
+    "Event number of finishers",
+]
+
+
+class ImportUmRacesCommandTests(TestCase):
+    """Tests for the import_um_races management command."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write_csv(self, rows, name="races.csv"):
+        path = Path(self.tmpdir.name) / name
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(UM_RACES_HEADER)
+            writer.writerows(rows)
+        return path
+
+    def _import(self, path, *args):
+        out = StringIO()
+        call_command("import_um_races", "--csv", str(path), *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_aggregates_rows_into_events(self):
+        """Test rows of the same event collapse into one event with categories."""
+        path = self._write_csv(
+            [
+                ["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "22"],
+                ["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "22"],
+                ["2018", "06.01.2018", "Selva Costera (CHI)", "100mi", "9"],
+                ["2018", "23.-25.03.2018", "Desert Cup (ESP)", "6h", "40"],
+            ]
+        )
+
+        output = self._import(path, "--batch-size", "1")
+
+        self.assertIn("Created 2 events.", output)
+        self.assertIn("rows/s", output)
+        event = Event.objects.get(title="Selva Costera 2018")
+        self.assertEqual(event.country, "Chile")
+        self.assertEqual(event.registered_count, 22)
+        self.assertEqual(
+            sorted(event.categories.values_list("display_name", flat=True)),
+            ["100mi", "50km"],
+        )
+        self.assertEqual(
+            EventCategory.objects.get(display_name="100mi").distance_km,
+            Decimal("160.93"),
+        )
+
+    def test_reimport_updates_existing_events_and_categories(self):
+        """Test a second run updates rows and replaces category links in bulk."""
+        path = self._write_csv([["2019", "01.02.2019", "Ridge Run (USA)", "50km", "10"]])
+        self._import(path)
+        original = Event.objects.get(title="Ridge Run 2019")
+
+        path = self._write_csv(
+            [["2019", "01.02.2019", "Ridge Run (USA)", "100km", "15"]],
+            name="races-v2.csv",
+        )
+        output = self._import(path)
+
+        self.assertIn("Created 0 events.", output)
+        self.assertIn("Updated 1 events.", output)
+        event = Event.objects.get(pk=original.pk)
+        self.assertEqual(event.slug, original.slug)
+        self.assertEqual(event.registered_count, 15)
+        self.assertEqual(list(event.categories.values_list("display_name", flat=True)), ["100km"])
+
+    def test_import_allocates_unique_slugs_in_bulk(self):
+        """Test bulk-created events receive unique slugs without save()."""
+        Event.objects.create(
+            title="Loop 2020",
+            city="Loop",
+            start_date=timezone.localdate(),
+            registration_deadline=timezone.localdate(),
+        )
+        path = self._write_csv(
+            [
+                ["2020", "01.05.2020", "Loop (USA)", "50km", "5"],
+                ["2021", "01.05.2021", "Loop (USA)", "50km", "5"],
+            ]
+        )
+
+        self._import(path)
+
+        slugs = set(Event.objects.values_list("slug", flat=True))
+        self.assertEqual(slugs, {"loop-2020", "loop-2021"})
+        self.assertEqual(Event.objects.count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        """Test dry runs only print the planned upserts."""
+        path = self._write_csv([["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "22"]])
+
+        output = self._import(path, "--dry-run")
+
+        self.assertIn("[DRY RUN] Would upsert event: Selva Costera 2018", output)
+        self.assertFalse(Event.objects.exists())
+
+    def test_parallel_parse_matches_serial(self):
+        """Test byte-range parsing merges to exactly the serial aggregates."""
+        rows = []
+        for index in range(60):
+            year = 2000 + index % 7
+            rows.append(
+                [
+                    str(year),
+                    f"0{index % 9 + 1}.05.{year}",
+                    f"Race {index % 11} (USA)",
+                    ["50km", "100mi", "6h"][index % 3],
+                    str(index),
+                ]
+            )
+        path = self._write_csv(rows)
+
+        for limit in (None, 4):
+            serial = {}
+            with open(path, newline="", encoding="utf-8") as handle:
+                serial_rows = aggregate_rows(csv.DictReader(handle), serial, limit=limit)
+
+            for parts in (1, 3, 50):
+                fieldnames, data_start, ranges = plan_byte_ranges(path, parts)
+                merged = {}
+                merged_rows = 0
+                for start, end in ranges:
+                    chunk_rows, partial, _ = parse_csv_range(path, start, end, fieldnames, data_start)
+                    merged_rows += chunk_rows
+                    merge_aggregates(merged, partial, limit=limit)
+
+                self.assertEqual(merged_rows, serial_rows)
+                self.assertEqual(list(merged), list(serial))
+                self.assertEqual(list(merged.values()), list(serial.values()))
+
+    def test_import_with_workers_matches_serial_import(self):
+        """Test --workers produces the same events as a serial import."""
+        rows = [
+            ["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "22"],
+            ["2019", "23.-25.03.2019", "Desert Cup (ESP)", "6h", "40"],
+            ["2018", "06.01.2018", "Selva Costera (CHI)", "100mi", "30"],
+        ]
+        path = self._write_csv(rows)
+
+        self._import(path, "--workers", "2")
+
+        event = Event.objects.get(title="Selva Costera 2018")
+        self.assertEqual(event.registered_count, 30)
+        self.assertEqual(event.categories.count(), 2)
+        self.assertTrue(Event.objects.filter(title="Desert Cup 2019").exists())
+
+    def test_rerun_skips_unchanged_events(self):
+        """Test a second run of the same file skips events with matching fingerprints."""
+        path = self._write_csv(
+            [
+                ["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "22"],
+                ["2019", "23.-25.03.2019", "Desert Cup (ESP)", "6h", "40"],
+            ]
+        )
+        self._import(path)
+        stamp = Event.objects.get(title="Desert Cup 2019").updated_at
+
+        output = self._import(path)
+
+        self.assertIn("Skipped 2 unchanged events.", output)
+        self.assertIn("Created 0 events.", output)
+        self.assertEqual(Event.objects.get(title="Desert Cup 2019").updated_at, stamp)
+        self.assertEqual(ImportedRecord.objects.count(), 2)
+        latest = ImportRun.objects.first()
+        self.assertEqual(latest.status, ImportRun.Status.COMPLETED)
+        self.assertEqual(latest.skipped_count, 2)
+
+        output = self._import(path, "--full")
+        self.assertIn("Updated 2 events.", output)
+
+    def test_skipped_events_status_follows_the_calendar(self):
+        """Test an unchanged record's status is re-derived when "today" moves on."""
+        path = self._write_csv([["2019", "23.-25.03.2019", "Desert Cup (ESP)", "6h", "40"]])
+        self._import(path)
+        today = date.today()
+        Event.objects.update(
+            start_date=today + timedelta(days=10), end_date=None, status=Event.Status.UPCOMING
+        )
+        imported_at = Event.objects.get().updated_at
+
+        class Later(date):
+            @classmethod
+            def today(cls):
+                return today + timedelta(days=30)
+
+        with patch("events.management.commands.import_um_races.date", Later):
+            output = self._import(path)
+
+        self.assertIn("Skipped 1 unchanged events.", output)
+        event = Event.objects.get(title="Desert Cup 2019")
+        self.assertEqual(event.status, Event.Status.COMPLETED)
+        self.assertEqual(event.start_date, today + timedelta(days=10))
+        # Cached event cards are versioned by updated_at.
+        self.assertGreater(event.updated_at, imported_at)
+
+    def test_deleted_event_is_recreated(self):
+        """Test an unchanged record is imported again when its event was deleted."""
+        path = self._write_csv([
+            ["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "22"],
+            ["2019", "23.-25.03.2019", "Desert Cup (ESP)", "6h", "40"],
+        ])
+        self._import(path)
+        Event.objects.filter(title="Desert Cup 2019").delete()
+
+        output = self._import(path)
+
+        self.assertIn("Created 1 events.", output)
+        self.assertIn("Skipped 1 unchanged events.", output)
+        self.assertTrue(Event.objects.filter(title="Desert Cup 2019").exists())
+
+    def test_changed_record_is_rewritten(self):
+        """Test only records whose content changed are written again."""
+        self._import(self._write_csv([
+            ["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "22"],
+            ["2019", "23.-25.03.2019", "Desert Cup (ESP)", "6h", "40"],
+        ]))
+
+        output = self._import(self._write_csv([
+            ["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "25"],
+            ["2019", "23.-25.03.2019", "Desert Cup (ESP)", "6h", "40"],
+        ], name="races-v2.csv"))
+
+        self.assertIn("Updated 1 events.", output)
+        self.assertIn("Skipped 1 unchanged events.", output)
+        self.assertEqual(Event.objects.get(title="Selva Costera 2018").registered_count, 25)
+
+    def test_resume_continues_after_last_committed_batch(self):
+        """Test --resume picks up an interrupted run at its checkpoint."""
+        path = self._write_csv([
+            ["2018", "06.01.2018", "Selva Costera (CHI)", "50km", "22"],
+            ["2019", "23.-25.03.2019", "Desert Cup (ESP)", "6h", "40"],
+            ["2020", "01.05.2020", "Loop (USA)", "100km", "5"],
+        ])
+        original_write = ImportUmRacesCommand._write_batch
+
+        def crash_on_second_batch(command, records, *args, **kwargs):
+            if kwargs["batch_index"] == 1:
+                raise RuntimeError("simulated crash")
+            return original_write(command, records, *args, **kwargs)
+
+        with patch.object(ImportUmRacesCommand, "_write_batch", crash_on_second_batch):
+            with self.assertRaises(RuntimeError):
+                self._import(path, "--batch-size", "1")
+
+        failed = ImportRun.objects.get()
+        self.assertEqual(failed.status, ImportRun.Status.FAILED)
+        self.assertEqual(failed.batches_committed, 1)
+        self.assertEqual(Event.objects.count(), 1)
+
+        output = self._import(path, "--batch-size", "1", "--resume")
+
+        self.assertIn(f"Resuming import run #{failed.pk} after batch 1/3.", output)
+        self.assertIn("Created 2 events.", output)
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, ImportRun.Status.COMPLETED)
+        self.assertEqual(failed.batches_committed, 3)
+        self.assertEqual(failed.created_count, 3)
+        self.assertEqual(Event.objects.count(), 3)
+
+    def test_parsers_are_memoized(self):
+        """Test repeated labels are served from the parser caches."""
+        parse_distance_km.cache_clear()
+        parse_event_dates.cache_clear()
+
+        for _ in range(3):
+            self.assertEqual(parse_distance_km("100mi"), Decimal("160.93"))
+            self.assertEqual(
+                parse_event_dates("28.12.-02.01.2019", fallback_year=2019),
+                (date(2018, 12, 28), date(2019, 1, 2)),
+            )
+
+        self.assertEqual(parse_distance_km.cache_info().misses, 1)
+        self.assertEqual(parse_distance_km.cache_info().hits, 2)
+        self.assertEqual(parse_event_dates.cache_info().misses, 1)
+
+    def test_parser_stats_flag_reports_hit_rates(self):
+        """Test --parser-stats prints hit rates per parser."""
+        path = self._write_csv(
+            [["2018", "06.01.2018", "Selva Costera (CHI)", "50km", str(index)] for index in range(4)]
+        )
+
+        output = self._import(path, "--parser-stats")
+
+        self.assertIn("Parser stats:", output)
+        self.assertRegex(output, r"parse_event_dates: 4 calls, \d+ distinct, \d+\.\d% hits")
+        self.assertIn("split_event_name:", output)
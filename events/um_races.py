@@ -0,0 +1,612 @@
+"""
+Pure-Python parsing and aggregation for the Two Centuries of UM Races dataset.
+
+Nothing here touches the ORM, so worker processes can import it without
+setting up Django.
+"""
+
+import csv
+import hashlib
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+# Bump when the fields written for a record change, so the next run
+# rewrites every event instead of skipping unchanged fingerprints.
+FINGERPRINT_VERSION = "1"
+
+
+@dataclass
+class EventRecord:
+    """Aggregated information for a single event coming from the CSV dataset."""
+
+    year: int
+    base_name: str
+    country_code: Optional[str]
+    country: str
+    original_name: str
+    date_label: str
+    original_start_date: date
+    original_end_date: Optional[date]
+    finishers: int = 0
+    distance_labels: set[str] = field(default_factory=set)
+    rows: int = 0
+    generated_start_date: Optional[date] = None
+    generated_end_date: Optional[date] = None
+    registration_open_date: Optional[date] = None
+    registration_close_date: Optional[date] = None
+
+    def add_distance(self, distance: Optional[str]) -> None:
+        if distance:
+            self.distance_labels.add(distance.strip())
+
+    def increase_finishers(self, value: Optional[int]) -> None:
+        if value is None:
+            return
+        self.finishers = max(self.finishers, value)
+
+    def fingerprint(self) -> str:
+        """
+        Hash of every source field that influences the imported event.
+
+        The generated schedule is left out on purpose: it is fixed when an
+        event is first written, and the importer re-derives ``status`` from
+        the stored dates for every skipped record.
+        """
+
+        parts = [
+            FINGERPRINT_VERSION,
+            str(self.year),
+            self.base_name,
+            self.country_code or "",
+            self.country,
+            self.original_name,
+            self.date_label,
+            self.original_start_date.isoformat(),
+            self.original_end_date.isoformat() if self.original_end_date else "",
+            str(self.finishers),
+            "\x1e".join(sorted(self.distance_labels)),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    @property
+    def title(self) -> str:
+        return f"{self.base_name} {self.year}"
+
+    @property
+    def city(self) -> str:
+        return self.base_name
+
+    @property
+    def venue(self) -> str:
+        return self.base_name
+
+    def build_description(self) -> str:
+        title_text = self.original_name
+
+        def _format_location() -> str:
+            parts = []
+            if self.base_name:
+                parts.append(self.base_name)
+            if self.country and self.country != "Unknown":
+                parts.append(self.country)
+            return ", ".join(parts) if parts else "this destination"
+
+        def _format_date_range() -> str:
+            if not self.generated_start_date:
+                return ""
+            start = self.generated_start_date
+            end = self.generated_end_date or self.generated_start_date
+            if start == end:
+                return start.strftime("%B %d, %Y")
+            if start.year == end.year and start.month == end.month:
+                return f"{start.strftime('%B %d')}-{end.strftime('%d, %Y')}"
+            return f"{start.strftime('%B %d, %Y')} - {end.strftime('%B %d, %Y')}"
+
+        def _highlight_distance() -> Optional[str]:
+            if not self.distance_labels:
+                return None
+            sortable: list[tuple[Decimal | int, str]] = []
+            for label in self.distance_labels:
+                distance_value = parse_distance_km(label)
+                if distance_value is not None:
+                    sortable.append((distance_value, label))
+                else:
+                    sortable.append((Decimal("0"), label))
+            sortable.sort(key=lambda item: (item[0], len(item[1]), item[1].lower()), reverse=True)
+            return sortable[0][1]
+
+        location_text = _format_location()
+        date_range_text = _format_date_range()
+        highlighted_distance = _highlight_distance()
+
+        if self.generated_start_date and self.generated_end_date and self.generated_end_date != self.generated_start_date:
+            adventure_label = f"{(self.generated_end_date - self.generated_start_date).days + 1}-day ultra adventure"
+        elif self.generated_start_date:
+            adventure_label = "single-day ultra challenge"
+        else:
+            adventure_label = "signature ultra challenge"
+
+        distance_phrase = (
+            f"a {highlighted_distance} journey"
+            if highlighted_distance
+            else "an unforgettable endurance journey"
+        )
+
+        lines: list[str] = []
+        lines.append(
+            f"Step into one of the most demanding yet rewarding endurance challenges -- {title_text}. "
+            f"Test your physical and mental limits across {location_text}, where every mile is a story of grit, determination, and discovery."
+        )
+
+        if date_range_text:
+            lines.append(
+                f"This {adventure_label} ({date_range_text}) offers {distance_phrase} designed for both elite ultrarunners and determined first-timers. "
+                f"With exceptional course support, scenic terrain, and a tight-knit endurance community, {self.base_name or 'this race'} delivers more than a run -- it's an experience that transforms."
+            )
+        else:
+            lines.append(
+                f"This {adventure_label} offers {distance_phrase} designed for both elite ultrarunners and determined first-timers. "
+                f"With exceptional course support, scenic terrain, and a tight-knit endurance community, {self.base_name or 'this race'} delivers more than a run -- it's an experience that transforms."
+            )
+
+        if self.finishers:
+            lines.append(
+                f"Join a legacy of finishers celebrated for their courage, camaraderie, and perseverance. "
+                f"Historical results showcase {self.finishers} athletes who have already conquered the course."
+            )
+        else:
+            lines.append(
+                "Join a legacy of finishers celebrated for their courage, camaraderie, and perseverance."
+            )
+
+        if self.registration_open_date:
+            open_text = self.registration_open_date.strftime("%B %d, %Y")
+            lines.append(
+                f"Registration opens {open_text}, giving you space to prepare, train, and plan your ultimate ultra-running adventure."
+            )
+        if self.registration_close_date:
+            close_text = self.registration_close_date.strftime("%B %d, %Y")
+            lines.append(f"Secure your spot before registration closes on {close_text}.")
+
+        lines.append(f"Ready to go beyond your limits? {location_text} awaits.")
+
+        return "\n\n".join(lines)
+
+
+COUNTRY_OVERRIDES = {
+    "ARG": "Argentina",
+    "AUS": "Australia",
+    "AUT": "Austria",
+    "BEL": "Belgium",
+    "BRA": "Brazil",
+    "CAN": "Canada",
+    "CHE": "Switzerland",
+    "CHI": "Chile",
+    "CHN": "China",
+    "CZE": "Czech Republic",
+    "DEU": "Germany",
+    "DNK": "Denmark",
+    "ESP": "Spain",
+    "EST": "Estonia",
+    "FIN": "Finland",
+    "FRA": "France",
+    "GBR": "United Kingdom",
+    "HUN": "Hungary",
+    "IRL": "Ireland",
+    "ITA": "Italy",
+    "JPN": "Japan",
+    "MEX": "Mexico",
+    "NED": "Netherlands",
+    "NOR": "Norway",
+    "NZL": "New Zealand",
+    "POL": "Poland",
+    "PRT": "Portugal",
+    "ROU": "Romania",
+    "SWE": "Sweden",
+    "USA": "United States",
+}
+
+
+# The dataset repeats a few thousand distinct labels across millions of
+# rows, so the pure parsers below are memoized with bounded LRU caches.
+PARSER_CACHE_SIZE = 16384
+
+MEMOIZED_PARSERS: dict[str, Callable] = {}
+_parser_seconds: Optional[defaultdict[str, float]] = None
+
+
+def memoized_parser(func: Callable) -> Callable:
+    cached = lru_cache(maxsize=PARSER_CACHE_SIZE)(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if _parser_seconds is None:
+            return cached(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return cached(*args, **kwargs)
+        finally:
+            _parser_seconds[func.__name__] += time.perf_counter() - started
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    MEMOIZED_PARSERS[func.__name__] = wrapper
+    return wrapper
+
+
+def enable_parser_timing(enabled: bool = True) -> None:
+    """Toggle per-parser wall-clock timing; off by default to keep calls cheap."""
+
+    global _parser_seconds
+    _parser_seconds = defaultdict(float) if enabled else None
+
+
+def parser_stats() -> dict[str, dict[str, float]]:
+    """Cumulative hits, misses and timed seconds for every memoized parser."""
+
+    stats = {}
+    for name, parser in MEMOIZED_PARSERS.items():
+        info = parser.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "seconds": _parser_seconds.get(name, 0.0) if _parser_seconds is not None else 0.0,
+        }
+    return stats
+
+
+def diff_parser_stats(after: dict, before: dict) -> dict[str, dict[str, float]]:
+    return {
+        name: {key: value - before.get(name, {}).get(key, 0) for key, value in values.items()}
+        for name, values in after.items()
+    }
+
+
+def add_parser_stats(total: dict, extra: dict) -> None:
+    for name, values in extra.items():
+        bucket = total.setdefault(name, {"hits": 0, "misses": 0, "seconds": 0.0})
+        for key, value in values.items():
+            bucket[key] += value
+
+
+def normalize_country(code: Optional[str]) -> str:
+    if not code:
+        return "Unknown"
+    normalized = code.strip().upper()
+    return COUNTRY_OVERRIDES.get(normalized, normalized)
+
+
+def parse_year(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    text = value.strip()
+    if not text:
+        return None
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+def parse_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    text = value.strip()
+    if not text:
+        return None
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+@memoized_parser
+def split_event_name(raw_name: str) -> Tuple[str, Optional[str]]:
+    name = raw_name.strip()
+    if name.endswith(")") and "(" in name:
+        prefix, _, suffix = name.rpartition("(")
+        country_candidate = suffix.rstrip(")")
+        country_candidate = country_candidate.strip()
+        if len(country_candidate) in {2, 3} and country_candidate.isalpha():
+            return prefix.strip(), country_candidate.upper()
+    return name, None
+
+
+DATE_LABEL_TRANSLATION = str.maketrans({"\u2013": "-", "\u2014": "-", " ": None, "/": "."})
+
+
+@memoized_parser
+def parse_event_dates(label: str, fallback_year: int) -> Tuple[Optional[date], Optional[date]]:
+    """
+    Parse event dates that are expressed in several shorthand formats:
+    - 06.01.2018
+    - 05.-06.01.2018
+    - 23.-25.03.2018
+    - 23.03.-08.04.2018
+    - 28.12.-02.01.2019
+    """
+
+    if not label:
+        return None, None
+
+    cleaned = label.strip().translate(DATE_LABEL_TRANSLATION)
+
+    parts = cleaned.split("-")
+    if len(parts) == 1:
+        single = _parse_date_fragment(parts[0], fallback_year=fallback_year)
+        return single, single
+
+    start_fragment = parts[0]
+    end_fragment = parts[-1]
+
+    end_date = _parse_date_fragment(end_fragment, fallback_year=fallback_year)
+    start_date = _parse_date_fragment(
+        start_fragment,
+        fallback_year=end_date.year if end_date else fallback_year,
+        inherit_month=end_date.month if end_date else None,
+    )
+
+    if start_date and end_date and start_date > end_date:
+        # Handle cases crossing the year boundary (e.g., 28.12.-02.01.2019).
+        adjusted_year = start_date.year - 1
+        try:
+            start_date = start_date.replace(year=adjusted_year)
+        except ValueError:
+            pass
+
+    if start_date and not end_date:
+        return start_date, start_date
+    if end_date and not start_date:
+        return end_date, end_date
+
+    return start_date, end_date
+
+
+def _parse_date_fragment(
+    fragment: str,
+    *,
+    fallback_year: int,
+    inherit_month: Optional[int] = None,
+) -> Optional[date]:
+    if not fragment:
+        return None
+
+    token = fragment.strip(".")
+    if not token:
+        return None
+
+    bits = [part for part in token.split(".") if part]
+
+    if len(bits) == 3:
+        day_txt, month_txt, year_txt = bits
+    elif len(bits) == 2:
+        day_txt, month_txt = bits
+        year_txt = str(fallback_year)
+    elif len(bits) == 1:
+        day_txt = bits[0]
+        month_txt = str(inherit_month if inherit_month else 1)
+        year_txt = str(fallback_year)
+    else:
+        return None
+
+    try:
+        day = int(day_txt)
+        month = int(month_txt)
+        year = int(year_txt)
+        return datetime(year, month, day).date()
+    except ValueError:
+        return None
+
+
+DISTANCE_RE = re.compile(r"(?P<value>\d+(?:\.\d+)?)(?P<unit>km|mi|h)$", re.IGNORECASE)
+KM_PER_MILE = Decimal("1.60934")
+
+
+@memoized_parser
+def parse_distance_km(label: str) -> Optional[Decimal]:
+    if not label:
+        return None
+    text = label.strip().lower()
+    match = DISTANCE_RE.match(text)
+    if not match:
+        if "h" in text:
+            return Decimal("0")
+        return None
+
+    value = Decimal(match.group("value"))
+    unit = match.group("unit").lower()
+
+    if unit == "km":
+        return value
+    if unit == "mi":
+        return (value * KM_PER_MILE).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    # Hour-based events get a nominal zero distance, but we still keep the label.
+    return Decimal("0")
+
+
+def quantize_distance(value: Decimal) -> Decimal:
+    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+EventKey = Tuple[int, str, str, date, Optional[date]]
+
+
+def extract_event_record(row: dict) -> Optional[EventRecord]:
+    year = parse_year(row.get("Year of event"))
+    raw_name = (row.get("Event name") or "").strip()
+    date_label = (row.get("Event dates") or "").strip()
+
+    if not year or not raw_name or not date_label:
+        return None
+
+    base_name, country_code = split_event_name(raw_name)
+    country = normalize_country(country_code)
+
+    original_start, original_end = parse_event_dates(date_label, fallback_year=year)
+    if original_start is None:
+        return None
+
+    finishers = parse_int(row.get("Event number of finishers")) or 0
+
+    return EventRecord(
+        year=year,
+        base_name=base_name,
+        country_code=country_code,
+        country=country,
+        original_name=raw_name,
+        date_label=date_label,
+        original_start_date=original_start,
+        original_end_date=original_end,
+        finishers=finishers,
+    )
+
+
+def record_key(record: EventRecord) -> EventKey:
+    return (
+        record.year,
+        record.base_name.lower(),
+        record.country_code or "",
+        record.original_start_date,
+        record.original_end_date,
+    )
+
+
+def aggregate_rows(
+    rows: Iterable[dict],
+    aggregated: dict[EventKey, EventRecord],
+    *,
+    limit: Optional[int] = None,
+) -> int:
+    """Fold CSV rows into ``aggregated`` one at a time and return the rows read."""
+
+    rows_read = 0
+    for row in rows:
+        rows_read += 1
+        record = extract_event_record(row)
+        if record is None:
+            continue
+
+        key = record_key(record)
+        existing = aggregated.get(key)
+        if existing is None:
+            if limit and len(aggregated) >= limit:
+                continue
+            aggregated[key] = record
+            existing = record
+        else:
+            existing.increase_finishers(record.finishers)
+
+        existing.add_distance(row.get("Event distance/length"))
+        existing.rows += 1
+    return rows_read
+
+
+def chunked(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def merge_aggregates(
+    aggregated: dict[EventKey, EventRecord],
+    partial: dict[EventKey, EventRecord],
+    *,
+    limit: Optional[int] = None,
+) -> None:
+    """
+    Merge a chunk's pre-aggregated records into ``aggregated``.
+
+    Chunks must be merged in file order; the result then matches folding
+    the same rows serially with ``aggregate_rows``.
+    """
+
+    for key, record in partial.items():
+        existing = aggregated.get(key)
+        if existing is None:
+            if limit and len(aggregated) >= limit:
+                continue
+            aggregated[key] = record
+            continue
+        existing.increase_finishers(record.finishers)
+        existing.distance_labels.update(record.distance_labels)
+        existing.rows += record.rows
+
+
+def file_sha256(path, *, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_csv_header(path) -> Tuple[list[str], int]:
+    """Return the CSV column names and the byte offset where data rows start."""
+
+    with open(path, "rb") as handle:
+        header_line = handle.readline()
+        data_start = handle.tell()
+    fieldnames = next(csv.reader([header_line.decode("utf-8")]))
+    return fieldnames, data_start
+
+
+def plan_byte_ranges(path, parts: int) -> Tuple[list[str], int, list[Tuple[int, int]]]:
+    """Split the data section of a CSV file into at most ``parts`` byte ranges."""
+
+    fieldnames, data_start = read_csv_header(path)
+    with open(path, "rb") as handle:
+        handle.seek(0, 2)
+        size = handle.tell()
+    span = size - data_start
+    if span <= 0:
+        return fieldnames, data_start, []
+    step = -(-span // max(parts, 1))
+    ranges = [(start, min(start + step, size)) for start in range(data_start, size, step)]
+    return fieldnames, data_start, ranges
+
+
+def _iter_range_lines(handle, start: int, end: int, data_start: int) -> Iterator[str]:
+    if start > data_start:
+        # Lines belong to the range their first byte falls in, so skip the
+        # tail of a line that started in the previous range.
+        handle.seek(start - 1)
+        position = start - 1 + len(handle.readline())
+    else:
+        handle.seek(start)
+        position = start
+    while position < end:
+        line = handle.readline()
+        if not line:
+            break
+        position += len(line)
+        yield line.decode("utf-8")
+
+
+def parse_csv_range(
+    path,
+    start: int,
+    end: int,
+    fieldnames: list[str],
+    data_start: int,
+    time_parsers: bool = False,
+) -> Tuple[int, dict[EventKey, EventRecord], dict[str, dict[str, float]]]:
+    """
+    Parse and pre-aggregate the rows starting inside ``[start, end)``.
+
+    Runs in worker processes and also returns the parser stats accrued by
+    this range. Quoted fields spanning several lines are not supported,
+    which holds for the UM races dataset.
+    """
+
+    enable_parser_timing(time_parsers)
+    before = parser_stats()
+    partial: dict[EventKey, EventRecord] = {}
+    with open(path, "rb") as handle:
+        lines = _iter_range_lines(handle, start, end, data_start)
+        rows_read = aggregate_rows(csv.DictReader(lines, fieldnames=fieldnames), partial)
+    return rows_read, partial, diff_parser_stats(parser_stats(), before)
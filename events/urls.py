@@ -1,10 +1,11 @@
+from django.conf import settings
 from django.urls import path
 
-from .views import EventListView, events_json
+from .views import EventListView, events_json, events_json_async
 
 app_name = "events"
 
 urlpatterns = [
     path("", EventListView.as_view(), name="list"),
-    path("api/", events_json, name="json"),
+    path("api/", events_json_async if settings.ASYNC_API_VIEWS else events_json, name="json"),
 ]
@@ -1,3 +1,6 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.paginator import Paginator
 from django.db import models
@@ -6,6 +9,10 @@ from django.utils import timezone
 from django.views.decorators.http import require_GET
 from django.views.generic import ListView
 
+from core.async_utils import apaginate
+from core.cache import aget_or_compute, aversioned_key, get_or_compute, versioned_key
+from core.db_routing import use_read_replica
+
 from .forms import EventFilterForm
 from .models import Event
 
@@ -40,56 +47,113 @@ class EventListView(LoginRequiredMixin, ListView):
 
 
 @require_GET
+@use_read_replica
 def events_json(request):
+    # Catalog pages are the hottest anonymous API; one caller rebuilds an
+    # expired page while concurrent requests wait for it. Event writes bump
+    # the "catalog" namespace (see core.page_cache.invalidate_event_pages).
+    return JsonResponse(catalog_page(request.GET))
+
+
+@require_GET
+@use_read_replica
+async def events_json_async(request):
+    """Async twin of ``events_json`` served when ``ASYNC_API_VIEWS`` is on."""
+
+    key = await aversioned_key(
+        "catalog",
+        "events-json",
+        timezone.localdate().isoformat(),
+        _params_key(request.GET),
+    )
+    payload = await aget_or_compute(
+        key,
+        lambda: _aevents_payload(request.GET),
+        getattr(settings, "CATALOG_CACHE_TTL", 60),
+    )
+    return JsonResponse(payload)
+
+
+def catalog_page(params):
+    """The cached ``events:json`` payload for ``params`` (shared with the mobile bootstrap)."""
+
+    key = versioned_key(
+        "catalog",
+        "events-json",
+        timezone.localdate().isoformat(),
+        _params_key(params),
+    )
+    return get_or_compute(
+        key,
+        lambda: _events_payload(params),
+        getattr(settings, "CATALOG_CACHE_TTL", 60),
+    )
+
+
+def _params_key(params):
+    return urlencode(sorted(params.lists()), doseq=True)
+
+
+def _events_payload(params):
     queryset = Event.objects.prefetch_related("categories").order_by("start_date")
-    form = EventFilterForm(request.GET or None)
+    form = EventFilterForm(params or None)
     queryset = form.filter_queryset(queryset)
 
     paginator = Paginator(queryset, 9)
-    page_number = request.GET.get("page") or 1
+    page_number = params.get("page") or 1
     page_obj = paginator.get_page(page_number)
+    return _catalog_page_payload(paginator, page_obj)
+
+
+async def _aevents_payload(params):
+    queryset = Event.objects.prefetch_related("categories").order_by("start_date")
+    form = await EventFilterForm.abuild(params or None)
+    queryset = form.filter_queryset(queryset)
 
-    events_payload = []
-    for event in page_obj.object_list:
-        events_payload.append(
+    paginator, page_obj = await apaginate(queryset, 9, params.get("page") or 1)
+    return _catalog_page_payload(paginator, page_obj)
+
+
+def _catalog_page_payload(paginator, page_obj):
+    return {
+        "results": [serialize_event(event) for event in page_obj.object_list],
+        "pagination": {
+            "page": page_obj.number,
+            "pages": paginator.num_pages,
+            "has_next": page_obj.has_next(),
+            "has_previous": page_obj.has_previous(),
+            "total": paginator.count,
+        },
+    }
+
+
+def serialize_event(event):
+    """Catalog card payload; expects ``categories`` to be prefetched."""
+
+    return {
+        "id": event.id,
+        "title": event.title,
+        "slug": event.slug,
+        "url": event.get_absolute_url(),
+        "city": event.city,
+        "country": event.country,
+        "venue": event.venue,
+        "start_date": event.start_date.isoformat(),
+        "end_date": event.end_date.isoformat() if event.end_date else None,
+        "status": event.status,
+        "status_display": event.get_status_display(),
+        "registration_deadline": event.registration_deadline.isoformat(),
+        "is_registration_open": event.is_registration_open,
+        "popularity_score": event.popularity_score,
+        "banner_image": event.banner_image,
+        "participant_limit": event.participant_limit,
+        "registered_count": event.registered_count,
+        "categories": [
             {
-                "id": event.id,
-                "title": event.title,
-                "slug": event.slug,
-                "url": event.get_absolute_url(),
-                "city": event.city,
-                "country": event.country,
-                "venue": event.venue,
-                "start_date": event.start_date.isoformat(),
-                "end_date": event.end_date.isoformat() if event.end_date else None,
-                "status": event.status,
-                "status_display": event.get_status_display(),
-                "registration_deadline": event.registration_deadline.isoformat(),
-                "is_registration_open": event.is_registration_open,
-                "popularity_score": event.popularity_score,
-                "banner_image": event.banner_image,
-                "participant_limit": event.participant_limit,
-                "registered_count": event.registered_count,
-                "categories": [
-                    {
-                        "id": category.id,
-                        "display_name": category.display_name,
-                        "distance_km": float(category.distance_km),
-                    }
-                    for category in event.categories.all()
-                ],
+                "id": category.id,
+                "display_name": category.display_name,
+                "distance_km": float(category.distance_km),
             }
-        )
-
-    return JsonResponse(
-        {
-            "results": events_payload,
-            "pagination": {
-                "page": page_obj.number,
-                "pages": paginator.num_pages,
-                "has_next": page_obj.has_next(),
-                "has_previous": page_obj.has_previous(),
-                "total": paginator.count,
-            },
-        }
-    )
+            for category in event.categories.all()
+        ],
+    }
@@ -1,8 +1,8 @@
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
-from django.utils.text import slugify
 
+from core.slugs import SlugAllocator, save_with_unique_slug
 from events.models import Event
 
 
@@ -35,17 +35,14 @@ class ForumThread(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.title)[:130]
-            slug = base_slug or "thread"
-            counter = 1
-            while ForumThread.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-        else:
-            slug = self.slug
-        self.slug = slug
+            base_slug = self.slug_allocator().base_for(self.title)
+            return save_with_unique_slug(self, base_slug, super().save, *args, **kwargs)
         super().save(*args, **kwargs)
 
+    @classmethod
+    def slug_allocator(cls) -> SlugAllocator:
+        return SlugAllocator(cls, max_length=130, fallback="thread")
+
     def touch(self):
         self.last_activity_at = timezone.now()
         self.save(update_fields=["last_activity_at"])
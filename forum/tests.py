@@ -1,14 +1,16 @@
 from datetime import timedelta
 from decimal import Decimal
 
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
 from django.urls import reverse
 from django.utils import timezone
 
 from events.models import Event, EventCategory
 from forum.forms import PostForm, ThreadForm
 from forum.models import ForumPost, ForumThread, PostReport
+from forum.views import threads_json, threads_json_async
 
 User = get_user_model()
 
@@ -1048,3 +1050,33 @@ class ThreadFormTests(TestCase):
         })
         
         self.assertTrue(form.is_valid())
+
+
+class ThreadsJSONAsyncViewTests(TestCase):
+    """Tests for the async twin of threads_json."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='asyncposter', password='testpass123')
+        self.today = timezone.localdate()
+        self.event = Event.objects.create(
+            title="Test Marathon",
+            city="Jakarta",
+            country="Indonesia",
+            start_date=self.today + timedelta(days=30),
+            registration_deadline=self.today + timedelta(days=20),
+        )
+        for i in range(3):
+            thread = ForumThread.objects.create(
+                event=self.event, author=self.user, title=f"Pacing plan {i}", body="Negative splits?"
+            )
+            for _ in range(i):
+                ForumPost.objects.create(thread=thread, author=self.user, content="Reply")
+
+    def test_async_payload_matches_sync(self):
+        """Test the async view returns the same threads, counts and order as the sync view."""
+        for query in ('', '?sort=popular', f'?event={self.event.id}&q=plan%202'):
+            with self.subTest(query=query):
+                url = reverse('forum:threads-json') + query
+                sync_response = threads_json(RequestFactory().get(url))
+                async_response = async_to_sync(threads_json_async)(AsyncRequestFactory().get(url))
+                self.assertJSONEqual(async_response.content, sync_response.content.decode())
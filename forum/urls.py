@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import (
@@ -7,6 +8,7 @@ from .views import (
     create_post,
     report_post,
     threads_json,
+    threads_json_async,
     toggle_like,
     api_thread_posts,
     create_thread_json,
@@ -26,7 +28,7 @@ urlpatterns = [
     path("threads/<slug:slug>/posts/", create_post, name="post-create"),
     path("posts/<int:post_id>/like/", toggle_like, name="post-like"),
     path("posts/<int:post_id>/report/", report_post, name="post-report"),
-    path("api/threads/", threads_json, name="threads-json"),
+    path("api/threads/", threads_json_async if settings.ASYNC_API_VIEWS else threads_json, name="threads-json"),
     path("api/threads/create/", create_thread_json, name="api-thread-create"),
     path("api/threads/<slug:slug>/", api_thread_detail, name="api-thread-detail"),
     path("api/threads/<slug:slug>/posts/", api_thread_posts, name="api-thread-posts"),
@@ -8,10 +8,11 @@ from django.utils import timezone
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import DetailView, ListView, CreateView
 from django.template.loader import render_to_string
-from django.db.models import Count, Q, F
+from django.db.models import Count, Exists, OuterRef, Q, F
 from django.views.decorators.csrf import csrf_exempt
 import json
 
+from core.db_routing import use_read_replica
 from events.models import Event
 from .forms import PostForm, ThreadForm
 from .models import ForumPost, ForumThread, PostReport
@@ -114,14 +115,29 @@ class ThreadDetailView(LoginRequiredMixin, DetailView):
 
 
 @require_GET
+@use_read_replica
 def threads_json(request):
+    threads_payload = [_serialize_thread(thread) for thread in _threads_queryset(request.GET)[:50]]
+    return JsonResponse({"results": threads_payload})
+
+
+@require_GET
+@use_read_replica
+async def threads_json_async(request):
+    threads_payload = [
+        _serialize_thread(thread) async for thread in _threads_queryset(request.GET)[:50]
+    ]
+    return JsonResponse({"results": threads_payload})
+
+
+def _threads_queryset(params):
     queryset = (
         ForumThread.objects.select_related("event", "author")
         .annotate(post_count=Count("posts", distinct=True))
     )
-    event_filter = request.GET.get("event")
-    search_term = request.GET.get("q", "")
-    sort = request.GET.get("sort", "recent")
+    event_filter = params.get("event")
+    search_term = params.get("q", "")
+    sort = params.get("sort", "recent")
 
     if event_filter:
         queryset = queryset.filter(event_id=event_filter)
@@ -134,36 +150,48 @@ def threads_json(request):
         queryset = queryset.order_by("-is_pinned", "-created_at")
     else:
         queryset = queryset.order_by("-is_pinned", "-last_activity_at")
+    return queryset
 
-    threads_payload = [
-        {
-            "id": thread.id,
-            "event": thread.event.id,
-            "author": thread.author.id,
-            "author_username": thread.author.username,
-            "title": thread.title,
-            "slug": thread.slug,
-            "body": thread.body,
-            "created_at": thread.created_at.isoformat(),
-            "updated_at": thread.updated_at.isoformat(),
-            "url": reverse("forum:thread-detail", kwargs={"slug": thread.slug}),
-            "event": thread.event.id,
-            "event_title": thread.event.title,
-            "author": thread.author.username,
-            "last_activity_at": thread.last_activity_at.isoformat(),
-            "is_pinned": thread.is_pinned,
-            "is_locked": thread.is_locked,
-            "view_count": thread.view_count,
-            "post_count": thread.post_count,
-        }
-        for thread in queryset[:50]
-    ]
-    return JsonResponse({"results": threads_payload})
+
+def _serialize_thread(thread):
+    return {
+        "id": thread.id,
+        "event": thread.event.id,
+        "author": thread.author.id,
+        "author_username": thread.author.username,
+        "title": thread.title,
+        "slug": thread.slug,
+        "body": thread.body,
+        "created_at": thread.created_at.isoformat(),
+        "updated_at": thread.updated_at.isoformat(),
+        "url": reverse("forum:thread-detail", kwargs={"slug": thread.slug}),
+        "event": thread.event.id,
+        "event_title": thread.event.title,
+        "author": thread.author.username,
+        "last_activity_at": thread.last_activity_at.isoformat(),
+        "is_pinned": thread.is_pinned,
+        "is_locked": thread.is_locked,
+        "view_count": thread.view_count,
+        "post_count": thread.post_count,
+    }
 
 @require_GET
+@use_read_replica
 def api_thread_posts(request, slug):
     thread = get_object_or_404(ForumThread, slug=slug)
-    posts = thread.posts.select_related("author").order_by("created_at")
+    posts = (
+        thread.posts.select_related("author")
+        .annotate(likes_total=Count("likes", distinct=True))
+        .order_by("created_at")
+    )
+    if request.user.is_authenticated:
+        posts = posts.annotate(
+            liked_by_user=Exists(
+                ForumPost.likes.through.objects.filter(
+                    forumpost_id=OuterRef("pk"), user_id=request.user.pk
+                )
+            )
+        )
     
     # Pagination sederhana jika perlu
     from django.core.paginator import Paginator
@@ -181,8 +209,8 @@ def api_thread_posts(request, slug):
             "content": post.content,
             "created_at": post.created_at.isoformat(),
             "updated_at": post.updated_at.isoformat(),
-            "likes_count": post.likes.count(),
-            "is_liked_by_user": request.user in post.likes.all() if request.user.is_authenticated else False
+            "likes_count": post.likes_total,
+            "is_liked_by_user": getattr(post, "liked_by_user", False),
         }
         for post in page_obj
     ]
@@ -1,7 +1,10 @@
-from django.test import TestCase, Client
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 from .models import Notification  # Pastikan path import model Notification benar
+from .views import notifications_json, notifications_json_async
 import json
 
 class NotificationViewTests(TestCase):
@@ -207,3 +210,39 @@ class NotificationViewTests(TestCase):
         # Seharusnya 404 karena get_object_or_404 tidak akan menemukannya untuk user1
         self.assertEqual(response.status_code, 404) 
 
+
+class NotificationsJSONAsyncViewTests(TestCase):
+    """Tests for the async twin of notifications_json."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='asyncreader', password='password123')
+        Notification.objects.create(recipient=self.user, title='Unread', message='Message 1')
+        Notification.objects.create(recipient=self.user, title='Read', message='Message 2', is_read=True)
+        other = User.objects.create_user(username='someoneelse', password='password123')
+        Notification.objects.create(recipient=other, title='Not mine', message='Message 3')
+
+    def _async_request(self, url, user):
+        async def auser():
+            return user
+
+        request = AsyncRequestFactory().get(url)
+        request.user = user
+        request.auser = auser
+        return request
+
+    def test_async_payload_matches_sync(self):
+        """Test the async inbox returns the same notifications and unread count as the sync view."""
+        for query in ('', '?unread=true'):
+            with self.subTest(query=query):
+                url = reverse('notifications:inbox-json') + query
+                sync_request = RequestFactory().get(url)
+                sync_request.user = self.user
+                sync_response = notifications_json(sync_request)
+                async_response = async_to_sync(notifications_json_async)(self._async_request(url, self.user))
+                self.assertJSONEqual(async_response.content, sync_response.content.decode())
+
+    def test_async_view_requires_login(self):
+        """Test anonymous callers are redirected to login by the async view."""
+        url = reverse('notifications:inbox-json')
+        response = async_to_sync(notifications_json_async)(self._async_request(url, AnonymousUser()))
+        self.assertEqual(response.status_code, 302)
@@ -1,12 +1,13 @@
+from django.conf import settings
 from django.urls import path
 
-from .views import NotificationListView, mark_notification_read, mark_all_notifications_read, notifications_json
+from .views import NotificationListView, mark_notification_read, mark_all_notifications_read, notifications_json, notifications_json_async
 
 app_name = "notifications"
 
 urlpatterns = [
     path("", NotificationListView.as_view(), name="inbox"),
-    path("api/", notifications_json, name="inbox-json"),
+    path("api/", notifications_json_async if settings.ASYNC_API_VIEWS else notifications_json, name="inbox-json"),
     path('api/<int:notif_id>/read/', mark_notification_read, name='mark-read'),
     path('api/mark-all-read/', mark_all_notifications_read, name='mark-all-read'),
 ]
@@ -3,7 +3,7 @@ from django.urls import reverse
 from .models import Notification
 
 
-def send_notification(
+def build_notification(
     *,
     recipient,
     title: str,
@@ -13,7 +13,7 @@ def send_notification(
     url_kwargs: dict | None = None,
     link_url: str | None = None,
 ) -> Notification:
-    """Create a notification entry for the given recipient."""
+    """Return an unsaved notification for the given recipient."""
 
     if url_name and not link_url:
         try:
@@ -21,10 +21,24 @@ def send_notification(
         except Exception:
             link_url = None
 
-    return Notification.objects.create(
+    return Notification(
         recipient=recipient,
         title=title,
         message=message,
         category=category,
         link_url=link_url or "",
     )
+
+
+def send_notification(**kwargs) -> Notification:
+    """Create a notification entry for the given recipient."""
+
+    notification = build_notification(**kwargs)
+    notification.save()
+    return notification
+
+
+def send_notifications(notifications, *, batch_size: int = 500) -> list[Notification]:
+    """Insert many ``build_notification`` results in batched INSERTs."""
+
+    return Notification.objects.bulk_create(notifications, batch_size=batch_size)
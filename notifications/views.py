@@ -28,33 +28,46 @@ class NotificationListView(LoginRequiredMixin, ListView):
 
 @login_required
 def notifications_json(request):
-    notifications = Notification.objects.filter(recipient=request.user)
-    
-    # LOGIKA BARU: Tangkap parameter 'unread' dari Flutter
-    unread_only = request.GET.get('unread') == 'true'
-    if unread_only:
-        notifications = notifications.filter(is_read=False)
-    
-    notifications = notifications.order_by('-created_at')
-    
-    results = []
-    for notif in notifications:
-        results.append({
-            "id": notif.id,
-            "title": notif.title,
-            "message": notif.message,
-            "category": notif.category,
-            "is_read": notif.is_read,
-            "link_url": notif.link_url,
-            "created_at": notif.created_at.isoformat(),
-        })
-        
+    notifications = _inbox_queryset(request.user, request.GET)
     return JsonResponse({
-        "results": results,
+        "results": [serialize_notification(notif) for notif in notifications],
         "unread": Notification.objects.filter(recipient=request.user, is_read=False).count()
     })
 
 
+@login_required
+async def notifications_json_async(request):
+    user = await request.auser()
+    notifications = _inbox_queryset(user, request.GET)
+    return JsonResponse({
+        "results": [serialize_notification(notif) async for notif in notifications],
+        "unread": await Notification.objects.filter(recipient=user, is_read=False).acount()
+    })
+
+
+def _inbox_queryset(user, params):
+    notifications = Notification.objects.filter(recipient=user)
+
+    # LOGIKA BARU: Tangkap parameter 'unread' dari Flutter
+    unread_only = params.get('unread') == 'true'
+    if unread_only:
+        notifications = notifications.filter(is_read=False)
+
+    return notifications.order_by('-created_at')
+
+
+def serialize_notification(notif):
+    return {
+        "id": notif.id,
+        "title": notif.title,
+        "message": notif.message,
+        "category": notif.category,
+        "is_read": notif.is_read,
+        "link_url": notif.link_url,
+        "created_at": notif.created_at.isoformat(),
+    }
+
+
 @csrf_exempt
 @login_required
 def mark_notification_read(request, notif_id):
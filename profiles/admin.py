@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import RunnerAchievement, UserProfile, UserRaceHistory
+from .models import BibRange, RunnerAchievement, UserProfile, UserRaceHistory
 
 
 class RunnerAchievementInline(admin.TabularInline):
@@ -23,11 +23,18 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 @admin.register(UserRaceHistory)
 class UserRaceHistoryAdmin(admin.ModelAdmin):
-    list_display = ("profile", "event", "status", "registration_date", "finish_time")
+    list_display = ("profile", "event", "status", "bib_number", "registration_date", "finish_time")
     list_filter = ("status", "event")
     search_fields = ("profile__user__username", "event__title", "category", "bib_number")
 
 
+@admin.register(BibRange)
+class BibRangeAdmin(admin.ModelAdmin):
+    list_display = ("event", "category", "start", "end", "next_number")
+    list_filter = ("event",)
+    search_fields = ("event__title", "category")
+
+
 @admin.register(RunnerAchievement)
 class RunnerAchievementAdmin(admin.ModelAdmin):
     list_display = ("profile", "title", "achieved_on")
@@ -0,0 +1,126 @@
+"""
+BIB number allocation.
+
+Every event numbers its start list from ``BibRange`` blocks: each category
+gets its own block of ``BIB_RANGE_SIZE`` numbers (the first category to
+need one gets 1-1000, the next 1001-2000 and so on), and a category that
+outgrows its block is given another after the event's last range.
+
+``BibAllocator`` locks the events it numbers, hands out numbers from the
+ranges in memory and writes the advanced ranges back in one
+``bulk_update``/``bulk_create``, so numbering a whole start list costs the
+same handful of queries as numbering one runner. Numbers already worn by a
+runner (handed out before ranges existed, or typed in by an organizer) are
+loaded once per event and skipped one by one wherever they fall. The
+``unique_bib_number_per_event`` constraint backs it up.
+"""
+
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from events.models import Event
+
+from .models import BibRange, UserRaceHistory
+
+
+class BibAllocator:
+    """
+    Reserve BIB numbers for one or more events.
+
+    Must be used inside ``transaction.atomic()``: the event rows are locked
+    for the lifetime of the transaction, so concurrent allocators for the
+    same event queue instead of handing out the same numbers. Call
+    ``save()`` once all numbers are reserved.
+    """
+
+    def __init__(self, event_ids, *, block_size: int | None = None):
+        self.block_size = block_size or settings.BIB_RANGE_SIZE
+        event_ids = sorted(set(event_ids))
+        list(Event.objects.select_for_update().filter(pk__in=event_ids).values_list("pk", flat=True))
+        self._ranges = defaultdict(list)
+        for bib_range in BibRange.objects.filter(event_id__in=event_ids).order_by("start"):
+            self._ranges[bib_range.event_id].append(bib_range)
+        self._changed = {}
+        self._created = []
+        self._taken_numbers = {}
+
+    def reserve(self, event_id: int, category: str, count: int) -> list[int]:
+        """The next ``count`` free numbers of ``category`` in ``event_id``, in order."""
+
+        taken = self._taken(event_id)
+        numbers = []
+        for bib_range in self._ranges[event_id]:
+            if len(numbers) == count:
+                break
+            if bib_range.category == category and bib_range.remaining:
+                numbers.extend(self._take(bib_range, count - len(numbers), taken))
+        while len(numbers) < count:
+            bib_range = self._open_range(event_id, category, count - len(numbers))
+            numbers.extend(self._take(bib_range, count - len(numbers), taken))
+        return numbers
+
+    def save(self) -> None:
+        BibRange.objects.bulk_update(self._changed.values(), ["next_number"])
+        BibRange.objects.bulk_create(self._created)
+        self._changed, self._created = {}, []
+
+    def _take(self, bib_range: BibRange, count: int, taken: set[int]) -> list[int]:
+        numbers = []
+        number = bib_range.next_number
+        while len(numbers) < count and number <= bib_range.end:
+            if number not in taken:
+                numbers.append(number)
+            number += 1
+        bib_range.next_number = number
+        if bib_range.pk:
+            self._changed[bib_range.pk] = bib_range
+        return numbers
+
+    def _open_range(self, event_id: int, category: str, needed: int) -> BibRange:
+        ranges = self._ranges[event_id]
+        start = max((bib_range.end for bib_range in ranges), default=0) + 1
+        end = start + math.ceil(needed / self.block_size) * self.block_size - 1
+        bib_range = BibRange(event_id=event_id, category=category, start=start, end=end, next_number=start)
+        ranges.append(bib_range)
+        self._created.append(bib_range)
+        return bib_range
+
+    def _taken(self, event_id: int) -> set[int]:
+        if event_id not in self._taken_numbers:
+            self._taken_numbers[event_id] = {
+                int(bib)
+                for bib in UserRaceHistory.objects.filter(event_id=event_id)
+                .exclude(bib_number="")
+                .values_list("bib_number", flat=True)
+                if bib.isdigit()
+            }
+        return self._taken_numbers[event_id]
+
+
+def assign_bib_numbers(histories) -> list[UserRaceHistory]:
+    """
+    Give every history row without a BIB the next number of its event and
+    category, earliest registration first. Returns the numbered rows;
+    callers save them (``bulk_update`` for many).
+    """
+
+    pending = defaultdict(list)
+    for history in histories:
+        if not history.bib_number:
+            pending[(history.event_id, history.category)].append(history)
+    if not pending:
+        return []
+
+    assigned = []
+    with transaction.atomic():
+        allocator = BibAllocator(event_id for event_id, _ in pending)
+        for (event_id, category), rows in sorted(pending.items()):
+            rows.sort(key=lambda row: (row.registration_date, row.pk or 0))
+            for history, number in zip(rows, allocator.reserve(event_id, category, len(rows))):
+                history.bib_number = str(number)
+            assigned.extend(rows)
+        allocator.save()
+    return assigned
@@ -0,0 +1,97 @@
+"""
+Mobile app bootstrap payload.
+
+On launch the app needs the runner's profile summary, their active
+registrations, the notification badge with the latest notifications and
+the first catalog page. ``profiles:api-bootstrap`` returns all four in one
+response, so a cold start costs one request (one session and user load)
+instead of four.
+
+Each section reuses what its standalone endpoint already shares: the
+profile comes from ``request.profile``, the history counts from the cached
+dashboard summary (``profiles.summary``) and the catalog page from the
+``events:json`` cache. ``fields=`` (comma separated or repeated) limits the
+response to the sections the client asks for; the others are not built.
+"""
+
+from django.db.models import Count, Q
+from django.http import QueryDict
+
+from events.views import catalog_page
+from notifications.models import Notification
+from notifications.views import serialize_notification
+from registrations.models import EventRegistration
+from registrations.views import serialize_registration
+
+from .summary import get_profile_summary
+
+SECTIONS = ("profile", "registrations", "notifications", "events")
+NOTIFICATION_LIMIT = 10
+MAX_NOTIFICATION_LIMIT = 50
+
+
+def parse_sections(params) -> tuple[str, ...]:
+    """Sections named by ``fields=`` (all of them when absent); raises ``ValueError`` on unknown names."""
+
+    requested = [name.strip() for value in params.getlist("fields") for name in value.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(SECTIONS))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Expected any of: {', '.join(SECTIONS)}.")
+    return tuple(name for name in SECTIONS if name in requested) if requested else SECTIONS
+
+
+def build_bootstrap(request, sections=SECTIONS, *, notification_limit=NOTIFICATION_LIMIT) -> dict:
+    builders = {
+        "profile": lambda: profile_section(request),
+        "registrations": lambda: registrations_section(request.user),
+        "notifications": lambda: notifications_section(request.user, notification_limit),
+        "events": lambda: catalog_page(QueryDict()),
+    }
+    return {name: builders[name]() for name in sections}
+
+
+def profile_section(request) -> dict:
+    profile = request.profile
+    summary = get_profile_summary(profile)
+    next_event = summary.next_event
+    return {
+        "id": profile.pk,
+        "username": request.user.username,
+        "display_name": profile.full_display_name,
+        "avatar_url": profile.avatar_url,
+        "city": profile.city,
+        "country": profile.country,
+        "favorite_distance": profile.favorite_distance,
+        "is_staff": request.user.is_staff,
+        "is_superuser": request.user.is_superuser,
+        "stats": summary.stats,
+        "next_event": {
+            "title": next_event.event.title,
+            "slug": next_event.event.slug,
+            "start_date": next_event.event.start_date.isoformat(),
+            "category": next_event.category,
+            "bib_number": next_event.bib_number,
+        }
+        if next_event
+        else None,
+    }
+
+
+def registrations_section(user) -> list[dict]:
+    registrations = (
+        EventRegistration.objects.filter(user=user, status__in=EventRegistration.ACTIVE_STATUSES)
+        .select_related("event", "category")
+        .order_by("event__start_date", "pk")
+    )
+    return [serialize_registration(registration) for registration in registrations]
+
+
+def notifications_section(user, limit) -> dict:
+    inbox = Notification.objects.filter(recipient=user)
+    counts = inbox.aggregate(total=Count("pk"), unread=Count("pk", filter=Q(is_read=False)))
+    latest = list(inbox.order_by("-created_at")[:limit]) if counts["total"] else []
+    return {
+        "unread": counts["unread"],
+        "total": counts["total"],
+        "results": [serialize_notification(notif) for notif in latest],
+    }
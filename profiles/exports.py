@@ -0,0 +1,162 @@
+"""
+Streaming CSV/JSONL exports of start lists and registrations.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` (a
+server-side cursor on PostgreSQL) and encoded a chunk at a time, so an
+export holds one chunk of tuples in memory however many rows it has.
+Views wrap ``stream_rows`` in a ``StreamingHttpResponse``; the
+``export_participants`` command writes the same chunks to a file.
+"""
+
+import csv
+import datetime
+import io
+import uuid
+from dataclasses import dataclass
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.functions import Length
+
+from registrations.models import EventRegistration
+
+from .forms import ParticipantFilterForm, RegistrationExportFilterForm
+from .models import UserRaceHistory
+
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    name: str
+    model: type
+    form_class: type
+    # (column header, values_list lookup)
+    columns: tuple
+    ordering: tuple
+    default_filters: dict
+
+    @property
+    def header(self) -> list[str]:
+        return [column for column, _ in self.columns]
+
+    def queryset(self, filter_form):
+        queryset = filter_form.filter_queryset(self.model._default_manager.all())
+        if not any(filter_form.cleaned_data.get(key) for key in self.default_filters):
+            queryset = queryset.filter(**self.default_filters)
+        return queryset.order_by(*self.ordering).values_list(*(lookup for _, lookup in self.columns))
+
+
+EXPORTS = {
+    "start-list": ExportSpec(
+        name="start-list",
+        model=UserRaceHistory,
+        form_class=ParticipantFilterForm,
+        columns=(
+            ("bib_number", "bib_number"),
+            ("username", "profile__user__username"),
+            ("first_name", "profile__user__first_name"),
+            ("last_name", "profile__user__last_name"),
+            ("display_name", "profile__display_name"),
+            ("category", "category"),
+            ("status", "status"),
+            ("registration_date", "registration_date"),
+            ("event_id", "event_id"),
+            ("event_title", "event__title"),
+        ),
+        # Numeric BIBs in numeric order; unnumbered runners last.
+        ordering=("event_id", "category", Length("bib_number").asc(), "bib_number", "pk"),
+        # A start list is the confirmed field unless another status is asked for.
+        default_filters={"status": UserRaceHistory.Status.UPCOMING},
+    ),
+    "registrations": ExportSpec(
+        name="registrations",
+        model=EventRegistration,
+        form_class=RegistrationExportFilterForm,
+        columns=(
+            ("reference_code", "reference_code"),
+            ("event_id", "event_id"),
+            ("event_title", "event__title"),
+            ("username", "user__username"),
+            ("email", "user__email"),
+            ("category", "distance_label"),
+            ("status", "status"),
+            ("payment_status", "payment_status"),
+            ("phone_number", "phone_number"),
+            ("emergency_contact_name", "emergency_contact_name"),
+            ("emergency_contact_phone", "emergency_contact_phone"),
+            ("created_at", "created_at"),
+            ("confirmed_at", "confirmed_at"),
+            ("cancelled_at", "cancelled_at"),
+        ),
+        ordering=("event_id", "created_at", "pk"),
+        default_filters={},
+    ),
+}
+
+
+# Spreadsheets evaluate cells starting with these as formulas.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Usernames, names and contacts are user input; keep them text.
+        return f"'{value}"
+    return value
+
+
+def stream_rows(header, rows, export_format: str, *, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yield ``rows`` encoded as CSV (with a header line) or JSONL, ``chunk_size`` rows per string."""
+
+    if export_format not in CONTENT_TYPES:
+        raise ValueError(f"Unknown export format {export_format!r}; expected one of {', '.join(CONTENT_TYPES)}.")
+
+    buffer = io.StringIO()
+    if export_format == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+
+        def write(row):
+            writer.writerow([_csv_cell(value) for value in row])
+    else:
+        encoder = DjangoJSONEncoder()
+
+        def write(row):
+            buffer.write(encoder.encode(dict(zip(header, row))))
+            buffer.write("\n")
+
+    pending = 0
+    for row in rows:
+        write(row)
+        pending += 1
+        if pending >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_stream(spec: ExportSpec, filter_form, export_format: str, *, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Encoded chunks of ``spec``'s rows matching ``filter_form`` (which must be valid)."""
+
+    rows = spec.queryset(filter_form).iterator(chunk_size=chunk_size)
+    return stream_rows(spec.header, rows, export_format, chunk_size=chunk_size)
+
+
+def export_filename(spec: ExportSpec, filter_form, export_format: str) -> str:
+    event = filter_form.cleaned_data.get("event")
+    suffix = f"-event-{event}" if event else ""
+    return f"{spec.name}{suffix}-{datetime.date.today():%Y%m%d}.{export_format}"
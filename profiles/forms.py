@@ -9,8 +9,11 @@ from events.models import Event, EventCategory
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import PasswordChangeForm
+from django.db import models
 
-from .models import RunnerAchievement, UserProfile
+from registrations.models import EventRegistration
+
+from .models import RunnerAchievement, UserProfile, UserRaceHistory
 
 class EventForm(forms.ModelForm):
     class Meta:
@@ -134,4 +137,86 @@ class AdminEventForm(forms.ModelForm):
         model = Event
         fields = ["title", "description", "city", "start_date", "end_date",
                   "registration_deadline", "status", "categories", "participant_limit",
-                  "popularity_score"]
\ No newline at end of file
+                  "popularity_score"]
+
+
+class ParticipantFilterForm(forms.Form):
+    q = forms.CharField(
+        required=False,
+        label="Search",
+        widget=forms.TextInput(attrs={"placeholder": "Username or BIB prefix"}),
+    )
+    event = forms.TypedChoiceField(required=False, coerce=int, empty_value=None, choices=[], label="Event")
+    status = forms.ChoiceField(required=False, choices=[], label="Status")
+    category = forms.CharField(
+        required=False,
+        label="Category",
+        widget=forms.TextInput(attrs={"placeholder": "e.g. Full Marathon"}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["event"].choices = [("", "All events")] + list(
+            Event.objects.order_by("-start_date").values_list("id", "title")
+        )
+        self.fields["status"].choices = [("", "Any status")] + list(UserRaceHistory.Status.choices)
+
+        for field in self.fields.values():
+            existing_class = field.widget.attrs.get("class", "")
+            field.widget.attrs["class"] = f"{existing_class} control".strip()
+
+    def filter_queryset(self, queryset):
+        if not self.is_valid():
+            return queryset
+
+        q = self.cleaned_data.get("q", "").strip()
+        event = self.cleaned_data.get("event")
+        status = self.cleaned_data.get("status")
+        # History rows store the category's display name, or the registration's
+        # free-text distance label ("Open Category" when empty): match exactly.
+        category = self.cleaned_data.get("category", "").strip()
+
+        if event:
+            queryset = queryset.filter(event_id=event)
+        if status:
+            queryset = queryset.filter(status=status)
+        if category:
+            queryset = queryset.filter(category=category)
+        if q:
+            # Case-sensitive prefix matches so both lookups stay on their
+            # indexes: auth_user.username (resolved to profile ids first)
+            # and bib_number.
+            matching_profiles = UserProfile.objects.filter(user__username__startswith=q).values("pk")
+            queryset = queryset.filter(
+                models.Q(profile__in=matching_profiles) | models.Q(bib_number__startswith=q)
+            )
+        return queryset
+
+
+class RegistrationExportFilterForm(forms.Form):
+    """Filters for the registrations export (``profiles.exports``)."""
+
+    event = forms.IntegerField(required=False, min_value=1)
+    status = forms.ChoiceField(required=False, choices=[("", "Any status")] + list(EventRegistration.Status.choices))
+    payment_status = forms.ChoiceField(
+        required=False, choices=[("", "Any payment status")] + list(EventRegistration.PaymentStatus.choices)
+    )
+    created_from = forms.DateField(required=False)
+    created_to = forms.DateField(required=False)
+
+    def filter_queryset(self, queryset):
+        if not self.is_valid():
+            return queryset
+
+        data = self.cleaned_data
+        if data.get("event"):
+            queryset = queryset.filter(event_id=data["event"])
+        if data.get("status"):
+            queryset = queryset.filter(status=data["status"])
+        if data.get("payment_status"):
+            queryset = queryset.filter(payment_status=data["payment_status"])
+        if data.get("created_from"):
+            queryset = queryset.filter(created_at__date__gte=data["created_from"])
+        if data.get("created_to"):
+            queryset = queryset.filter(created_at__date__lte=data["created_to"])
+        return queryset
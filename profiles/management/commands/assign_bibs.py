@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from events.models import Event
+from profiles.bibs import assign_bib_numbers
+from profiles.models import UserRaceHistory
+
+
+class Command(BaseCommand):
+    help = "Number every confirmed runner without a BIB, one start list (event) at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="events",
+            help="Only number this event id (repeatable; default: every event with unnumbered runners).",
+        )
+        parser.add_argument(
+            "--status",
+            action="append",
+            choices=UserRaceHistory.Status.values,
+            help="Race history statuses that get a BIB (repeatable; default: upcoming).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk update (default: 1000).")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many runners would be numbered without saving anything.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        statuses = options["status"] or [UserRaceHistory.Status.UPCOMING]
+        unnumbered = UserRaceHistory.objects.filter(bib_number="", status__in=statuses)
+        if options["events"]:
+            missing = set(options["events"]) - set(
+                Event.objects.filter(pk__in=options["events"]).values_list("pk", flat=True)
+            )
+            if missing:
+                raise CommandError(f"Unknown event id(s): {', '.join(map(str, sorted(missing)))}.")
+            unnumbered = unnumbered.filter(event_id__in=options["events"])
+
+        event_ids = sorted(set(unnumbered.values_list("event_id", flat=True)))
+        total = 0
+        for event_id in event_ids:
+            with transaction.atomic():
+                histories = list(
+                    unnumbered.filter(event_id=event_id).only("pk", "event_id", "category", "registration_date")
+                )
+                assigned = assign_bib_numbers(histories)
+                if options["dry_run"]:
+                    transaction.set_rollback(True)
+                else:
+                    UserRaceHistory.objects.bulk_update(assigned, ["bib_number"], batch_size=options["batch_size"])
+            total += len(assigned)
+            self.stdout.write(f"Event {event_id}: {len(assigned)} BIB{'s' if len(assigned) != 1 else ''}.")
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"Dry run: {total} runners would be numbered. No changes were made."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Assigned {total} BIB numbers across {len(event_ids)} events."))
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from profiles.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the missing profile of every account that predates the profile signal, "
+        "so profile pages never have to create one on a read."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Profiles per bulk insert (default: 1000).")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many profiles are missing without creating them.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        missing = get_user_model().objects.filter(profile__isnull=True).order_by("pk")
+        if options["dry_run"]:
+            count = missing.count()
+            self.stdout.write(self.style.WARNING(f"Dry run: {count} users have no profile. No changes were made."))
+            return
+
+        total = 0
+        last_pk = 0
+        while True:
+            user_ids = list(missing.filter(pk__gt=last_pk).values_list("pk", flat=True)[:batch_size])
+            if not user_ids:
+                break
+            # A profile created concurrently (signup, first request) wins.
+            UserProfile.objects.bulk_create(
+                [UserProfile(user_id=user_id) for user_id in user_ids], ignore_conflicts=True
+            )
+            total += len(user_ids)
+            last_pk = user_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Created {total} missing profiles."))
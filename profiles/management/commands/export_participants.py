@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from profiles.exports import CONTENT_TYPES, EXPORT_CHUNK_SIZE, EXPORTS, export_stream
+
+
+class Command(BaseCommand):
+    help = "Stream a start list or the registrations of one or all events to CSV or JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(EXPORTS), help="What to export.")
+        parser.add_argument(
+            "--format", choices=sorted(CONTENT_TYPES), default="csv", help="Output format (default: csv)."
+        )
+        parser.add_argument("--output", help="File to write (default: stdout).")
+        parser.add_argument("--event", type=int, help="Only this event id.")
+        parser.add_argument("--status", help="Only this status (start list default: upcoming).")
+        parser.add_argument("--category", help="Start list: only this category label.")
+        parser.add_argument("--payment-status", help="Registrations: only this payment status.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"Rows fetched and written per chunk (default: {EXPORT_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+        spec = EXPORTS[options["dataset"]]
+        params = {
+            "event": options["event"],
+            "status": options["status"],
+            "category": options["category"],
+            "payment_status": options["payment_status"],
+        }
+        filter_form = spec.form_class({key: value for key, value in params.items() if value is not None})
+        if not filter_form.is_valid():
+            errors = "; ".join(f"{field}: {' '.join(messages)}" for field, messages in filter_form.errors.items())
+            raise CommandError(f"Invalid filters: {errors}")
+
+        chunks = export_stream(spec, filter_form, options["format"], chunk_size=options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as handle:
+                handle.writelines(chunks)
+            self.stderr.write(self.style.SUCCESS(f"Wrote {spec.name} export to {options['output']}."))
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
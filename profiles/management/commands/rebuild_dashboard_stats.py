@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from profiles.stats import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the admin dashboard rollups (participants per event/status, registrations per day)."
+
+    def handle(self, *args, **options):
+        status_rows, daily_rows = rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {status_rows} event/status rows and {daily_rows} daily rows.")
+        )
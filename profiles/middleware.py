@@ -0,0 +1,71 @@
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.functional import SimpleLazyObject
+
+from .models import UserProfile
+
+
+def get_request_profile(request):
+    """
+    The signed-in user's profile, loaded with one SELECT and cached on the
+    request (``None`` for anonymous users).
+
+    The profile reuses the already-loaded ``request.user`` as its ``user``,
+    so ``profile.user`` costs no further query. Profiles are created with
+    the user (``profiles.signals``); only legacy accounts that predate that
+    signal and have not been through ``manage.py backfill_profiles`` fall
+    back to creating one here.
+    """
+
+    if not hasattr(request, "_cached_profile"):
+        user = request.user
+        profile = None
+        if user.is_authenticated:
+            profile = UserProfile.objects.filter(user_id=user.pk).first()
+            if profile is None:
+                profile, _ = UserProfile.objects.get_or_create(user_id=user.pk)
+            profile.user = user
+        request._cached_profile = profile
+    return request._cached_profile
+
+
+async def aget_request_profile(request):
+    """Async ``get_request_profile`` for async views (``await request.aprofile()``)."""
+
+    return await sync_to_async(get_request_profile)(request)
+
+
+class ProfileMiddleware:
+    """
+    Expose the signed-in user's profile as a lazy ``request.profile`` (and
+    ``request.aprofile()`` for async views); it wraps ``None`` for anonymous
+    users, so check ``request.user`` first.
+
+    Runs natively in both modes so it never forces the ASGI middleware chain
+    back onto a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        self._attach(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self._attach(request)
+        return await self.get_response(request)
+
+    @staticmethod
+    def _attach(request):
+        request.profile = SimpleLazyObject(lambda: get_request_profile(request))
+        request.aprofile = partial(aget_request_profile, request)
@@ -0,0 +1,14 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_alter_userprofile_avatar_url_and_more'),
+        ('profiles', '0004_alter_userprofile_avatar_url'),
+    ]
+
+    operations = [
+    ]
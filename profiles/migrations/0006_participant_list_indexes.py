@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_import_ledger'),
+        ('profiles', '0005_merge_20261019_0208'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='avatar_url',
+            field=models.URLField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='strava_profile',
+            field=models.URLField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='website',
+            field=models.URLField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='userracehistory',
+            name='bib_number',
+            field=models.CharField(blank=True, db_index=True, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='userracehistory',
+            index=models.Index(fields=['event', 'status', '-registration_date'], name='profiles_us_event_i_ea32ff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userracehistory',
+            index=models.Index(fields=['status', '-registration_date'], name='profiles_us_status_fa01a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userracehistory',
+            index=models.Index(fields=['-registration_date', '-id'], name='profiles_us_registr_7e6372_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:22
+
+import django.db.models.deletion
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+def clear_duplicate_bib_numbers(apps, schema_editor):
+    """Keep the earliest holder of a BIB that was handed out twice; the rest get renumbered by assign_bibs."""
+
+    UserRaceHistory = apps.get_model("profiles", "UserRaceHistory")
+    seen = set()
+    duplicates = []
+    rows = (
+        UserRaceHistory.objects.exclude(bib_number="")
+        .order_by("event_id", "bib_number", "registration_date", "id")
+        .values_list("id", "event_id", "bib_number")
+    )
+    for pk, event_id, bib_number in rows.iterator(chunk_size=2000):
+        if (event_id, bib_number) in seen:
+            duplicates.append(pk)
+        else:
+            seen.add((event_id, bib_number))
+    for start in range(0, len(duplicates), 500):
+        UserRaceHistory.objects.filter(pk__in=duplicates[start:start + 500]).update(bib_number="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_import_ledger'),
+        ('profiles', '0006_participant_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BibRange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('start', models.PositiveIntegerField()),
+                ('end', models.PositiveIntegerField()),
+                ('next_number', models.PositiveIntegerField(blank=True, help_text='Defaults to the start of the range.')),
+            ],
+            options={
+                'ordering': ['event', 'start'],
+            },
+        ),
+        migrations.RunPython(clear_duplicate_bib_numbers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='userracehistory',
+            constraint=models.UniqueConstraint(condition=models.Q(('bib_number', ''), _negated=True), fields=('event', 'bib_number'), name='unique_bib_number_per_event'),
+        ),
+        migrations.AddField(
+            model_name='bibrange',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bib_ranges', to='events.event'),
+        ),
+        migrations.AddConstraint(
+            model_name='bibrange',
+            constraint=models.UniqueConstraint(fields=('event', 'start'), name='unique_bib_range_start_per_event'),
+        ),
+        migrations.AddConstraint(
+            model_name='bibrange',
+            constraint=models.CheckConstraint(condition=models.Q(('start__lte', models.F('end')), ('next_number__gte', models.F('start')), ('next_number__lte', django.db.models.expressions.CombinedExpression(models.F('end'), '+', models.Value(1)))), name='bib_range_bounds'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def populate_stats(apps, schema_editor):
+    UserRaceHistory = apps.get_model("profiles", "UserRaceHistory")
+    EventRegistration = apps.get_model("registrations", "EventRegistration")
+    EventStatusStat = apps.get_model("profiles", "EventStatusStat")
+    EventDailyStat = apps.get_model("profiles", "EventDailyStat")
+
+    EventStatusStat.objects.bulk_create(
+        EventStatusStat(event_id=event_id, status=status, count=count)
+        for event_id, status, count in UserRaceHistory.objects.values_list("event_id", "status")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    EventDailyStat.objects.bulk_create(
+        EventDailyStat(event_id=event_id, day=day, registrations=count)
+        for event_id, day, count in EventRegistration.objects.annotate(day=TruncDate("created_at"))
+        .values_list("event_id", "day")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_import_ledger'),
+        ('profiles', '0007_bib_ranges'),
+        ('registrations', '0002_waitlist_fifo_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('registrations', models.IntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='events.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='profiles_ev_day_3b7c01_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'day'), name='unique_event_daily_stat')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EventStatusStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('registered', 'Registered'), ('completed', 'Completed'), ('dnf', 'Did Not Finish'), ('dns', 'Did Not Start'), ('upcoming', 'Upcoming')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_stats', to='events.event')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('event', 'status'), name='unique_event_status_stat')],
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
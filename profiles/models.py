@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
@@ -77,7 +78,7 @@ class UserRaceHistory(models.Model):
     category = models.CharField(max_length=50, blank=True)
     registration_date = models.DateField(default=timezone.now)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
-    bib_number = models.CharField(max_length=20, blank=True)
+    bib_number = models.CharField(max_length=20, blank=True, db_index=True)
     finish_time = models.DurationField(null=True, blank=True)
     medal_awarded = models.BooleanField(default=False)
     certificate_url = models.URLField(blank=True)
@@ -87,10 +88,122 @@ class UserRaceHistory(models.Model):
     class Meta:
         ordering = ["-registration_date"]
         unique_together = ("profile", "event", "category")
+        indexes = [
+            models.Index(fields=["event", "status", "-registration_date"]),
+            models.Index(fields=["status", "-registration_date"]),
+            models.Index(fields=["-registration_date", "-id"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "bib_number"],
+                condition=~models.Q(bib_number=""),
+                name="unique_bib_number_per_event",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.profile.full_display_name} - {self.event.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What the dashboard rollup counted this row as; see profiles.stats.
+        instance._stats_key = (instance.__dict__.get("event_id"), instance.__dict__.get("status"))
+        return instance
+
+
+class EventStatusStat(models.Model):
+    """Race history rows per event and status, kept up to date by ``profiles.stats``."""
+
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name="status_stats",
+    )
+    status = models.CharField(max_length=20, choices=UserRaceHistory.Status.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "status"], name="unique_event_status_stat"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_id} {self.status}: {self.count}"
+
+
+class EventDailyStat(models.Model):
+    """Registrations received per event and day, kept up to date by ``profiles.stats``."""
+
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+    )
+    day = models.DateField()
+    registrations = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "day"], name="unique_event_daily_stat"),
+        ]
+        indexes = [models.Index(fields=["day"])]
+
+    def __str__(self) -> str:
+        return f"{self.event_id} {self.day}: {self.registrations}"
+
+
+class BibRange(models.Model):
+    """
+    Block of BIB numbers reserved for one category of an event.
+
+    ``next_number`` is the first unassigned number; see ``profiles.bibs``.
+    A category that outgrows its block gets another one after the event's
+    last range.
+    """
+
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name="bib_ranges",
+    )
+    category = models.CharField(max_length=50, blank=True)
+    start = models.PositiveIntegerField()
+    end = models.PositiveIntegerField()
+    next_number = models.PositiveIntegerField(blank=True, help_text="Defaults to the start of the range.")
+
+    class Meta:
+        ordering = ["event", "start"]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "start"], name="unique_bib_range_start_per_event"),
+            models.CheckConstraint(
+                condition=models.Q(start__lte=models.F("end"))
+                & models.Q(next_number__gte=models.F("start"))
+                & models.Q(next_number__lte=models.F("end") + 1),
+                name="bib_range_bounds",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event.title} - {self.category or 'Open'}: {self.start}-{self.end}"
+
+    @property
+    def remaining(self) -> int:
+        return self.end - self.next_number + 1
+
+    def clean(self):
+        if self.start is None or self.end is None:
+            return
+        if self.start > self.end:
+            raise ValidationError({"end": "The range must end at or after its start."})
+        if self.next_number is None:
+            self.next_number = self.start
+        overlapping = BibRange.objects.filter(
+            event_id=self.event_id, start__lte=self.end, end__gte=self.start
+        ).exclude(pk=self.pk)
+        if overlapping.exists():
+            raise ValidationError("This range overlaps another BIB range of the event.")
+
 
 class RunnerAchievement(models.Model):
     """Spotlight achievements the runner is proud of."""
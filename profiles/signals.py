@@ -1,11 +1,50 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import UserProfile
+from events.models import Event
+
+from . import stats
+from .models import UserProfile, UserRaceHistory
+from .summary import invalidate_all_profile_summaries, invalidate_profile_summaries
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.get_or_create(user=instance)
+
+
+def _status_unchanged(update_fields) -> bool:
+    return update_fields is not None and not {"event", "event_id", "status"} & set(update_fields)
+
+
+@receiver(post_save, sender=UserRaceHistory)
+def count_race_history(sender, instance, raw=False, update_fields=None, **kwargs):
+    invalidate_profile_summaries([instance.profile_id])
+    if raw or _status_unchanged(update_fields):
+        return
+    stats.track_history_changes([instance])
+
+
+@receiver(post_delete, sender=UserRaceHistory)
+def uncount_race_history(sender, instance, **kwargs):
+    invalidate_profile_summaries([instance.profile_id])
+    stats.track_history_delete(instance)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_summaries_on_event_write(sender, **kwargs):
+    invalidate_all_profile_summaries()
+
+
+@receiver(post_save, sender="registrations.EventRegistration")
+def count_registration(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.apply_daily_deltas({(instance.event_id, stats.registration_day(instance)): 1})
+
+
+@receiver(post_delete, sender="registrations.EventRegistration")
+def uncount_registration(sender, instance, **kwargs):
+    stats.apply_daily_deltas({(instance.event_id, stats.registration_day(instance)): -1})
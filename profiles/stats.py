@@ -0,0 +1,154 @@
+"""
+Rollups behind the admin dashboard.
+
+``EventStatusStat`` counts race history rows per event and status;
+``EventDailyStat`` counts registrations received per event and day. Both
+are adjusted with ``UPDATE ... SET count = count + n`` as rows change:
+
+- ``UserRaceHistory`` and ``EventRegistration`` saves and deletes through
+  the signals in ``profiles.signals``;
+- bulk writes that skip signals (``registrations.bulk``) by passing their
+  rows to ``track_history_changes``.
+
+``QuerySet.update()`` and raw imports bypass both, so anything that
+rewrites rows wholesale (``generate_dataset``, data migrations) should be
+followed by ``manage.py rebuild_dashboard_stats``.
+"""
+
+import datetime
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from events.models import Event
+
+from .models import EventDailyStat, EventStatusStat, UserRaceHistory
+
+DASHBOARD_TOP_EVENTS = 20
+DASHBOARD_SERIES_DAYS = 30
+
+
+def _bump(model, keys: dict, field: str, delta: int) -> None:
+    if model.objects.filter(**keys).update(**{field: F(field) + delta}):
+        return
+    if delta < 0:
+        # Never counted (rows older than the rollup) or the event is being
+        # deleted; rebuild_dashboard_stats repairs any drift.
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **{field: delta})
+    except IntegrityError:
+        model.objects.filter(**keys).update(**{field: F(field) + delta})
+
+
+def apply_status_deltas(deltas) -> None:
+    """Apply ``{(event_id, status): delta}`` to ``EventStatusStat``."""
+
+    for (event_id, status), delta in sorted(deltas.items()):
+        if delta:
+            _bump(EventStatusStat, {"event_id": event_id, "status": status}, "count", delta)
+
+
+def apply_daily_deltas(deltas) -> None:
+    """Apply ``{(event_id, day): delta}`` to ``EventDailyStat``."""
+
+    for (event_id, day), delta in sorted(deltas.items()):
+        if delta:
+            _bump(EventDailyStat, {"event_id": event_id, "day": day}, "registrations", delta)
+
+
+def track_history_changes(histories) -> None:
+    """Count saved ``histories`` under their current event and status instead of the loaded one."""
+
+    deltas = Counter()
+    for history in histories:
+        old_key = getattr(history, "_stats_key", None)
+        new_key = (history.event_id, history.status)
+        if old_key == new_key:
+            continue
+        if old_key is not None:
+            deltas[old_key] -= 1
+        deltas[new_key] += 1
+        history._stats_key = new_key
+    apply_status_deltas(deltas)
+
+
+def track_history_delete(history) -> None:
+    key = getattr(history, "_stats_key", None) or (history.event_id, history.status)
+    apply_status_deltas({key: -1})
+
+
+def registration_day(registration) -> datetime.date:
+    return timezone.localdate(registration.created_at)
+
+
+def rebuild() -> tuple[int, int]:
+    """Recompute both rollups from the raw rows. Returns the rows written to each."""
+
+    from registrations.models import EventRegistration
+
+    with transaction.atomic():
+        EventStatusStat.objects.all().delete()
+        EventDailyStat.objects.all().delete()
+        status_rows = EventStatusStat.objects.bulk_create(
+            EventStatusStat(event_id=event_id, status=status, count=count)
+            for event_id, status, count in UserRaceHistory.objects.values_list("event_id", "status")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        daily_rows = EventDailyStat.objects.bulk_create(
+            EventDailyStat(event_id=event_id, day=day, registrations=count)
+            for event_id, day, count in EventRegistration.objects.annotate(day=TruncDate("created_at"))
+            .values_list("event_id", "day")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+    return len(status_rows), len(daily_rows)
+
+
+def registrations_per_day(days: int = DASHBOARD_SERIES_DAYS, *, event_id: int | None = None) -> list[dict]:
+    """Registrations received on each of the last ``days`` days (oldest first, gaps filled with 0)."""
+
+    today = timezone.localdate()
+    since = today - datetime.timedelta(days=days - 1)
+    rows = EventDailyStat.objects.filter(day__gte=since, day__lte=today)
+    if event_id is not None:
+        rows = rows.filter(event_id=event_id)
+    totals = dict(rows.values_list("day").annotate(total=Sum("registrations")).order_by())
+    return [
+        {"day": day, "registrations": totals.get(day, 0)}
+        for day in (since + datetime.timedelta(days=offset) for offset in range(days))
+    ]
+
+
+def dashboard_summary(*, top_events: int = DASHBOARD_TOP_EVENTS) -> dict:
+    """Headline counts and the busiest events, from the rollup and one aggregate over events."""
+
+    event_counts = Event.objects.aggregate(
+        total=Count("pk"),
+        active=Count("pk", filter=Q(status=Event.Status.UPCOMING)),
+        completed=Count("pk", filter=Q(status=Event.Status.COMPLETED)),
+    )
+    per_event = {}
+    by_status = Counter()
+    for event_id, title, status, count in EventStatusStat.objects.filter(count__gt=0).values_list(
+        "event_id", "event__title", "status", "count"
+    ):
+        row = per_event.setdefault(event_id, {"event_id": event_id, "event__title": title, "total": 0})
+        row["total"] += count
+        row[status] = count
+        by_status[status] += count
+    busiest = sorted(per_event.values(), key=lambda row: (-row["total"], row["event__title"]))
+    return {
+        "total_participants": sum(by_status.values()),
+        "participants_by_status": dict(by_status),
+        "total_events": event_counts["total"],
+        "active_events": event_counts["active"],
+        "completed_events": event_counts["completed"],
+        "participants_per_event": busiest[:top_events],
+        "events_with_participants": len(busiest),
+    }
@@ -0,0 +1,86 @@
+"""
+Per-runner dashboard summary.
+
+``DashboardView`` shows a runner's history counts, the latest upcoming and
+completed races and the next race on the calendar. ``build_profile_summary``
+gets the counts from one conditional aggregate and the rows from one query
+(sliced in Python), and ``get_profile_summary`` caches the result per
+profile for ``PROFILE_SUMMARY_TTL`` seconds.
+
+History and registration writes drop the runner's entry (see
+``profiles.signals``; bulk writers call ``invalidate_profile_summaries``),
+and event writes bump the ``profile-summary`` namespace because the
+summary shows event titles and dates.
+"""
+
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from core.cache import bump_namespace, get_or_compute, versioned_key
+
+from .models import UserRaceHistory
+
+Status = UserRaceHistory.Status
+
+SUMMARY_LIST_LIMIT = 5
+UPCOMING_STATUSES = (Status.UPCOMING, Status.REGISTERED)
+
+
+@dataclass
+class ProfileSummary:
+    total_events: int = 0
+    completed: int = 0
+    upcoming: int = 0
+    upcoming_history: list[UserRaceHistory] = field(default_factory=list)
+    completed_history: list[UserRaceHistory] = field(default_factory=list)
+    next_event: UserRaceHistory | None = None
+
+    @property
+    def stats(self) -> dict:
+        return {"total_events": self.total_events, "completed": self.completed, "upcoming": self.upcoming}
+
+
+def summary_cache_key(profile_id: int) -> str:
+    return versioned_key("profile-summary", profile_id)
+
+
+def get_profile_summary(profile) -> ProfileSummary:
+    return get_or_compute(
+        summary_cache_key(profile.pk),
+        lambda: build_profile_summary(profile),
+        settings.PROFILE_SUMMARY_TTL,
+    )
+
+
+def invalidate_profile_summaries(profile_ids) -> None:
+    cache.delete_many([summary_cache_key(profile_id) for profile_id in set(profile_ids)])
+
+
+def invalidate_all_profile_summaries() -> None:
+    bump_namespace("profile-summary")
+
+
+def build_profile_summary(profile) -> ProfileSummary:
+    history = UserRaceHistory.objects.filter(profile=profile)
+    counts = history.aggregate(
+        total_events=Count("pk"),
+        completed=Count("pk", filter=Q(status=Status.COMPLETED)),
+        upcoming=Count("pk", filter=Q(status__in=UPCOMING_STATUSES)),
+    )
+    summary = ProfileSummary(**counts)
+    if not summary.completed and not summary.upcoming:
+        return summary
+
+    rows = list(
+        history.filter(status__in=(*UPCOMING_STATUSES, Status.COMPLETED))
+        .select_related("event")
+        .order_by("-registration_date", "-pk")
+    )
+    upcoming = [row for row in rows if row.status in UPCOMING_STATUSES]
+    summary.upcoming_history = upcoming[:SUMMARY_LIST_LIMIT]
+    summary.completed_history = [row for row in rows if row.status == Status.COMPLETED][:SUMMARY_LIST_LIMIT]
+    summary.next_event = min(upcoming, key=lambda row: row.event.start_date, default=None)
+    return summary
@@ -1,5 +1,5 @@
 import json
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse, NoReverseMatch
 from django.contrib.auth.models import User
 from django.contrib.messages import get_messages # Untuk cek messages
@@ -11,7 +11,7 @@ import datetime
 
 # --- Impor Model & Form dari App Profiles ---
 # (Pastikan UserProfile diimpor sebelum digunakan di setUpTestData)
-from .models import UserProfile, RunnerAchievement, UserRaceHistory 
+from .models import BibRange, UserProfile, RunnerAchievement, UserRaceHistory
 # Asumsi nama form ini benar
 # Import form jika ada dan relevan untuk tes view
 # --- PERBAIKAN: Tambahkan PasswordChangeForm ---
@@ -453,4 +453,940 @@ class ProfileViewTests(TestCase):
         except NoReverseMatch:
              self.fail(f"Could not reverse URL '{url_name}'. Check profiles/urls.py.")
 
-        
\ No newline at end of file
+        
+class AdminParticipantListTests(TestCase):
+    """Tests for the paginated, filterable admin participant list and its JSON API."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(
+            username='participantadmin', password='password123', email='padmin@example.com'
+        )
+        today = timezone.now().date()
+        cls.city_run = Event.objects.create(
+            title="City Run", city="Jakarta",
+            start_date=today + datetime.timedelta(days=10),
+            registration_deadline=today + datetime.timedelta(days=5),
+        )
+        cls.trail_run = Event.objects.create(
+            title="Trail Run", city="Bandung",
+            start_date=today + datetime.timedelta(days=20),
+            registration_deadline=today + datetime.timedelta(days=15),
+        )
+        users = User.objects.bulk_create(
+            User(username=f"runner{index:02d}", email=f"runner{index:02d}@example.com") for index in range(60)
+        )
+        profiles = UserProfile.objects.bulk_create(UserProfile(user=user) for user in users)
+        UserRaceHistory.objects.bulk_create(
+            UserRaceHistory(
+                profile=profile,
+                event=cls.city_run if index % 3 else cls.trail_run,
+                category="Half Marathon" if index % 2 else "Full Marathon",
+                status=UserRaceHistory.Status.UPCOMING if index % 4 == 0 else UserRaceHistory.Status.REGISTERED,
+                bib_number=f"B{index:04d}" if index % 4 == 0 else "",
+                registration_date=today - datetime.timedelta(days=index),
+            )
+            for index, profile in enumerate(profiles)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def test_list_is_paginated(self):
+        """Test the admin page renders one page of participants, newest first."""
+        response = self.client.get(reverse('profiles:admin-participant-list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['participants']), 50)
+        self.assertEqual(response.context['paginator'].count, 60)
+        self.assertEqual(response.context['participants'][0].profile.user.username, 'runner00')
+
+        second = self.client.get(reverse('profiles:admin-participant-list') + '?page=2')
+        self.assertEqual(len(second.context['participants']), 10)
+
+    def test_pagination_links_keep_filters(self):
+        """Test the page links carry the active filters."""
+        response = self.client.get(
+            reverse('profiles:admin-participant-list') + f'?event={self.city_run.id}&page=1'
+        )
+        self.assertEqual(response.context['paginator'].count, 40)
+        self.assertNotContains(response, 'Next</a>')
+
+        response = self.client.get(reverse('profiles:admin-participant-list') + '?q=runner')
+        self.assertContains(response, '?q=runner&amp;page=2')
+
+    def test_filters_and_prefix_search(self):
+        """Test event, status and category filters and username/BIB prefix search."""
+        url = reverse('profiles:admin-participant-list-json')
+        cases = {
+            f'?event={self.trail_run.id}': 20,
+            '?status=upcoming': 15,
+            '?category=Half%20Marathon': 30,
+            f'?event={self.trail_run.id}&status=upcoming&category=Full%20Marathon': 5,
+            '?q=runner1': 10,
+            '?q=B002': 3,
+        }
+        for query, expected in cases.items():
+            with self.subTest(query=query):
+                data = self.client.get(url + query).json()
+                self.assertEqual(data['pagination']['total'], expected)
+
+    def test_json_api_payload(self):
+        """Test the JSON API returns participant rows with pagination metadata."""
+        data = self.client.get(reverse('profiles:admin-participant-list-json') + '?page=2').json()
+
+        self.assertEqual(data['pagination'], {
+            'page': 2, 'pages': 2, 'has_next': False, 'has_previous': True, 'total': 60,
+        })
+        self.assertEqual(len(data['results']), 10)
+        row = data['results'][0]
+        self.assertEqual(row['username'], 'runner50')
+        self.assertEqual(row['event_title'], 'City Run')
+        self.assertEqual(row['status'], UserRaceHistory.Status.REGISTERED)
+
+    def test_json_api_rejects_invalid_filters(self):
+        """Test unknown filter values are reported instead of silently ignored."""
+        response = self.client.get(reverse('profiles:admin-participant-list-json') + '?status=bogus')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json()['errors'])
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        """Test one page costs the same number of queries however many rows exist."""
+        url = reverse('profiles:admin-participant-list-json')
+        self.client.get(url)  # warm the session/user lookups
+
+        with self.assertNumQueries(5) as small:
+            self.client.get(url + f'?event={self.trail_run.id}')
+        with self.assertNumQueries(len(small.captured_queries)):
+            self.client.get(url)
+
+    def test_requires_staff(self):
+        """Test non-admin users cannot list participants."""
+        self.client.force_login(User.objects.create_user(username='plainrunner', password='password123'))
+        response = self.client.get(reverse('profiles:admin-participant-list-json'))
+        self.assertEqual(response.status_code, 302)
+
+
+class AdminParticipantBulkTests(TestCase):
+    """Tests for the bulk confirm/reject/cancel form and JSON API on the participant list."""
+
+    @classmethod
+    def setUpTestData(cls):
+        from events.models import EventCategory
+
+        cls.admin_user = User.objects.create_superuser(
+            username='bulkadmin', password='password123', email='bulkadmin@example.com'
+        )
+        today = timezone.now().date()
+        cls.event = Event.objects.create(
+            title="Bulk City Run", city="Jakarta",
+            start_date=today + datetime.timedelta(days=10),
+            registration_deadline=today + datetime.timedelta(days=5),
+        )
+        cls.category = EventCategory.objects.create(name="10K", distance_km=10, display_name="10K Run")
+
+    def setUp(self):
+        from registrations.models import EventRegistration
+
+        self.registrations = [
+            EventRegistration.objects.create(
+                user=User.objects.create_user(username=f'bulkparticipant{index}'),
+                event=self.event,
+                category=self.category,
+                phone_number='0812',
+                emergency_contact_name='Contact',
+                emergency_contact_phone='0813',
+            )
+            for index in range(3)
+        ]
+        self.histories = list(UserRaceHistory.objects.filter(event=self.event).order_by('profile__user__username'))
+        self.client.force_login(self.admin_user)
+
+    def _statuses(self):
+        from registrations.models import EventRegistration
+
+        return list(
+            EventRegistration.objects.filter(event=self.event).order_by('user__username').values_list('status', flat=True)
+        )
+
+    def test_form_confirms_selected_participants(self):
+        """Test the list form confirms only the ticked rows and redirects back with the filters."""
+        response = self.client.post(reverse('profiles:admin-participant-bulk'), {
+            'action': 'confirm',
+            'participant_ids': [self.histories[0].pk, self.histories[2].pk],
+            'return_query': 'status=registered',
+        })
+
+        self.assertRedirects(
+            response, reverse('profiles:admin-participant-list') + '?status=registered', fetch_redirect_response=False
+        )
+        self.assertEqual(self._statuses(), ['confirmed', 'pending', 'confirmed'])
+        messages = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertIn('2 registrations updated (confirm), 0 skipped.', messages)
+
+    def test_form_applies_to_every_matching_participant(self):
+        """Test "select all matching" applies the action to the whole filtered set."""
+        self.client.post(reverse('profiles:admin-participant-bulk'), {
+            'action': 'reject',
+            'select_all_matching': '1',
+            'event': self.event.pk,
+        })
+
+        self.assertEqual(self._statuses(), ['rejected'] * 3)
+
+    def test_json_api(self):
+        """Test the JSON API reports counts and validates its input."""
+        url = reverse('profiles:admin-participant-bulk-json')
+        response = self.client.post(
+            url,
+            json.dumps({'action': 'cancel', 'participant_ids': [self.histories[1].pk], 'note': 'Duplicate'}),
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated'], 1)
+        self.assertEqual(self._statuses(), ['pending', 'cancelled', 'pending'])
+
+        for payload, field in (
+            ({'action': 'approve', 'participant_ids': [1]}, 'action'),
+            ({'action': 'confirm', 'participant_ids': []}, 'participant_ids'),
+            ({'action': 'confirm', 'filter': {'status': 'bogus'}}, 'status'),
+        ):
+            with self.subTest(payload=payload):
+                response = self.client.post(url, json.dumps(payload), content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.json()['errors'])
+
+    def test_requires_staff(self):
+        """Test non-admin users cannot run bulk decisions."""
+        self.client.force_login(User.objects.create_user(username='plainbulkrunner', password='password123'))
+        response = self.client.post(
+            reverse('profiles:admin-participant-bulk-json'),
+            json.dumps({'action': 'confirm', 'participant_ids': [self.histories[0].pk]}),
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._statuses(), ['pending'] * 3)
+
+    def test_json_api_requires_csrf_token(self):
+        """Test a cross-site POST without the CSRF token cannot change registrations."""
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.admin_user)
+        url = reverse('profiles:admin-participant-bulk-json')
+        payload = json.dumps({'action': 'cancel', 'participant_ids': [self.histories[0].pk]})
+
+        response = client.post(url, payload, content_type='application/json')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self._statuses(), ['pending'] * 3)
+
+        client.get(reverse('profiles:admin-participant-list'))
+        response = client.post(
+            url, payload, content_type='application/json', HTTP_X_CSRFTOKEN=client.cookies['csrftoken'].value
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._statuses(), ['cancelled', 'pending', 'pending'])
+
+
+class BibAllocationTests(TestCase):
+    """Tests for per-category BIB ranges, the unique BIB constraint and the assign_bibs command."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.now().date()
+        cls.event = Event.objects.create(
+            title="Numbered Run", city="Jakarta",
+            start_date=today + datetime.timedelta(days=30),
+            registration_deadline=today + datetime.timedelta(days=20),
+        )
+        users = User.objects.bulk_create(User(username=f"bibrunner{index}") for index in range(6))
+        cls.profiles = UserProfile.objects.bulk_create(UserProfile(user=user) for user in users)
+
+    def _histories(self, categories, status=UserRaceHistory.Status.UPCOMING):
+        today = timezone.now().date()
+        return UserRaceHistory.objects.bulk_create(
+            UserRaceHistory(
+                profile=profile,
+                event=self.event,
+                category=category,
+                status=status,
+                registration_date=today - datetime.timedelta(days=index),
+            )
+            for index, (profile, category) in enumerate(zip(self.profiles, categories))
+        )
+
+    def _bibs(self, category):
+        return sorted(
+            int(bib) for bib in UserRaceHistory.objects.filter(event=self.event, category=category)
+            .exclude(bib_number="").values_list('bib_number', flat=True)
+        )
+
+    def test_each_category_gets_its_own_range(self):
+        """Test categories are numbered from separate blocks, earliest registration first."""
+        from .bibs import assign_bib_numbers
+
+        histories = self._histories(["Full Marathon", "Half Marathon", "Full Marathon", "Half Marathon"])
+        assign_bib_numbers(histories)
+        UserRaceHistory.objects.bulk_update(histories, ["bib_number"])
+
+        self.assertEqual(self._bibs("Full Marathon"), [1, 2])
+        self.assertEqual(self._bibs("Half Marathon"), [1001, 1002])
+        # The earliest registration (index 2, three days before the others' latest) gets the lowest number.
+        self.assertEqual(UserRaceHistory.objects.get(pk=histories[2].pk).bib_number, "1")
+        self.assertEqual(
+            list(BibRange.objects.filter(event=self.event).values_list('category', 'start', 'end', 'next_number')),
+            [("Full Marathon", 1, 1000, 3), ("Half Marathon", 1001, 2000, 1003)],
+        )
+
+    @override_settings(BIB_RANGE_SIZE=2)
+    def test_full_range_continues_in_a_new_block(self):
+        """Test a category that outgrows its block continues after the event's last range."""
+        from .bibs import assign_bib_numbers
+
+        first = self._histories(["10K", "21K"])
+        assign_bib_numbers(first)
+        UserRaceHistory.objects.bulk_update(first, ["bib_number"])
+        more = UserRaceHistory.objects.bulk_create(
+            UserRaceHistory(profile=profile, event=self.event, category="10K") for profile in self.profiles[2:5]
+        )
+        assign_bib_numbers(more)
+
+        self.assertEqual([int(history.bib_number) for history in more], [2, 5, 6])
+
+    def test_existing_numbers_are_not_reused(self):
+        """Test BIBs handed out before ranges existed are skipped."""
+        from .bibs import assign_bib_numbers
+
+        legacy, new = self._histories(["10K", "10K"])
+        legacy.bib_number = "1"
+        legacy.save()
+        assign_bib_numbers([new])
+
+        self.assertEqual(new.bib_number, "2")
+
+    @override_settings(BIB_RANGE_SIZE=10)
+    def test_taken_numbers_are_skipped_one_by_one(self):
+        """Test numbers already worn inside or above the first block are skipped individually."""
+        from .bibs import assign_bib_numbers
+
+        histories = self._histories(["10K"] * 6)
+        UserRaceHistory.objects.filter(pk=histories[0].pk).update(bib_number="3")
+        UserRaceHistory.objects.filter(pk=histories[1].pk).update(bib_number="12")
+        assign_bib_numbers(histories[2:4])
+        UserRaceHistory.objects.bulk_update(histories[2:4], ["bib_number"])
+        self.assertEqual(self._bibs("10K"), [1, 2, 3, 12])
+
+        # The next block (11-20) is opened later and still steps over 12.
+        more = UserRaceHistory.objects.bulk_create(
+            UserRaceHistory(profile=profile, event=self.event, category="10K")
+            for profile in UserProfile.objects.bulk_create(
+                UserProfile(user=user)
+                for user in User.objects.bulk_create(User(username=f"bibextra{index}") for index in range(10))
+            )
+        )
+        assign_bib_numbers(more)
+        UserRaceHistory.objects.bulk_update(more, ["bib_number"])
+
+        self.assertEqual(self._bibs("10K"), list(range(1, 15)))
+
+    def test_query_count_does_not_grow_with_start_list(self):
+        """Test numbering many runners of a category costs the same queries as numbering one."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from .bibs import assign_bib_numbers
+
+        histories = self._histories(["10K"] * 6)
+        assign_bib_numbers(histories[:1])  # opens the range
+        with CaptureQueriesContext(connection) as one:
+            assign_bib_numbers(histories[1:2])
+        with self.assertNumQueries(len(one.captured_queries)):
+            assign_bib_numbers(histories[2:])
+
+    def test_bib_numbers_are_unique_per_event(self):
+        """Test the database rejects a BIB used twice in one event."""
+        from django.db import IntegrityError, transaction
+
+        first, second = self._histories(["10K", "21K"])
+        UserRaceHistory.objects.filter(pk=first.pk).update(bib_number="7")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            UserRaceHistory.objects.filter(pk=second.pk).update(bib_number="7")
+        UserRaceHistory.objects.filter(pk=second.pk).update(bib_number="")  # blanks never clash
+
+    def test_admin_confirm_assigns_next_bib(self):
+        """Test confirming from the admin list numbers the runner from the event's range."""
+        admin_user = User.objects.create_superuser(username='bibadmin', password='password123', email='b@example.com')
+        first, second = self._histories(["10K", "10K"], status=UserRaceHistory.Status.REGISTERED)
+        self.client.force_login(admin_user)
+
+        for history in (second, first):
+            self.client.post(reverse('profiles:admin-participant-confirm', args=[history.pk]))
+
+        self.assertEqual(UserRaceHistory.objects.get(pk=second.pk).bib_number, "1")
+        self.assertEqual(UserRaceHistory.objects.get(pk=first.pk).bib_number, "2")
+
+    def test_assign_bibs_command(self):
+        """Test the command numbers every unnumbered confirmed runner and supports a dry run."""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        self._histories(["10K", "10K", "21K", "21K", "10K"])
+        UserRaceHistory.objects.filter(profile=self.profiles[4]).update(status=UserRaceHistory.Status.REGISTERED)
+
+        out = StringIO()
+        call_command('assign_bibs', '--dry-run', stdout=out)
+        self.assertIn("4 runners would be numbered", out.getvalue())
+        self.assertFalse(UserRaceHistory.objects.exclude(bib_number="").exists())
+        self.assertFalse(BibRange.objects.exists())
+
+        call_command('assign_bibs', stdout=StringIO())
+        self.assertEqual(self._bibs("10K"), [1, 2])
+        self.assertEqual(self._bibs("21K"), [1001, 1002])
+        self.assertEqual(UserRaceHistory.objects.get(profile=self.profiles[4]).bib_number, "")
+
+
+class DashboardStatsTests(TestCase):
+    """Tests for the incrementally maintained admin dashboard rollups."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(
+            username='statsadmin', password='password123', email='stats@example.com'
+        )
+        today = timezone.now().date()
+        cls.events = [
+            Event.objects.create(
+                title=title, city="Jakarta",
+                start_date=today + datetime.timedelta(days=30),
+                registration_deadline=today + datetime.timedelta(days=20),
+            )
+            for title in ("Stats Run", "Quiet Run")
+        ]
+
+    def _register(self, username, event):
+        from registrations.models import EventRegistration
+
+        return EventRegistration.objects.create(
+            user=User.objects.create_user(username=username),
+            event=event,
+            distance_label="10K",
+            phone_number='0812',
+            emergency_contact_name='Contact',
+            emergency_contact_phone='0813',
+        )
+
+    def _status_counts(self):
+        from .models import EventStatusStat
+
+        return {
+            (row.event_id, row.status): row.count
+            for row in EventStatusStat.objects.filter(count__gt=0)
+        }
+
+    def _daily_counts(self):
+        from .models import EventDailyStat
+
+        return {
+            (row.event_id, row.day): row.registrations
+            for row in EventDailyStat.objects.filter(registrations__gt=0)
+        }
+
+    def _assert_matches_rebuild(self):
+        from .stats import rebuild
+
+        incremental = (self._status_counts(), self._daily_counts())
+        rebuild()
+        self.assertEqual(incremental, (self._status_counts(), self._daily_counts()))
+
+    def test_single_saves_keep_rollups_current(self):
+        """Test registering, confirming and deleting adjust the rollups without a rebuild."""
+        event = self.events[0]
+        first = self._register('statsrunner1', event)
+        self._register('statsrunner2', event)
+        today = timezone.localdate()
+
+        self.assertEqual(self._status_counts(), {(event.pk, 'registered'): 2})
+        self.assertEqual(self._daily_counts(), {(event.pk, today): 2})
+
+        first.status = 'confirmed'
+        first.save()
+        self.assertEqual(self._status_counts(), {(event.pk, 'registered'): 1, (event.pk, 'upcoming'): 1})
+
+        first.delete()
+        self.assertEqual(self._daily_counts(), {(event.pk, today): 1})
+        self._assert_matches_rebuild()
+
+    def test_bulk_decisions_keep_rollups_current(self):
+        """Test bulk_update paths report their status changes to the rollup."""
+        from registrations.bulk import bulk_decide
+        from registrations.models import EventRegistration
+
+        for index in range(4):
+            self._register(f'bulkstats{index}', self.events[index % 2])
+        bulk_decide(EventRegistration.objects.filter(event=self.events[0]), "confirm")
+        bulk_decide(EventRegistration.objects.filter(event=self.events[1]), "reject")
+
+        self.assertEqual(self._status_counts(), {(self.events[0].pk, 'upcoming'): 2, (self.events[1].pk, 'dns'): 2})
+        self._assert_matches_rebuild()
+
+    def test_rebuild_command_repairs_drift(self):
+        """Test rebuild_dashboard_stats recomputes rows changed behind the signals' back."""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        self._register('driftrunner', self.events[0])
+        UserRaceHistory.objects.update(status=UserRaceHistory.Status.COMPLETED)
+
+        call_command('rebuild_dashboard_stats', stdout=StringIO())
+
+        self.assertEqual(self._status_counts(), {(self.events[0].pk, 'completed'): 1})
+
+    def test_dashboard_reads_rollups(self):
+        """Test the dashboard shows rollup totals in a fixed number of queries."""
+        self.client.force_login(self.admin_user)
+        url = reverse('profiles:admin-dashboard')
+        self.client.get(url)  # warm the session/user lookups
+
+        with self.assertNumQueries(6) as empty:
+            self.client.get(url)
+        for index in range(3):
+            self._register(f'dashrunner{index}', self.events[index % 2])
+        with self.assertNumQueries(len(empty.captured_queries)):
+            response = self.client.get(url)
+
+        self.assertEqual(response.context['total_participants'], 3)
+        self.assertEqual(response.context['total_events'], 2)
+        self.assertEqual(response.context['active_events'], 2)
+        self.assertEqual(
+            [(row['event__title'], row['total']) for row in response.context['participants_per_event']],
+            [("Stats Run", 2), ("Quiet Run", 1)],
+        )
+        self.assertEqual(len(response.context['registrations_per_day']), 30)
+        self.assertEqual(response.context['registrations_per_day'][-1]['registrations'], 3)
+
+    def test_stats_json_series(self):
+        """Test the JSON endpoint returns a gap-filled daily series, optionally for one event."""
+        from .models import EventDailyStat
+
+        self._register('seriesrunner', self.events[0])
+        two_days_ago = timezone.localdate() - datetime.timedelta(days=2)
+        EventDailyStat.objects.create(event=self.events[1], day=two_days_ago, registrations=4)
+        self.client.force_login(self.admin_user)
+        url = reverse('profiles:admin-dashboard-stats-json')
+
+        data = self.client.get(url + '?days=3').json()
+        self.assertEqual([point['registrations'] for point in data['registrations_per_day']], [4, 0, 1])
+        self.assertEqual(data['registrations_per_day'][0]['day'], two_days_ago.isoformat())
+        self.assertEqual(data['summary']['total_participants'], 1)
+
+        data = self.client.get(url + f'?days=3&event={self.events[0].pk}').json()
+        self.assertEqual([point['registrations'] for point in data['registrations_per_day']], [0, 0, 1])
+
+        self.assertEqual(self.client.get(url + '?days=0').status_code, 400)
+        self.assertEqual(self.client.get(url + '?event=x').status_code, 400)
+
+
+class ParticipantExportTests(TestCase):
+    """Tests for the streaming start list / registration exports and their command."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(
+            username='exportadmin', password='password123', email='export@example.com'
+        )
+        today = timezone.now().date()
+        cls.event = Event.objects.create(
+            title="Export Run", city="Jakarta",
+            start_date=today + datetime.timedelta(days=30),
+            registration_deadline=today + datetime.timedelta(days=20),
+        )
+        users = User.objects.bulk_create(
+            User(username=f"exporter{index}", first_name=f"Runner{index}") for index in range(12)
+        )
+        profiles = UserProfile.objects.bulk_create(UserProfile(user=user) for user in users)
+        UserRaceHistory.objects.bulk_create(
+            UserRaceHistory(
+                profile=profile,
+                event=cls.event,
+                category="10K",
+                status=UserRaceHistory.Status.UPCOMING if index < 10 else UserRaceHistory.Status.REGISTERED,
+                bib_number=str(index + 1) if index < 10 else "",
+            )
+            for index, profile in enumerate(profiles)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def _body(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_start_list_csv(self):
+        """Test the start list streams confirmed runners as CSV in numeric BIB order."""
+        import csv
+        import io
+
+        response = self.client.get(reverse('profiles:admin-export-start-list') + f'?event={self.event.pk}')
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn(f'start-list-event-{self.event.pk}-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self._body(response))))
+        self.assertEqual([row['bib_number'] for row in rows], [str(number) for number in range(1, 11)])
+        self.assertEqual(rows[0]['username'], 'exporter0')
+        self.assertEqual(rows[0]['event_title'], 'Export Run')
+
+    def test_start_list_status_filter_overrides_default(self):
+        """Test asking for another status replaces the confirmed-only default."""
+        response = self.client.get(reverse('profiles:admin-export-start-list') + '?status=registered&format=jsonl')
+
+        lines = [json.loads(line) for line in self._body(response).splitlines()]
+        self.assertEqual(sorted(line['username'] for line in lines), ['exporter10', 'exporter11'])
+
+    def test_registrations_jsonl(self):
+        """Test registrations export as JSONL with filters applied."""
+        from registrations.models import EventRegistration
+
+        for index, status in enumerate(('pending', 'confirmed')):
+            EventRegistration.objects.create(
+                user=User.objects.get(username=f'exporter{index}'),
+                event=self.event,
+                status=status,
+                distance_label="10K",
+                phone_number='0812',
+                emergency_contact_name='Contact',
+                emergency_contact_phone='0813',
+            )
+
+        response = self.client.get(reverse('profiles:admin-export-registrations') + '?format=jsonl&status=confirmed')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = [json.loads(line) for line in self._body(response).splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['username'], 'exporter1')
+        self.assertEqual(lines[0]['status'], 'confirmed')
+        self.assertTrue(lines[0]['confirmed_at'])
+
+    def test_invalid_requests(self):
+        """Test bad formats and filters are rejected and non-admins are redirected."""
+        url = reverse('profiles:admin-export-registrations')
+        self.assertEqual(self.client.get(url + '?format=xml').status_code, 400)
+        self.assertIn('status', self.client.get(url + '?status=bogus').json()['errors'])
+
+        self.client.force_login(User.objects.get(username='exporter0'))
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+    def test_stream_is_lazy_and_chunked(self):
+        """Test rows are pulled and encoded a chunk at a time, so memory does not grow with the export."""
+        import itertools
+
+        from .exports import stream_rows
+
+        endless = ((number, f"runner{number}") for number in itertools.count())
+        chunks = stream_rows(["bib_number", "username"], endless, "csv", chunk_size=100)
+
+        first = next(chunks)
+        self.assertEqual(first.count("\r\n"), 101)  # header + 100 rows
+        self.assertEqual(next(chunks).count("\r\n"), 100)
+
+    def test_csv_cells_cannot_inject_formulas(self):
+        """Test user-supplied values starting with a formula character are exported as text."""
+        from .exports import stream_rows
+
+        rows = [("=HYPERLINK(\"http://x\")", "+62812", "-1", "@cmd", "plain", -5)]
+        csv_text = "".join(stream_rows(["a", "b", "c", "d", "e", "f"], rows, "csv"))
+
+        self.assertEqual(
+            csv_text.splitlines()[1],
+            "\"'=HYPERLINK(\"\"http://x\"\")\",'+62812,'-1,'@cmd,plain,-5",
+        )
+        jsonl = "".join(stream_rows(["a"], [("=1+1",)], "jsonl"))
+        self.assertEqual(json.loads(jsonl)["a"], "=1+1")
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test an export runs one query however many rows it streams."""
+        url = reverse('profiles:admin-export-start-list')
+        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            self._body(response)
+
+    def test_export_command(self):
+        """Test the command writes the same export to a file."""
+        import os
+        import tempfile
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'start.jsonl')
+            call_command(
+                'export_participants', 'start-list', '--format', 'jsonl', '--output', path,
+                '--event', str(self.event.pk), '--chunk-size', '3', stderr=StringIO(),
+            )
+            with open(path, encoding='utf-8') as handle:
+                lines = [json.loads(line) for line in handle]
+        self.assertEqual(len(lines), 10)
+
+        out = StringIO()
+        call_command('export_participants', 'registrations', stdout=out)
+        self.assertTrue(out.getvalue().startswith('reference_code,event_id,'))
+
+
+class ProfileSummaryTests(TestCase):
+    """Tests for the aggregated, cached runner dashboard summary."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='summaryrunner', password='password123')
+        cls.profile = UserProfile.objects.get(user=cls.user)
+        today = timezone.now().date()
+        cls.events = Event.objects.bulk_create(
+            Event(
+                title=f"Summary Run {index}", slug=f"summary-run-{index}", city="Jakarta",
+                start_date=today + datetime.timedelta(days=(60 - index) if index < 7 else -30 - index),
+                registration_deadline=today + datetime.timedelta(days=5),
+            )
+            for index in range(10)
+        )
+        statuses = ['upcoming'] * 4 + ['registered'] * 3 + ['completed'] * 2 + ['dns']
+        UserRaceHistory.objects.bulk_create(
+            UserRaceHistory(
+                profile=cls.profile, event=event, category="10K", status=status,
+                registration_date=today - datetime.timedelta(days=index),
+            )
+            for index, (event, status) in enumerate(zip(cls.events, statuses))
+        )
+
+    def test_summary_counts_and_slices(self):
+        """Test one aggregate and one row query produce the counts, lists and next race."""
+        from .summary import build_profile_summary
+
+        with self.assertNumQueries(2):
+            summary = build_profile_summary(self.profile)
+
+        self.assertEqual(summary.stats, {'total_events': 10, 'completed': 2, 'upcoming': 7})
+        self.assertEqual(len(summary.upcoming_history), 5)
+        self.assertEqual(summary.upcoming_history[0].event.title, "Summary Run 0")
+        self.assertEqual([row.event.title for row in summary.completed_history], ["Summary Run 7", "Summary Run 8"])
+        # Run 6 starts soonest (60 - 6 days from now).
+        self.assertEqual(summary.next_event.event.title, "Summary Run 6")
+
+    def test_dashboard_uses_cached_summary(self):
+        """Test repeat dashboard visits skip the history queries until history changes."""
+        self.client.force_login(self.user)
+        url = reverse('profiles:dashboard')
+        self.client.get(url)
+
+        with self.assertNumQueries(5):  # session, user, profile, achievements, unread badge
+            response = self.client.get(url)
+        self.assertEqual(response.context['stats']['completed'], 2)
+
+        UserRaceHistory.objects.get(event=self.events[0]).delete()
+        response = self.client.get(url)
+        self.assertEqual(response.context['stats']['total_events'], 9)
+
+        history = UserRaceHistory.objects.get(event=self.events[1])
+        history.status = UserRaceHistory.Status.COMPLETED
+        history.save()
+        self.assertEqual(self.client.get(url).context['stats']['completed'], 3)
+
+    def test_event_edit_refreshes_summary(self):
+        """Test renaming an event is reflected in cached summaries."""
+        from .summary import get_profile_summary
+
+        get_profile_summary(self.profile)
+        event = Event.objects.get(pk=self.events[6].pk)
+        event.title = "Renamed Run"
+        event.save()
+
+        self.assertEqual(get_profile_summary(self.profile).next_event.event.title, "Renamed Run")
+
+    def test_bulk_decisions_refresh_summary(self):
+        """Test bulk registration decisions drop the affected runners' summaries."""
+        from registrations.bulk import bulk_decide
+        from registrations.models import EventRegistration
+
+        from .summary import get_profile_summary
+
+        event = Event.objects.create(
+            title="Bulk Summary Run", city="Jakarta",
+            start_date=timezone.now().date() + datetime.timedelta(days=5),
+            registration_deadline=timezone.now().date() + datetime.timedelta(days=2),
+        )
+        EventRegistration.objects.create(
+            user=self.user, event=event, distance_label="10K", phone_number='0812',
+            emergency_contact_name='Contact', emergency_contact_phone='0813',
+        )
+        self.assertEqual(get_profile_summary(self.profile).stats['upcoming'], 8)
+
+        bulk_decide(EventRegistration.objects.filter(event=event), "cancel")
+
+        self.assertEqual(get_profile_summary(self.profile).stats['upcoming'], 7)
+
+
+class RequestProfileTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='lazyrunner', password='password123')
+        cls.profile = UserProfile.objects.get(user=cls.user)
+
+    def _request(self, user):
+        from django.test import RequestFactory
+
+        from .middleware import ProfileMiddleware
+
+        request = RequestFactory().get('/')
+        request.user = user
+        ProfileMiddleware(lambda req: None)(request)
+        return request
+
+    def test_profile_is_loaded_once_per_request(self):
+        """Test request.profile costs one query and reuses request.user."""
+        request = self._request(self.user)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(request.profile.pk, self.profile.pk)
+            self.assertIs(request.profile.user, self.user)
+            self.assertEqual(request.profile.full_display_name, 'lazyrunner')
+
+    async def test_middleware_runs_natively_under_asgi(self):
+        """Test the middleware stays async in an async chain and offers request.aprofile()."""
+        from asgiref.sync import iscoroutinefunction
+        from django.test import AsyncRequestFactory
+
+        from .middleware import ProfileMiddleware
+
+        async def view(request):
+            return await request.aprofile()
+
+        middleware = ProfileMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = AsyncRequestFactory().get('/')
+        request.user = self.user
+        profile = await middleware(request)
+        self.assertEqual(profile.pk, self.profile.pk)
+
+    def test_read_endpoints_do_not_write(self):
+        """Test profile read endpoints issue no INSERT or UPDATE."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_login(self.user)
+        for name in ('profiles:dashboard', 'profiles:profile-json', 'profiles:achievements', 'registrations:mine'):
+            with self.subTest(name=name), CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+            writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+            self.assertEqual(writes, [])
+
+    def test_legacy_user_without_profile_still_gets_one(self):
+        """Test accounts missing a profile get one on first access."""
+        self.profile.delete()
+        request = self._request(User.objects.get(pk=self.user.pk))
+
+        self.assertIsNotNone(request.profile.pk)
+        self.assertTrue(UserProfile.objects.filter(user=self.user).exists())
+
+    def test_backfill_creates_missing_profiles(self):
+        """Test backfill_profiles creates only the missing profiles."""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        legacy = [User.objects.create_user(username=f'legacy{index}') for index in range(3)]
+        UserProfile.objects.filter(user__in=legacy).delete()
+
+        out = StringIO()
+        call_command('backfill_profiles', '--dry-run', stdout=out)
+        self.assertIn('3 users have no profile', out.getvalue())
+        self.assertEqual(UserProfile.objects.filter(user__in=legacy).count(), 0)
+
+        call_command('backfill_profiles', '--batch-size', '2', stdout=out)
+        self.assertIn('Created 3 missing profiles', out.getvalue())
+        self.assertEqual(UserProfile.objects.filter(user__in=legacy).count(), 3)
+        self.assertEqual(UserProfile.objects.filter(user=self.user).count(), 1)
+
+
+class BootstrapApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from notifications.models import Notification
+        from registrations.models import EventRegistration
+
+        cls.user = User.objects.create_user(username='bootrunner', password='password123')
+        today = timezone.now().date()
+        cls.events = [
+            Event.objects.create(
+                title=f"Boot Run {index}", city="Jakarta",
+                start_date=today + datetime.timedelta(days=10 + index),
+                registration_deadline=today + datetime.timedelta(days=5),
+            )
+            for index in range(3)
+        ]
+        for event in cls.events:
+            EventRegistration.objects.create(
+                user=cls.user, event=event, distance_label="10K", phone_number='0812',
+                emergency_contact_name='Contact', emergency_contact_phone='0813',
+            )
+        EventRegistration.objects.filter(event=cls.events[2]).update(status=EventRegistration.Status.CANCELLED)
+        Notification.objects.filter(recipient=cls.user).delete()
+        for index in range(15):
+            Notification.objects.create(
+                recipient=cls.user, title=f"Note {index}", message="Hello", is_read=index < 5,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('profiles:api-bootstrap')
+
+    def test_bootstrap_returns_every_section(self):
+        """Test the bootstrap bundles profile, active registrations, notifications and the catalog."""
+        data = self.client.get(self.url).json()
+
+        self.assertTrue(data['success'])
+        self.assertEqual(data['profile']['username'], 'bootrunner')
+        self.assertEqual(data['profile']['stats']['total_events'], 3)
+        self.assertEqual(
+            [row['event'] for row in data['registrations']], ["Boot Run 0", "Boot Run 1"]
+        )
+        self.assertEqual(data['notifications']['unread'], 10)
+        self.assertEqual(len(data['notifications']['results']), 10)
+        self.assertEqual(data['notifications']['results'][0]['title'], "Note 14")
+        self.assertEqual(data['events']['pagination']['total'], 3)
+
+    def test_fields_limit_the_sections_built(self):
+        """Test fields= returns only the requested sections and skips the others' queries."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as partial:
+            data = self.client.get(self.url, {'fields': 'notifications', 'notifications': 3}).json()
+
+        self.assertEqual(set(data), {'success', 'notifications'})
+        self.assertEqual(len(data['notifications']['results']), 3)
+        self.assertLess(len(partial), len(full))
+        self.assertFalse(any('registrations_eventregistration' in q['sql'] for q in partial.captured_queries))
+
+    def test_warm_bootstrap_uses_shared_caches(self):
+        """Test a repeat bootstrap reads the cached summary and catalog page."""
+        self.client.get(self.url)
+
+        # session, user, profile, registrations, notification counts, latest notifications
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+
+    def test_invalid_params_are_rejected(self):
+        """Test unknown fields and out-of-range notification limits return 400."""
+        response = self.client.get(self.url, {'fields': 'profile,wallet'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('wallet', response.json()['errors']['fields'][0])
+
+        for limit in ('abc', '-1', '500'):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.client.get(self.url, {'notifications': limit}).status_code, 400)
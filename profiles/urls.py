@@ -7,10 +7,12 @@ app_name = "profiles"
 urlpatterns = [
     path("dashboard/", views.DashboardView.as_view(), name="dashboard"),
     path("admin-dashboard/", views.AdminDashboardView.as_view(), name="admin-dashboard"),
+    path("admin-dashboard/api/stats/", views.admin_dashboard_stats_json, name="admin-dashboard-stats-json"),
     path("", views.DashboardView.as_view(), name="dashboard"),
     path("edit/", views.ProfileUpdateView.as_view(), name="edit"),
     path("settings/", views.AccountSettingsView.as_view(), name="settings"),
     path("api/profile/", views.profile_json, name="profile-json"),
+    path("api/bootstrap/", views.bootstrap_json, name="api-bootstrap"),
     path("api/achievements/", views.achievements_api, name="achievements"),
     path("api/achievements/<int:achievement_id>/", views.delete_achievement, name="achievement-delete"),
     path('register/', views.register, name='register'),
@@ -25,6 +27,11 @@ urlpatterns = [
     
     # Admin Participants
     path("admin/participants/", views.admin_participant_list, name="admin-participant-list"),
+    path("admin/participants/api/", views.admin_participants_json, name="admin-participant-list-json"),
+    path("admin/participants/bulk/", views.admin_participant_bulk, name="admin-participant-bulk"),
+    path("admin/participants/api/bulk/", views.admin_participant_bulk_json, name="admin-participant-bulk-json"),
+    path("admin/exports/start-list/", views.admin_export_start_list, name="admin-export-start-list"),
+    path("admin/exports/registrations/", views.admin_export_registrations, name="admin-export-registrations"),
     path("admin/participants/confirm/<int:participant_id>/", views.admin_participant_confirm, name="admin-participant-confirm"),
     path("admin/participants/delete/<int:participant_id>/", views.admin_participant_delete, name="admin-participant-delete"),
     
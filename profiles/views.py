@@ -1,16 +1,21 @@
 import json
 from django.template.loader import render_to_string
-from django.http import HttpResponseRedirect, JsonResponse
+from django.http import HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from forum.models import ForumThread, ForumPost, PostReport
 
+from . import bootstrap, exports, stats
+from .bibs import assign_bib_numbers
+from .summary import get_profile_summary
 from .forms import (
     EventForm,
+    ParticipantFilterForm,
     ProfileForm,
     AccountSettingsForm,
     AccountPasswordForm,
     ProfileAchievementForm,
 )
-from django.db.models import Count
+from django.core.paginator import Paginator
+from django.db.models import Exists, OuterRef, Prefetch
 from .models import UserRaceHistory, RunnerAchievement, UserProfile
 from events.models import Event, EventCategory
 from django.contrib.auth import authenticate, login, logout
@@ -25,7 +30,7 @@ from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse
-from django.views.decorators.http import require_http_methods, require_POST
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.models import User
 from django.db import IntegrityError
@@ -39,7 +44,7 @@ def admin_required(view_func):
 @login_required
 @user_passes_test(admin_required)
 def admin_event_list(request):
-    events = Event.objects.all().order_by("start_date")
+    events = Event.objects.prefetch_related("categories").order_by("start_date")
     return render(request, "profiles/admin_event_list.html", {"events": events})
 
 @login_required
@@ -115,27 +120,34 @@ class AdminDashboardView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
-        total_peserta = UserRaceHistory.objects.count()
-        total_event = Event.objects.count()
-        event_aktif = Event.objects.filter(status="upcoming").count()
-        event_selesai = Event.objects.filter(status="completed").count()
-        
-        peserta_per_event = (
-            UserRaceHistory.objects.values("event__title")
-            .annotate(total=Count("id"))
-            .order_by("-total")
-        )
-
-        context.update({
-            "total_participants": total_peserta,
-            "total_events": total_event,
-            "events_active": event_aktif,
-            "events_completed": event_selesai,
-            "participants_per_event": peserta_per_event,
-        })
+        context.update(stats.dashboard_summary())
+        context["registrations_per_day"] = stats.registrations_per_day()
+        context["series_days"] = stats.DASHBOARD_SERIES_DAYS
         return context
 
+
+@login_required
+@user_passes_test(is_admin)
+def admin_dashboard_stats_json(request):
+    try:
+        days = int(request.GET.get("days", stats.DASHBOARD_SERIES_DAYS))
+        event_id = int(request.GET["event"]) if request.GET.get("event") else None
+    except ValueError:
+        return JsonResponse({"success": False, "errors": {"params": ["days and event must be integers."]}}, status=400)
+    if not 1 <= days <= 366:
+        return JsonResponse({"success": False, "errors": {"days": ["Expected 1 to 366 days."]}}, status=400)
+
+    summary = stats.dashboard_summary()
+    series = stats.registrations_per_day(days, event_id=event_id)
+    return JsonResponse({
+        "success": True,
+        "summary": summary,
+        "registrations_per_day": [
+            {"day": row["day"].isoformat(), "registrations": row["registrations"]} for row in series
+        ],
+    })
+
+
 def register(request):
     if request.method == 'POST':
         form = UserCreationForm(request.POST)
@@ -165,26 +177,17 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
-        history = (
-            profile.history.select_related("event")
-            .order_by("-registration_date")
-        )
-        upcoming = history.filter(status__in=["upcoming", "registered"])
-        completed = history.filter(status="completed")
+        profile = self.request.profile
+        summary = get_profile_summary(profile)
 
         context.update(
             {
                 "profile": profile,
-                "upcoming_history": upcoming[:5],
-                "completed_history": completed[:5],
+                "upcoming_history": summary.upcoming_history,
+                "completed_history": summary.completed_history,
                 "achievements": profile.achievements.all(),
-                "stats": {
-                    "total_events": history.count(),
-                    "completed": completed.count(),
-                    "upcoming": upcoming.count(),
-                },
-                "next_event": upcoming.order_by("event__start_date").first(),
+                "stats": summary.stats,
+                "next_event": summary.next_event,
             }
         )
         return context
@@ -196,8 +199,7 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     template_name = "profiles/profile_form.html"
 
     def get_object(self, queryset=None):
-        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
-        return profile
+        return self.request.profile
 
     def form_valid(self, form):
         messages.success(self.request, "Profile updated successfully.")
@@ -212,8 +214,7 @@ class AccountSettingsView(LoginRequiredMixin, TemplateView):
 
     def get_forms(self):
         user = self.request.user
-        profile, _ = UserProfile.objects.get_or_create(user=user)
-        profile_form = ProfileForm(instance=profile, prefix="profile")
+        profile_form = ProfileForm(instance=self.request.profile, prefix="profile")
         account_form = AccountSettingsForm(instance=user, prefix="account")
         password_form = AccountPasswordForm(user, prefix="password")
         return profile_form, account_form, password_form
@@ -222,18 +223,17 @@ class AccountSettingsView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         forms = kwargs.get("forms") or self.get_forms()
         context["profile_form"], context["account_form"], context["password_form"] = forms
-        context["achievements"] = self.request.user.profile.achievements.all()
+        context["achievements"] = self.request.profile.achievements.all()
         context["achievement_form"] = ProfileAchievementForm(prefix="achievement")
         return context
 
     def post(self, request, *args, **kwargs):
         action = request.POST.get("action")
         user = request.user
-        profile, _ = UserProfile.objects.get_or_create(user=user)
 
         profile_form = ProfileForm(
             data=request.POST if action == "profile" else None,
-            instance=profile,
+            instance=request.profile,
             prefix="profile",
         )
         account_form = AccountSettingsForm(
@@ -275,7 +275,7 @@ class AccountSettingsView(LoginRequiredMixin, TemplateView):
 @login_required
 @require_http_methods(["GET"])
 def profile_json(request):
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = request.profile
     history = profile.history.select_related("event")
 
     data = {
@@ -326,10 +326,36 @@ def profile_json(request):
     return JsonResponse(data)
 
 
+@login_required
+@require_GET
+def bootstrap_json(request):
+    """Everything the mobile app loads on launch, in one response (see ``profiles.bootstrap``)."""
+
+    try:
+        sections = bootstrap.parse_sections(request.GET)
+    except ValueError as exc:
+        return JsonResponse({"success": False, "errors": {"fields": [str(exc)]}}, status=400)
+    try:
+        limit = int(request.GET.get("notifications", bootstrap.NOTIFICATION_LIMIT))
+    except ValueError:
+        limit = -1
+    if not 0 <= limit <= bootstrap.MAX_NOTIFICATION_LIMIT:
+        return JsonResponse(
+            {
+                "success": False,
+                "errors": {"notifications": [f"Expected 0 to {bootstrap.MAX_NOTIFICATION_LIMIT} notifications."]},
+            },
+            status=400,
+        )
+
+    payload = bootstrap.build_bootstrap(request, sections, notification_limit=limit)
+    return JsonResponse({"success": True, **payload})
+
+
 @login_required
 @require_http_methods(["GET", "POST"])
 def achievements_api(request):
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = request.profile
     if request.method == "GET":
         achievements = [
             {
@@ -375,25 +401,197 @@ def achievements_api(request):
 @login_required
 @require_http_methods(["DELETE"])
 def delete_achievement(request, achievement_id):
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = request.profile
     achievement = get_object_or_404(RunnerAchievement, pk=achievement_id, profile=profile)
     achievement.delete()
     return JsonResponse({"success": True})
 
 
+PARTICIPANTS_PER_PAGE = 50
+
+
+def _participant_page(params):
+    filter_form = ParticipantFilterForm(params or None)
+    participants = filter_form.filter_queryset(
+        UserRaceHistory.objects.select_related('profile__user', 'event')
+    ).order_by('-registration_date', '-id')
+    paginator = Paginator(participants, PARTICIPANTS_PER_PAGE)
+    page_obj = paginator.get_page(params.get('page') or 1)
+    return filter_form, paginator, page_obj
+
+
 @login_required
 @user_passes_test(is_admin)
 def admin_participant_list(request):
-    participants = UserRaceHistory.objects.select_related(
-        'profile__user', 'event'
-    ).all().order_by('-registration_date')
-    
+    filter_form, paginator, page_obj = _participant_page(request.GET)
     context = {
-        'participants': participants,
+        'participants': page_obj.object_list,
+        'filter_form': filter_form,
+        'page_obj': page_obj,
+        'paginator': paginator,
     }
     return render(request, 'profiles/admin_participant_list.html', context)
 
 
+@login_required
+@user_passes_test(is_admin)
+@require_GET
+def admin_participants_json(request):
+    filter_form, paginator, page_obj = _participant_page(request.GET)
+    if filter_form.is_bound and not filter_form.is_valid():
+        return JsonResponse({"success": False, "errors": filter_form.errors}, status=400)
+
+    results = [
+        {
+            "id": participant.id,
+            "user_id": participant.profile.user_id,
+            "username": participant.profile.user.username,
+            "display_name": participant.profile.full_display_name,
+            "email": participant.profile.user.email,
+            "event": participant.event_id,
+            "event_title": participant.event.title,
+            "category": participant.category,
+            "status": participant.status,
+            "status_display": participant.get_status_display(),
+            "bib_number": participant.bib_number,
+            "registration_date": participant.registration_date.isoformat(),
+            "finish_time": str(participant.finish_time) if participant.finish_time else None,
+        }
+        for participant in page_obj.object_list
+    ]
+    return JsonResponse({
+        "results": results,
+        "pagination": {
+            "page": page_obj.number,
+            "pages": paginator.num_pages,
+            "has_next": page_obj.has_next(),
+            "has_previous": page_obj.has_previous(),
+            "total": paginator.count,
+        },
+    })
+
+
+def _bulk_target_registrations(participants):
+    from registrations.models import EventRegistration
+
+    return EventRegistration.objects.filter(
+        Exists(participants.filter(profile__user=OuterRef("user"), event=OuterRef("event")))
+    )
+
+
+def _bulk_participants(params, participant_ids, select_all_matching):
+    """Participants selected by id, or every participant matching the list filters."""
+
+    if select_all_matching:
+        filter_form = ParticipantFilterForm(params)
+        if not filter_form.is_valid():
+            return None, filter_form.errors
+        return filter_form.filter_queryset(UserRaceHistory.objects.all()), None
+    try:
+        ids = [int(pk) for pk in participant_ids]
+    except (TypeError, ValueError):
+        return None, {"participant_ids": ["Participant ids must be integers."]}
+    if not ids:
+        return None, {"participant_ids": ["Select at least one participant."]}
+    return UserRaceHistory.objects.filter(pk__in=ids), None
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def admin_participant_bulk(request):
+    from registrations.bulk import TRANSITIONS, bulk_decide
+
+    action = request.POST.get("action")
+    participants, errors = _bulk_participants(
+        request.POST,
+        request.POST.getlist("participant_ids"),
+        request.POST.get("select_all_matching") == "1",
+    )
+    if action not in TRANSITIONS:
+        messages.error(request, "Choose an action to apply.")
+    elif errors:
+        messages.error(request, " ".join(str(error) for error_list in errors.values() for error in error_list))
+    else:
+        result = bulk_decide(
+            _bulk_target_registrations(participants), action, note=request.POST.get("note", "").strip()
+        )
+        messages.success(
+            request,
+            f"{result.updated} registration{'s' if result.updated != 1 else ''} updated "
+            f"({action}), {result.skipped} skipped.",
+        )
+    return redirect(f"{reverse('profiles:admin-participant-list')}?{request.POST.get('return_query', '')}")
+
+
+# Session-authenticated bulk mutation: unlike the mobile endpoints it keeps
+# CSRF protection, so clients send the ``csrftoken`` cookie as X-CSRFToken.
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def admin_participant_bulk_json(request):
+    from registrations.bulk import TRANSITIONS, bulk_decide
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"success": False, "errors": {"body": ["Invalid JSON."]}}, status=400)
+
+    action = data.get("action")
+    if action not in TRANSITIONS:
+        return JsonResponse(
+            {"success": False, "errors": {"action": [f"Expected one of {', '.join(TRANSITIONS)}."]}},
+            status=400,
+        )
+    filters = data.get("filter")
+    participants, errors = _bulk_participants(
+        filters if isinstance(filters, dict) else {},
+        data.get("participant_ids") or [],
+        isinstance(filters, dict),
+    )
+    if errors:
+        return JsonResponse({"success": False, "errors": errors}, status=400)
+
+    result = bulk_decide(_bulk_target_registrations(participants), action, note=str(data.get("note", "")).strip())
+    return JsonResponse({"success": True, **result.as_dict()})
+
+
+def _export_response(request, name):
+    spec = exports.EXPORTS[name]
+    export_format = request.GET.get("format", "csv")
+    if export_format not in exports.CONTENT_TYPES:
+        return JsonResponse(
+            {"success": False, "errors": {"format": [f"Expected one of {', '.join(exports.CONTENT_TYPES)}."]}},
+            status=400,
+        )
+    filter_form = spec.form_class(request.GET)
+    if not filter_form.is_valid():
+        return JsonResponse({"success": False, "errors": filter_form.errors}, status=400)
+
+    response = StreamingHttpResponse(
+        exports.export_stream(spec, filter_form, export_format),
+        content_type=exports.CONTENT_TYPES[export_format],
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{exports.export_filename(spec, filter_form, export_format)}"'
+    )
+    return response
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_GET
+def admin_export_start_list(request):
+    return _export_response(request, "start-list")
+
+
+@login_required
+@user_passes_test(is_admin)
+@require_GET
+def admin_export_registrations(request):
+    return _export_response(request, "registrations")
+
+
 @login_required
 @user_passes_test(is_admin)
 def admin_participant_confirm(request, participant_id):
@@ -401,9 +599,7 @@ def admin_participant_confirm(request, participant_id):
         participant = get_object_or_404(UserRaceHistory, id=participant_id)
         participant.status = UserRaceHistory.Status.UPCOMING  # Changed to UPCOMING to match CONFIRMED sync
         # Generate BIB number kalau belum ada
-        if not participant.bib_number:
-            import random
-            participant.bib_number = f"{participant.event.id}{participant.profile.user.id}{random.randint(100, 999)}"
+        assign_bib_numbers([participant])
         participant.save()
 
         # Also update the EventRegistration status to CONFIRMED
@@ -459,24 +655,32 @@ def admin_forum(request):
         'post__author',
         'post__thread__event',
         'reporter'
-    ).prefetch_related('post__reports').order_by('-created_at')
+    ).prefetch_related(
+        Prefetch(
+            'post__reports',
+            queryset=PostReport.objects.filter(resolved=False).select_related('reporter'),
+            to_attr='open_reports',
+        )
+    ).order_by('-created_at')
     
     posts_with_reports = []
     seen_posts = set()
+    total_reports = 0
     
     for report in reported_posts:
+        total_reports += 1
         post = report.post
         if post.id not in seen_posts:
             seen_posts.add(post.id)
             posts_with_reports.append({
                 'post': post,
                 'thread': post.thread,
-                'reports': post.reports.filter(resolved=False)
+                'reports': post.open_reports
             })
     
     context = {
         'posts': posts_with_reports,
-        'total_reports': reported_posts.count(),
+        'total_reports': total_reports,
     }
     return render(request, 'profiles/admin_forum.html', context)
 
@@ -592,7 +796,7 @@ def user_profile_json(request):
     if not request.user.is_authenticated:
         return JsonResponse({"status": False, "message": "Belum login"}, status=401)
 
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = request.profile
     
     # Format JSON sesuai UserProfile.fromJson di Flutter
     return JsonResponse({
@@ -625,7 +829,7 @@ def update_profile_json(request):
     try:
         data = json.loads(request.body)
         user = request.user
-        profile, _ = UserProfile.objects.get_or_create(user=user)
+        profile = request.profile
 
         # Update User fields (jika ada)
         # user.first_name = data.get('first_name', user.first_name)
@@ -0,0 +1,173 @@
+"""
+Bulk registration decisions for admins.
+
+``bulk_decide`` applies one transition (confirm, reject or cancel) to a
+whole queryset of registrations in a fixed number of queries: rows are
+locked and updated with ``bulk_update``, race history rows are synced in
+bulk, confirmed runners get BIB numbers, every affected event's counter is
+recomputed once, and all notifications are inserted in one batch. Slots
+freed by rejections and cancellations go to the waitlist after the commit.
+
+It deliberately bypasses ``EventRegistration.save()``; keep the side
+effects here in step with it.
+"""
+
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from events.models import Event
+from notifications.utils import build_notification, send_notifications
+from profiles.bibs import assign_bib_numbers
+from profiles.models import UserProfile, UserRaceHistory
+from profiles.stats import track_history_changes
+from profiles.summary import invalidate_profile_summaries
+
+from .models import EventRegistration, refresh_event_counters
+from .waitlist import schedule_promotion
+
+Status = EventRegistration.Status
+
+# action -> (target status, statuses it may be applied to)
+TRANSITIONS = {
+    "confirm": (Status.CONFIRMED, {Status.PENDING, Status.WAITLISTED}),
+    "reject": (Status.REJECTED, {Status.PENDING, Status.WAITLISTED}),
+    "cancel": (Status.CANCELLED, {Status.PENDING, Status.CONFIRMED, Status.WAITLISTED}),
+}
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class BulkDecisionResult:
+    action: str
+    updated: int = 0
+    skipped: int = 0
+    bibs_assigned: int = 0
+    notified: int = 0
+    event_ids: list = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "action": self.action,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "bibs_assigned": self.bibs_assigned,
+            "notified": self.notified,
+            "events": self.event_ids,
+        }
+
+
+def bulk_decide(registrations, action: str, *, note: str = "") -> BulkDecisionResult:
+    if action not in TRANSITIONS:
+        raise ValueError(f"Unknown action {action!r}; expected one of {', '.join(TRANSITIONS)}.")
+    target, allowed = TRANSITIONS[action]
+    result = BulkDecisionResult(action=action)
+
+    with transaction.atomic():
+        # Lock the events first (BIB numbering and counters are per event),
+        # then the registrations themselves.
+        event_ids = sorted(set(registrations.values_list("event_id", flat=True)))
+        list(Event.objects.select_for_update().filter(pk__in=event_ids).values_list("pk", flat=True))
+        rows = list(
+            registrations.select_for_update(of=("self",))
+            .select_related("user", "event", "category")
+            .order_by("created_at", "pk")
+        )
+
+        now = timezone.now()
+        changed = []
+        frees_slots = target not in EventRegistration.SLOT_STATUSES
+        freed_event_ids = set()
+        for registration in rows:
+            if registration.status not in allowed:
+                result.skipped += 1
+                continue
+            if frees_slots and registration.status in EventRegistration.SLOT_STATUSES:
+                freed_event_ids.add(registration.event_id)
+            registration.status = target
+            if target == Status.CONFIRMED and not registration.confirmed_at:
+                registration.confirmed_at = now
+            if target == Status.CANCELLED and not registration.cancelled_at:
+                registration.cancelled_at = now
+            if note:
+                registration.decision_note = note
+            registration.updated_at = now
+            changed.append(registration)
+
+        if not changed:
+            return result
+
+        EventRegistration.objects.bulk_update(
+            changed,
+            ["status", "confirmed_at", "cancelled_at", "decision_note", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
+        to_update, to_create = _sync_histories(changed, now)
+        if target == Status.CONFIRMED:
+            result.bibs_assigned = len(assign_bib_numbers(to_update + to_create))
+        UserRaceHistory.objects.bulk_update(
+            to_update, ["status", "bib_number", "updated_at"], batch_size=BATCH_SIZE
+        )
+        UserRaceHistory.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        track_history_changes(to_update + to_create)
+        invalidate_profile_summaries(history.profile_id for history in to_update + to_create)
+
+        result.event_ids = sorted({registration.event_id for registration in changed})
+        refresh_event_counters(result.event_ids)
+        schedule_promotion(freed_event_ids)
+
+        notifications = [
+            build_notification(**registration.decision_notification()) for registration in changed
+        ]
+        send_notifications(notifications, batch_size=BATCH_SIZE)
+
+        result.updated = len(changed)
+        result.notified = len(notifications)
+    return result
+
+
+def _sync_histories(registrations, now):
+    """
+    Bulk equivalent of ``EventRegistration.sync_history``: return the
+    ``(to_update, to_create)`` history rows for ``registrations``, unsaved.
+    """
+
+    user_ids = {registration.user_id for registration in registrations}
+    profiles = {profile.user_id: profile for profile in UserProfile.objects.filter(user_id__in=user_ids)}
+    missing = user_ids - profiles.keys()
+    if missing:
+        UserProfile.objects.bulk_create([UserProfile(user_id=user_id) for user_id in missing], ignore_conflicts=True)
+        profiles.update(
+            (profile.user_id, profile) for profile in UserProfile.objects.filter(user_id__in=missing)
+        )
+
+    existing = {
+        (history.profile_id, history.event_id, history.category): history
+        for history in UserRaceHistory.objects.filter(
+            profile_id__in=[profile.pk for profile in profiles.values()],
+            event_id__in={registration.event_id for registration in registrations},
+        )
+    }
+
+    to_update, to_create = [], []
+    for registration in registrations:
+        profile = profiles[registration.user_id]
+        key = (profile.pk, registration.event_id, registration.history_category)
+        status = EventRegistration.history_status_for(registration.status)
+        history = existing.get(key)
+        if history is None:
+            history = UserRaceHistory(
+                profile=profile,
+                event_id=registration.event_id,
+                category=registration.history_category,
+                registration_date=now.date(),
+                status=status,
+            )
+            to_create.append(history)
+        else:
+            history.status = status
+            history.updated_at = now
+            to_update.append(history)
+    return to_update, to_create
@@ -1,4 +1,5 @@
 from django import forms
+from django.db.models import Count, Q
 
 from events.models import Event, EventCategory
 from .models import EventRegistration
@@ -55,19 +56,19 @@ class RegistrationForm(forms.ModelForm):
             raise forms.ValidationError("You have already registered for this event.")
 
         participant_limit = self.event.participant_limit or 0
-        if participant_limit:
-            active_qs = EventRegistration.objects.filter(
-                event=self.event,
-                status__in=[
-                    EventRegistration.Status.PENDING,
-                    EventRegistration.Status.CONFIRMED,
-                    EventRegistration.Status.WAITLISTED,
-                ],
+        holds_slot = (
+            not self.instance._state.adding and self.instance.status in EventRegistration.SLOT_STATUSES
+        )
+        if participant_limit and not holds_slot:
+            # Same slot definition as the waitlist promoter; while anyone is
+            # queued, new signups join the back of the queue instead of
+            # taking a freed slot ahead of them.
+            others = EventRegistration.objects.filter(event=self.event).exclude(pk=self.instance.pk)
+            counts = others.aggregate(
+                taken=Count("pk", filter=Q(status__in=EventRegistration.SLOT_STATUSES)),
+                queued=Count("pk", filter=Q(status=EventRegistration.Status.WAITLISTED)),
             )
-            if self.instance.pk:
-                active_qs = active_qs.exclude(pk=self.instance.pk)
-            active_registrations = active_qs.count()
-            if active_registrations >= participant_limit:
+            if counts["queued"] or counts["taken"] >= participant_limit:
                 cleaned["waitlisted"] = True
         if not cleaned.get("category") and self.fields["category"].required:
             self.add_error("category", "Please select an available distance.")
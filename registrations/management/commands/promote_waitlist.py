@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from registrations.waitlist import PROMOTION_BATCH_SIZE, promote_waitlist
+
+
+class Command(BaseCommand):
+    help = "Promote waitlisted registrations into free event slots, oldest first."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="events",
+            help="Only promote for this event id (repeatable; default: every event with a waitlist).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PROMOTION_BATCH_SIZE,
+            help=f"Registrations promoted per locked batch (default: {PROMOTION_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        promoted = promote_waitlist(options["events"], batch_size=options["batch_size"])
+        for event_id, count in promoted.items():
+            self.stdout.write(f"Event {event_id}: promoted {count}.")
+        self.stdout.write(
+            self.style.SUCCESS(f"Promoted {sum(promoted.values())} registrations across {len(promoted)} events.")
+        )
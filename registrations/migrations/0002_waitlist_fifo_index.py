@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_import_ledger'),
+        ('registrations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='eventregistration',
+            name='registratio_event_i_751879_idx',
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['event', 'status', 'created_at'], name='registratio_event_i_c5a36a_idx'),
+        ),
+    ]
@@ -4,7 +4,9 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from core.page_cache import invalidate_event_pages
 from events.models import Event, EventCategory
+from profiles.bibs import assign_bib_numbers
 from profiles.models import UserProfile, UserRaceHistory
 
 
@@ -23,6 +25,26 @@ class EventRegistration(models.Model):
         PAID = "paid", "Paid"
         REFUNDED = "refunded", "Refunded"
 
+    ACTIVE_STATUSES = (Status.PENDING, Status.CONFIRMED, Status.WAITLISTED)
+    # Statuses that take one of the event's ``participant_limit`` slots.
+    SLOT_STATUSES = (Status.PENDING, Status.CONFIRMED)
+
+    # (title, message) sent when an existing registration moves to the status.
+    DECISION_NOTIFICATIONS = {
+        Status.CONFIRMED: (
+            "You're confirmed for {event}",
+            "See your registration summary for race-day details.",
+        ),
+        Status.REJECTED: (
+            "Registration update for {event}",
+            "We were unable to confirm your registration. Contact support for more details.",
+        ),
+        Status.CANCELLED: (
+            "Registration cancelled - {event}",
+            "Your registration has been cancelled. If this is unexpected please reach out.",
+        ),
+    }
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     reference_code = models.CharField(max_length=18, unique=True, editable=False)
     user = models.ForeignKey(
@@ -67,7 +89,7 @@ class EventRegistration(models.Model):
         ordering = ["-created_at"]
         unique_together = ("user", "event")
         indexes = [
-            models.Index(fields=["event", "status"]),
+            models.Index(fields=["event", "status", "created_at"]),
             models.Index(fields=["user", "status"]),
         ]
 
@@ -96,55 +118,68 @@ class EventRegistration(models.Model):
         super().save(*args, **kwargs)
         self.sync_history()
         self.update_event_counter()
+        if previous_status in self.SLOT_STATUSES and self.status not in self.SLOT_STATUSES:
+            self._schedule_promotion()
+        elif is_new and self.status == self.Status.WAITLISTED:
+            # Queued behind others while a slot may be free (promotion off or
+            # the limit raised): let the promoter fill it in FIFO order.
+            self._schedule_promotion()
         self._dispatch_notifications(is_new=is_new, old_status=previous_status, old_payment=previous_payment_status)
 
     def delete(self, *args, **kwargs):
         super().delete(*args, **kwargs)
         self.update_event_counter()
+        if self.status in self.SLOT_STATUSES:
+            self._schedule_promotion()
+
+    def _schedule_promotion(self):
+        from .waitlist import schedule_promotion
+
+        schedule_promotion([self.event_id])
 
     def update_event_counter(self):
-        active_statuses = [
-            self.Status.PENDING,
-            self.Status.CONFIRMED,
-            self.Status.WAITLISTED,
-        ]
-        count = EventRegistration.objects.filter(
-            event=self.event, status__in=active_statuses
-        ).count()
-        Event.objects.filter(pk=self.event.pk).update(registered_count=count)
+        refresh_event_counters([self.event_id])
 
-    def sync_history(self):
-        profile, _ = UserProfile.objects.get_or_create(user=self.user)
+    @property
+    def history_category(self) -> str:
         distance_label = self.category.display_name if self.category else self.distance_label
-        if not distance_label:
-            distance_label = "Open Category"
-        history, _ = UserRaceHistory.objects.get_or_create(
-            profile=profile,
-            event=self.event,
-            category=distance_label,
-            defaults={
-                "status": UserRaceHistory.Status.REGISTERED,
-                "registration_date": timezone.now().date(),
-            },
-        )
+        return distance_label or "Open Category"
 
-        if self.status == self.Status.CONFIRMED:
-            history.status = UserRaceHistory.Status.UPCOMING
-        elif self.status == self.Status.CANCELLED:
-            history.status = UserRaceHistory.Status.DNS
-        elif self.status == self.Status.REJECTED:
-            history.status = UserRaceHistory.Status.DNS
-        else:
-            history.status = UserRaceHistory.Status.REGISTERED
-        history.save(update_fields=["status", "updated_at"])
+    @classmethod
+    def history_status_for(cls, status: str) -> str:
+        if status == cls.Status.CONFIRMED:
+            return UserRaceHistory.Status.UPCOMING
+        if status in (cls.Status.CANCELLED, cls.Status.REJECTED):
+            return UserRaceHistory.Status.DNS
+        return UserRaceHistory.Status.REGISTERED
+
+    def sync_history(self):
+        # Look the row up through the user id; the profile is only needed
+        # (and only created for legacy accounts) when the row is new.
+        history = UserRaceHistory.objects.filter(
+            profile__user_id=self.user_id, event_id=self.event_id, category=self.history_category
+        ).first()
+        if history is None:
+            profile, _ = UserProfile.objects.get_or_create(user_id=self.user_id)
+            history, _ = UserRaceHistory.objects.get_or_create(
+                profile=profile,
+                event_id=self.event_id,
+                category=self.history_category,
+                defaults={
+                    "status": UserRaceHistory.Status.REGISTERED,
+                    "registration_date": timezone.now().date(),
+                },
+            )
+        history.status = self.history_status_for(self.status)
+        update_fields = ["status", "updated_at"]
+        if history.status == UserRaceHistory.Status.UPCOMING and not history.bib_number:
+            assign_bib_numbers([history])
+            update_fields.append("bib_number")
+        history.save(update_fields=update_fields)
 
     @property
     def is_active(self) -> bool:
-        return self.status in {
-            self.Status.PENDING,
-            self.Status.CONFIRMED,
-            self.Status.WAITLISTED,
-        }
+        return self.status in self.ACTIVE_STATUSES
 
     @property
     def is_confirmed(self) -> bool:
@@ -181,33 +216,9 @@ class EventRegistration(models.Model):
             return
 
         if old_status and old_status != self.status:
-            if self.status == self.Status.CONFIRMED:
-                send_notification(
-                    recipient=self.user,
-                    title=f"You're confirmed for {self.event.title}",
-                    message="See your registration summary for race-day details.",
-                    category=Notification.Category.REGISTRATION,
-                    url_name="registrations:detail",
-                    url_kwargs=detail_kwargs,
-                )
-            elif self.status == self.Status.REJECTED:
-                send_notification(
-                    recipient=self.user,
-                    title=f"Registration update for {self.event.title}",
-                    message="We were unable to confirm your registration. Contact support for more details.",
-                    category=Notification.Category.REGISTRATION,
-                    url_name="registrations:detail",
-                    url_kwargs=detail_kwargs,
-                )
-            elif self.status == self.Status.CANCELLED:
-                send_notification(
-                    recipient=self.user,
-                    title=f"Registration cancelled - {self.event.title}",
-                    message="Your registration has been cancelled. If this is unexpected please reach out.",
-                    category=Notification.Category.REGISTRATION,
-                    url_name="registrations:detail",
-                    url_kwargs=detail_kwargs,
-                )
+            notification = self.decision_notification()
+            if notification:
+                send_notification(**notification)
 
         if (
             old_payment
@@ -222,3 +233,43 @@ class EventRegistration(models.Model):
                 url_name="registrations:detail",
                 url_kwargs=detail_kwargs,
             )
+
+    def decision_notification(self) -> dict | None:
+        """``send_notification`` kwargs announcing the current status, if it is a decision."""
+
+        from notifications.models import Notification
+
+        template = self.DECISION_NOTIFICATIONS.get(self.status)
+        if template is None:
+            return None
+        title, message = template
+        return {
+            "recipient": self.user,
+            "title": title.format(event=self.event.title),
+            "message": message,
+            "category": Notification.Category.REGISTRATION,
+            "url_name": "registrations:detail",
+            "url_kwargs": {"reference": self.reference_code},
+        }
+
+
+def refresh_event_counters(event_ids) -> None:
+    """
+    Recompute ``Event.registered_count`` (taken slots, see ``SLOT_STATUSES``)
+    for ``event_ids`` with one aggregate query.
+    """
+
+    event_ids = set(event_ids)
+    if not event_ids:
+        return
+    counts = dict(
+        EventRegistration.objects.filter(
+            event_id__in=event_ids, status__in=EventRegistration.SLOT_STATUSES
+        )
+        .values_list("event_id")
+        .annotate(total=models.Count("pk"))
+        .order_by()
+    )
+    for event_id in event_ids:
+        Event.objects.filter(pk=event_id).update(registered_count=counts.get(event_id, 0))
+    invalidate_event_pages()
@@ -1,5 +1,7 @@
 import json # Ditambahkan untuk tes JSON view
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, NoReverseMatch # Tambahkan NoReverseMatch
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -396,3 +398,238 @@ class RegistrationViewTests(TestCase):
 
     # Tes untuk register_ajax bisa ditambahkan jika fitur itu aktif digunakan
 
+
+class BulkDecisionTests(TestCase):
+    """Tests for bulk confirm / reject / cancel of registrations."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = EventCategory.objects.create(name="21K", distance_km=21.1, display_name="Half Marathon")
+        cls.events = [
+            Event.objects.create(
+                title=f"Bulk Event {index}",
+                city="Jakarta",
+                start_date=timezone.now().date() + datetime.timedelta(days=30),
+                registration_deadline=timezone.now().date() + datetime.timedelta(days=15),
+            )
+            for index in range(2)
+        ]
+        cls.users = [User.objects.create_user(username=f'bulkrunner{index}') for index in range(6)]
+
+    def setUp(self):
+        self.registrations = [
+            EventRegistration.objects.create(
+                user=user,
+                event=self.events[index % 2],
+                category=self.category,
+                phone_number='0812',
+                emergency_contact_name='Contact',
+                emergency_contact_phone='0813',
+            )
+            for index, user in enumerate(self.users)
+        ]
+        self.registrations[5].status = EventRegistration.Status.REJECTED
+        self.registrations[5].save()
+
+    def _notifications(self, title_prefix):
+        from notifications.models import Notification
+
+        return Notification.objects.filter(title__startswith=title_prefix)
+
+    def test_bulk_confirm_updates_history_bibs_and_notifications(self):
+        """Test confirming many registrations syncs history, numbers BIBs and notifies once each."""
+        from profiles.models import UserRaceHistory
+        from registrations.bulk import bulk_decide
+
+        result = bulk_decide(EventRegistration.objects.all(), "confirm", note="Welcome aboard")
+
+        self.assertEqual((result.updated, result.skipped, result.bibs_assigned), (5, 1, 5))
+        self.assertEqual(result.event_ids, sorted(event.pk for event in self.events))
+        confirmed = EventRegistration.objects.filter(status=EventRegistration.Status.CONFIRMED)
+        self.assertEqual(confirmed.count(), 5)
+        self.assertFalse(confirmed.filter(confirmed_at__isnull=True).exists())
+        self.assertEqual(set(confirmed.values_list('decision_note', flat=True)), {"Welcome aboard"})
+
+        histories = UserRaceHistory.objects.filter(status=UserRaceHistory.Status.UPCOMING)
+        self.assertEqual(histories.count(), 5)
+        for event in self.events:
+            bibs = sorted(int(bib) for bib in histories.filter(event=event).values_list('bib_number', flat=True))
+            self.assertEqual(bibs, list(range(1, len(bibs) + 1)))
+        self.assertEqual(self._notifications("You're confirmed").count(), 5)
+
+    def test_bulk_cancel_recomputes_counters_once_per_event(self):
+        """Test event counters reflect the new statuses after a bulk cancel."""
+        from registrations.bulk import bulk_decide
+
+        self.assertEqual(Event.objects.get(pk=self.events[0].pk).registered_count, 3)
+
+        bulk_decide(EventRegistration.objects.filter(event=self.events[0]), "cancel")
+
+        self.assertEqual(Event.objects.get(pk=self.events[0].pk).registered_count, 0)
+        self.assertEqual(Event.objects.get(pk=self.events[1].pk).registered_count, 2)
+        self.assertFalse(
+            EventRegistration.objects.filter(event=self.events[0], cancelled_at__isnull=True).exists()
+        )
+
+    def test_query_count_does_not_grow_with_selection(self):
+        """Test a bulk decision across the same events costs the same queries for 2 or 3 registrations."""
+        from profiles.models import EventStatusStat
+        from registrations.bulk import bulk_decide
+
+        # Rollup rows are created on first use; start with them in place.
+        EventStatusStat.objects.bulk_create(
+            (EventStatusStat(event=event, status='dns') for event in self.events), ignore_conflicts=True
+        )
+        with CaptureQueriesContext(connection) as one:
+            bulk_decide(EventRegistration.objects.filter(pk__in=[reg.pk for reg in self.registrations[:2]]), "reject")
+        with self.assertNumQueries(len(one.captured_queries)):
+            bulk_decide(EventRegistration.objects.filter(pk__in=[reg.pk for reg in self.registrations[2:5]]), "reject")
+
+    def test_unknown_action_is_rejected(self):
+        """Test bulk_decide refuses actions without a transition."""
+        from registrations.bulk import bulk_decide
+
+        with self.assertRaises(ValueError):
+            bulk_decide(EventRegistration.objects.all(), "approve")
+
+
+class WaitlistPromotionTests(TestCase):
+    """Tests for promoting waitlisted registrations when slots free up."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = Event.objects.create(
+            title="Capped Run",
+            city="Jakarta",
+            start_date=timezone.now().date() + datetime.timedelta(days=30),
+            registration_deadline=timezone.now().date() + datetime.timedelta(days=15),
+            participant_limit=2,
+        )
+
+    def setUp(self):
+        base = timezone.now() - datetime.timedelta(days=1)
+        statuses = ['pending', 'confirmed', 'waitlisted', 'waitlisted', 'waitlisted']
+        self.registrations = []
+        for index, status in enumerate(statuses):
+            registration = EventRegistration.objects.create(
+                user=User.objects.create_user(username=f'waitrunner{index}'),
+                event=self.event,
+                status=status,
+                phone_number='0812',
+                emergency_contact_name='Contact',
+                emergency_contact_phone='0813',
+            )
+            # Queue order is created_at, oldest first; the last waitlisted row joined first.
+            created_at = base + datetime.timedelta(minutes=index if index < 4 else -10)
+            EventRegistration.objects.filter(pk=registration.pk).update(created_at=created_at)
+            self.registrations.append(registration)
+        self.pending, self.confirmed, self.second, self.third, self.first = self.registrations
+
+    def _status(self, registration):
+        return EventRegistration.objects.get(pk=registration.pk).status
+
+    def _promotion_notifications(self):
+        from notifications.models import Notification
+
+        return Notification.objects.filter(title__startswith="A spot opened up")
+
+    def test_cancellation_promotes_oldest_waitlisted(self):
+        """Test cancelling a slot holder promotes the earliest waitlisted registration after commit."""
+        self.confirmed.status = EventRegistration.Status.CANCELLED
+        with self.captureOnCommitCallbacks(execute=True):
+            self.confirmed.save()
+
+        self.assertEqual(self._status(self.first), 'pending')
+        self.assertEqual(self._status(self.second), 'waitlisted')
+        self.assertEqual(self._status(self.third), 'waitlisted')
+        recipients = self._promotion_notifications().values_list('recipient__username', flat=True)
+        self.assertEqual(list(recipients), ['waitrunner4'])
+
+    def test_deleting_a_slot_holder_promotes(self):
+        """Test deleting a pending registration frees its slot for the waitlist."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pending.delete()
+
+        self.assertEqual(self._status(self.first), 'pending')
+
+    def test_waitlisted_cancellation_does_not_promote(self):
+        """Test leaving the waitlist frees no slot and schedules nothing."""
+        self.second.status = EventRegistration.Status.CANCELLED
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.second.save()
+
+        self.assertEqual(callbacks, [])
+
+    def test_bulk_cancel_promotes_in_fifo_batches(self):
+        """Test a bulk cancel fills every freed slot in queue order, one batch at a time."""
+        from registrations.bulk import bulk_decide
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_decide(EventRegistration.objects.filter(pk__in=[self.pending.pk, self.confirmed.pk]), "cancel")
+
+        self.assertEqual(
+            [self._status(registration) for registration in (self.first, self.second, self.third)],
+            ['pending', 'pending', 'waitlisted'],
+        )
+        self.assertEqual(self._promotion_notifications().count(), 2)
+
+    def test_promotion_never_exceeds_capacity(self):
+        """Test repeated or overlapping promotion runs only fill the free slots."""
+        from registrations.waitlist import promote_waitlist
+
+        self.assertEqual(promote_waitlist([self.event.pk]), {})
+
+        EventRegistration.objects.filter(pk=self.pending.pk).update(status=EventRegistration.Status.CANCELLED)
+        self.assertEqual(promote_waitlist([self.event.pk], batch_size=1), {self.event.pk: 1})
+        self.assertEqual(promote_waitlist([self.event.pk], batch_size=1), {})
+        self.assertEqual(
+            EventRegistration.objects.filter(event=self.event, status__in=EventRegistration.SLOT_STATUSES).count(), 2
+        )
+
+    def test_periodic_batch_command(self):
+        """Test the command fills raised capacity when automatic promotion is off."""
+        from io import StringIO
+
+        from django.core.management import call_command
+        from django.test import override_settings
+
+        with override_settings(WAITLIST_AUTO_PROMOTE=False), self.captureOnCommitCallbacks() as callbacks:
+            self.confirmed.status = EventRegistration.Status.CANCELLED
+            self.confirmed.save()
+        self.assertEqual(callbacks, [])
+
+        Event.objects.filter(pk=self.event.pk).update(participant_limit=10)
+        out = StringIO()
+        call_command('promote_waitlist', '--batch-size', '2', stdout=out)
+
+        self.assertIn(f"Event {self.event.pk}: promoted 3.", out.getvalue())
+        self.assertFalse(EventRegistration.objects.filter(status=EventRegistration.Status.WAITLISTED).exists())
+
+    def test_new_signup_queues_behind_waitlist_when_slot_frees(self):
+        """Test a freed slot goes to the waitlist, not a newer signup, and counters count slots only."""
+        from django.test import override_settings
+
+        from registrations.forms import RegistrationForm
+        from registrations.waitlist import promote_waitlist
+
+        with override_settings(WAITLIST_AUTO_PROMOTE=False):
+            self.confirmed.status = EventRegistration.Status.CANCELLED
+            self.confirmed.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 1)
+
+        form = RegistrationForm(
+            {
+                'distance_label': '10K', 'phone_number': '0812', 'emergency_contact_name': 'Contact',
+                'emergency_contact_phone': '0813', 'accept_terms': True,
+            },
+            event=self.event,
+            user=User.objects.create_user(username='latecomer'),
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertTrue(form.cleaned_data.get('waitlisted'))
+
+        self.assertEqual(promote_waitlist([self.event.pk]), {self.event.pk: 1})
+        self.assertEqual(self._status(self.first), 'pending')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, 2)
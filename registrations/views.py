@@ -4,6 +4,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import DetailView, FormView, ListView
@@ -12,7 +13,6 @@ from django.views.decorators.csrf import csrf_exempt
 from notifications.models import Notification
 
 from events.models import Event
-from profiles.models import UserProfile
 from .forms import RegistrationForm
 from .models import EventRegistration
 
@@ -103,15 +103,13 @@ class RegistrationDetailView(LoginRequiredMixin, DetailView):
         
         # LOGIKA OTOMATIS: Cari notif unread yang link-nya ada kode VAC ini
         # Kita gunakan mark_read() dari model agar read_at juga terisi
-        unread_notifs = Notification.objects.filter(
+        # Satu UPDATE untuk semua notif, bukan mark_read() per baris.
+        Notification.objects.filter(
             recipient=self.request.user,
             is_read=False,
             link_url__icontains=obj.reference_code
-        )
-        
-        for notif in unread_notifs:
-            notif.mark_read() # Menggunakan method di models.py lo
-            
+        ).update(is_read=True, read_at=timezone.now())
+
         return obj
 
     def get_queryset(self):
@@ -135,8 +133,7 @@ class MyRegistrationsView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
-        context["profile"] = profile
+        context["profile"] = self.request.profile
         return context
 
 
@@ -146,27 +143,28 @@ def my_registrations_json(request):
     registrations = EventRegistration.objects.filter(user=request.user).select_related(
         "event", "category"
     )
-    results = []
-    for registration in registrations:
-        results.append(
-            {
-                "reference": registration.reference_code,
-                "event": registration.event.title,
-                "event_slug": registration.event.slug,
-                "status": registration.status,
-                "status_display": registration.get_status_display(),
-                "category": (
-                    registration.category.display_name
-                    if registration.category
-                    else registration.distance_label
-                ),
-                "created_at": registration.created_at.isoformat(),
-                "url": reverse(
-                    "registrations:detail", kwargs={"reference": registration.reference_code}
-                ),
-            }
-        )
-    return JsonResponse({"results": results})
+    return JsonResponse({"results": [serialize_registration(registration) for registration in registrations]})
+
+
+def serialize_registration(registration):
+    """Registration list payload; expects ``event`` and ``category`` to be selected."""
+
+    return {
+        "reference": registration.reference_code,
+        "event": registration.event.title,
+        "event_slug": registration.event.slug,
+        "status": registration.status,
+        "status_display": registration.get_status_display(),
+        "category": (
+            registration.category.display_name
+            if registration.category
+            else registration.distance_label
+        ),
+        "created_at": registration.created_at.isoformat(),
+        "url": reverse(
+            "registrations:detail", kwargs={"reference": registration.reference_code}
+        ),
+    }
 
 
 @csrf_exempt # Tambahkan ini untuk memudahkan testing API dari mobile
@@ -0,0 +1,120 @@
+"""
+Automatic waitlist promotion.
+
+A slot is held by every pending or confirmed registration
+(``EventRegistration.SLOT_STATUSES``); ``Event.registered_count`` and the
+registration form's capacity check count the same statuses, and the form
+queues new signups behind an existing waitlist. When a slot holder is
+cancelled, rejected or deleted (or someone joins a waitlist),
+``schedule_promotion`` queues ``promote_waitlist`` for after the commit;
+``manage.py promote_waitlist`` runs the same engine as a periodic batch
+(e.g. after raising an event's ``participant_limit``) and when
+``WAITLIST_AUTO_PROMOTE`` is off.
+
+Each batch locks the event row, recounts the taken slots and promotes the
+oldest waitlisted registrations (FIFO by ``created_at``) to pending, so
+concurrent cancellations and promotions for one event queue on the lock
+and never hand out the same slot twice.
+"""
+
+import functools
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from events.models import Event
+from notifications.models import Notification
+from notifications.utils import build_notification, send_notifications
+
+from .models import EventRegistration, refresh_event_counters
+
+Status = EventRegistration.Status
+
+PROMOTION_BATCH_SIZE = 500
+
+PROMOTION_TITLE = "A spot opened up for {event}"
+PROMOTION_MESSAGE = "You've moved off the waitlist. Your registration is now pending confirmation."
+
+
+def schedule_promotion(event_ids) -> None:
+    """Promote waitlisted runners of ``event_ids`` once the current transaction commits."""
+
+    event_ids = sorted(set(event_ids))
+    if event_ids and settings.WAITLIST_AUTO_PROMOTE:
+        transaction.on_commit(functools.partial(promote_waitlist, event_ids))
+
+
+def promote_waitlist(event_ids=None, *, batch_size: int = PROMOTION_BATCH_SIZE) -> dict[int, int]:
+    """
+    Fill free slots of ``event_ids`` (default: every event with a waitlist)
+    from their waitlists. Returns ``{event_id: promoted}`` for events where
+    anyone was promoted.
+    """
+
+    if event_ids is None:
+        event_ids = (
+            EventRegistration.objects.filter(status=Status.WAITLISTED)
+            .values_list("event_id", flat=True)
+            .order_by("event_id")
+            .distinct()
+        )
+    promoted = {}
+    for event_id in sorted(set(event_ids)):
+        total = 0
+        while True:
+            count = _promote_batch(event_id, batch_size)
+            total += count
+            if count < batch_size:
+                break
+        if total:
+            promoted[event_id] = total
+    return promoted
+
+
+def _promote_batch(event_id: int, batch_size: int) -> int:
+    with transaction.atomic():
+        event = (
+            Event.objects.select_for_update()
+            .filter(pk=event_id)
+            .only("pk", "title", "participant_limit")
+            .first()
+        )
+        if event is None:
+            return 0
+        limit = batch_size
+        if event.participant_limit:
+            taken = EventRegistration.objects.filter(
+                event_id=event_id, status__in=EventRegistration.SLOT_STATUSES
+            ).count()
+            limit = min(batch_size, event.participant_limit - taken)
+        if limit <= 0:
+            return 0
+
+        rows = list(
+            EventRegistration.objects.select_for_update(of=("self",))
+            .filter(event_id=event_id, status=Status.WAITLISTED)
+            .select_related("user")
+            .order_by("created_at", "pk")[:limit]
+        )
+        if not rows:
+            return 0
+        EventRegistration.objects.filter(pk__in=[registration.pk for registration in rows]).update(
+            status=Status.PENDING, updated_at=timezone.now()
+        )
+        refresh_event_counters([event_id])
+        send_notifications(
+            [
+                build_notification(
+                    recipient=registration.user,
+                    title=PROMOTION_TITLE.format(event=event.title),
+                    message=PROMOTION_MESSAGE,
+                    category=Notification.Category.REGISTRATION,
+                    url_name="registrations:detail",
+                    url_kwargs={"reference": registration.reference_code},
+                )
+                for registration in rows
+            ],
+            batch_size=batch_size,
+        )
+    return len(rows)
@@ -3,6 +3,36 @@ ASGI config for vacathon project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serving the async JSON APIs
+---------------------------
+
+The read-only JSON endpoints (``events:json``, ``event_detail:detail-json``,
+``event_detail:availability-json``, ``forum:threads-json`` and
+``notifications:inbox-json``) have async twins that use the async ORM.
+They are routed when ``ASYNC_API_VIEWS=true``; without it, every view is
+sync and ASGI would run it in a single shared thread, so keep the flag and
+the server type together::
+
+    pip install "uvicorn[standard]"
+    ASYNC_API_VIEWS=true uvicorn vacathon.asgi:application --workers 4
+
+    # or under gunicorn's process manager
+    ASYNC_API_VIEWS=true gunicorn vacathon.asgi:application \\
+        -k uvicorn.workers.UvicornWorker --workers 4
+
+Every entry in ``MIDDLEWARE`` must be async-capable: Django adapts a
+sync-only middleware onto a thread, and then every request (async views
+included) runs on a thread again. WhiteNoise's middleware is sync-only, so
+static files go through ``core.middleware.StaticFilesMiddleware`` instead;
+``QueryInstrumentationMiddleware`` and ``profiles.middleware.ProfileMiddleware``
+run in both modes. ``core.middleware.sync_only_middleware()`` lists any
+offender (a test keeps it empty).
+
+The WSGI entry point (``vacathon.wsgi``) remains the default and should run
+with ``ASYNC_API_VIEWS`` unset. Compare both paths with
+``python manage.py bench_concurrency``, which sends every request through
+this middleware stack and warns about sync-only entries.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
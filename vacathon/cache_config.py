@@ -0,0 +1,63 @@
+"""
+Build the ``CACHES`` setting from environment variables.
+
+``CACHE_BACKEND`` selects the default cache:
+
+- ``locmem``: per-process memory (development default).
+- ``file``: ``FileBasedCache`` under ``CACHE_LOCATION``, shared by every
+  worker on the host without an external service.
+- ``db``: ``DatabaseCache`` table ``CACHE_LOCATION`` in the default
+  database (run ``manage.py createcachetable`` once), shared by workers
+  using a local SQLite file as well as by hosts sharing PostgreSQL.
+- ``redis``: Django's ``RedisCache`` at ``REDIS_URL`` (needs ``redis``).
+- ``auto``: ``redis`` when ``REDIS_URL`` is set and the client is
+  installed, otherwise ``locmem``.
+
+Every backend shares ``CACHE_KEY_PREFIX`` (namespacing several apps or
+environments on one server) and ``CACHE_VERSION`` (bump it to orphan
+every key after an incompatible deploy).
+"""
+
+import importlib.util
+from pathlib import Path
+
+BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "db": "django.core.cache.backends.db.DatabaseCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+
+
+def redis_available() -> bool:
+    return importlib.util.find_spec("redis") is not None
+
+
+def build_caches(env, base_dir: Path) -> dict:
+    backend = env.get("CACHE_BACKEND", "auto").lower()
+    redis_url = env.get("REDIS_URL", "")
+    if backend == "auto":
+        backend = "redis" if redis_url and redis_available() else "locmem"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown CACHE_BACKEND {backend!r}; expected one of {', '.join(BACKENDS)} or auto.")
+
+    config = {
+        "BACKEND": BACKENDS[backend],
+        "KEY_PREFIX": env.get("CACHE_KEY_PREFIX", "vacathon"),
+        "VERSION": int(env.get("CACHE_VERSION", "1")),
+        "TIMEOUT": int(env.get("CACHE_TIMEOUT", "300")),
+    }
+    if backend == "locmem":
+        config["LOCATION"] = env.get("CACHE_LOCATION", "vacathon")
+        config["OPTIONS"] = {"MAX_ENTRIES": int(env.get("CACHE_MAX_ENTRIES", "10000"))}
+    elif backend == "file":
+        config["LOCATION"] = env.get("CACHE_LOCATION", str(base_dir / ".cache" / "django"))
+        config["OPTIONS"] = {"MAX_ENTRIES": int(env.get("CACHE_MAX_ENTRIES", "10000"))}
+    elif backend == "db":
+        config["LOCATION"] = env.get("CACHE_LOCATION", "vacathon_cache")
+        config["OPTIONS"] = {"MAX_ENTRIES": int(env.get("CACHE_MAX_ENTRIES", "10000"))}
+    else:
+        if not redis_url:
+            raise ValueError("CACHE_BACKEND=redis needs REDIS_URL.")
+        config["LOCATION"] = redis_url
+    return {"default": config}
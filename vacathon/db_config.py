@@ -0,0 +1,158 @@
+"""
+Build the ``DATABASES`` setting from environment variables.
+
+Production (PostgreSQL) reads ``DB_NAME``, ``DB_USER``, ``DB_PASSWORD``,
+``DB_HOST``, ``DB_PORT`` and ``SCHEMA`` as before, plus:
+
+- ``DB_CONN_MAX_AGE``: seconds a worker keeps its connection open between
+  requests (default 60; ``0`` closes after every request).
+- ``DB_CONN_HEALTH_CHECKS``: ping reused connections before a request
+  (default ``true``) so a database restart costs one reconnect, not an error.
+- ``DB_CONNECT_TIMEOUT``: seconds to wait for a new connection (default 5).
+- ``DB_POOL``: ``true`` to use psycopg 3's connection pool instead of
+  persistent connections (needs ``psycopg[pool]``; ``CONN_MAX_AGE`` is
+  forced to 0 as Django requires). ``DB_POOL_MIN_SIZE``,
+  ``DB_POOL_MAX_SIZE`` and ``DB_POOL_TIMEOUT`` size it. ``auto`` enables
+  the pool only when ``psycopg_pool`` is installed.
+
+Development (SQLite) runs every connection through WAL journaling and a
+few pragmas so the dev server, management commands and a second shell can
+write without "database is locked" errors:
+
+- ``SQLITE_JOURNAL_MODE`` (default ``WAL``), ``SQLITE_SYNCHRONOUS``
+  (default ``NORMAL``, safe with WAL), ``SQLITE_BUSY_TIMEOUT`` (seconds
+  a writer waits for the lock, default 5) and ``SQLITE_TRANSACTION_MODE``
+  (default ``IMMEDIATE``: transactions take the write lock up front
+  instead of failing when upgrading from a read).
+- ``DB_CONN_MAX_AGE`` applies too (default 0 for SQLite).
+
+A read replica is added as the ``replica`` alias when ``DB_REPLICA_HOST``
+(production; ``DB_REPLICA_PORT``/``DB_REPLICA_USER``/``DB_REPLICA_PASSWORD``
+default to the primary's) or ``SQLITE_REPLICA_PATH`` (development) is
+set. Test runs always get a second SQLite file as the replica so routing
+can be exercised; see ``core.db_routing``.
+"""
+
+import importlib.util
+from pathlib import Path
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+REPLICA_ALIAS = "replica"
+
+SQLITE_PRAGMAS = {
+    "temp_store": "MEMORY",
+    "cache_size": "-20000",
+    "mmap_size": "134217728",
+}
+
+
+def psycopg_pool_available() -> bool:
+    return (
+        importlib.util.find_spec("psycopg") is not None
+        and importlib.util.find_spec("psycopg_pool") is not None
+    )
+
+
+def _flag(env, name: str, default: str) -> bool:
+    return env.get(name, default).lower() in TRUE_VALUES
+
+
+def build_databases(env, base_dir: Path, *, production: bool, testing: bool = False) -> dict:
+    if production:
+        databases = {"default": _postgresql_config(env)}
+        if env.get("DB_REPLICA_HOST"):
+            databases[REPLICA_ALIAS] = {
+                **_postgresql_config(env),
+                "HOST": env["DB_REPLICA_HOST"],
+                "PORT": env.get("DB_REPLICA_PORT", env.get("DB_PORT")),
+                "USER": env.get("DB_REPLICA_USER", env.get("DB_USER")),
+                "PASSWORD": env.get("DB_REPLICA_PASSWORD", env.get("DB_PASSWORD")),
+                "TEST": {"MIRROR": "default"},
+            }
+        return databases
+
+    databases = {"default": _sqlite_config(env, env.get("SQLITE_PATH", str(base_dir / "db.sqlite3")))}
+    replica_path = env.get("SQLITE_REPLICA_PATH")
+    if replica_path or testing:
+        replica = _sqlite_config(env, replica_path or str(base_dir / "db_replica.sqlite3"))
+        # A file, not the shared in-memory test database, so tests see two stores.
+        replica["TEST"] = {"NAME": str(base_dir / "test_db_replica.sqlite3")}
+        databases[REPLICA_ALIAS] = replica
+    return databases
+
+
+def _postgresql_config(env) -> dict:
+    options = {
+        "options": f"-c search_path={env.get('SCHEMA', 'public')}",
+        "connect_timeout": int(env.get("DB_CONNECT_TIMEOUT", "5")),
+    }
+    conn_max_age = int(env.get("DB_CONN_MAX_AGE", "60"))
+
+    pool = env.get("DB_POOL", "false").lower()
+    if pool == "auto":
+        pool = "true" if psycopg_pool_available() else "false"
+    if pool in TRUE_VALUES:
+        if not psycopg_pool_available():
+            raise ValueError("DB_POOL needs psycopg 3 with the pool extra: pip install 'psycopg[binary,pool]'.")
+        options["pool"] = {
+            "min_size": int(env.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(env.get("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(env.get("DB_POOL_TIMEOUT", "10")),
+        }
+        # Pooled connections are returned to the pool after each request.
+        conn_max_age = 0
+
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": env.get("DB_NAME"),
+        "USER": env.get("DB_USER"),
+        "PASSWORD": env.get("DB_PASSWORD"),
+        "HOST": env.get("DB_HOST"),
+        "PORT": env.get("DB_PORT"),
+        "CONN_MAX_AGE": conn_max_age,
+        "CONN_HEALTH_CHECKS": _flag(env, "DB_CONN_HEALTH_CHECKS", "true"),
+        "OPTIONS": options,
+    }
+
+
+def _sqlite_config(env, path: str) -> dict:
+    pragmas = {
+        "journal_mode": env.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": env.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        **SQLITE_PRAGMAS,
+    }
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": path,
+        "CONN_MAX_AGE": int(env.get("DB_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": _flag(env, "DB_CONN_HEALTH_CHECKS", "false"),
+        "OPTIONS": {
+            "timeout": int(env.get("SQLITE_BUSY_TIMEOUT", "5")),
+            "transaction_mode": env.get("SQLITE_TRANSACTION_MODE", "IMMEDIATE"),
+            "init_command": "".join(f"PRAGMA {name}={value};" for name, value in pragmas.items()),
+        },
+    }
+
+
+def describe_database(alias: str, config: dict) -> str:
+    """One-line summary of the connection settings that actually apply to ``alias``."""
+
+    engine = config["ENGINE"].rsplit(".", 1)[-1]
+    options = config.get("OPTIONS", {})
+    parts = [f"{alias}: {engine}"]
+    pool = options.get("pool")
+    if pool:
+        sizes = pool if isinstance(pool, dict) else {}
+        parts.append(f"pool min={sizes.get('min_size', '?')} max={sizes.get('max_size', '?')}")
+    max_age = config.get("CONN_MAX_AGE", 0)
+    parts.append(f"CONN_MAX_AGE={'persistent' if max_age is None else max_age}")
+    parts.append(f"health_checks={'on' if config.get('CONN_HEALTH_CHECKS') else 'off'}")
+    if engine == "sqlite3":
+        parts.append(f"busy_timeout={options.get('timeout', 5)}s")
+        parts.append(f"transaction_mode={options.get('transaction_mode', 'DEFERRED')}")
+        if options.get("init_command"):
+            parts.append(options["init_command"].replace("PRAGMA ", "").rstrip(";").replace(";", ","))
+    elif "connect_timeout" in options:
+        parts.append(f"connect_timeout={options['connect_timeout']}s")
+    return ", ".join(parts)
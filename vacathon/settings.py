@@ -12,8 +12,12 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 
+from vacathon.cache_config import build_caches
+from vacathon.db_config import build_databases
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -63,15 +67,49 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
+    'core.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'profiles.middleware.ProfileMiddleware',
+    'core.db_routing.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request query count / DB time instrumentation (Server-Timing headers and
+# the admin-only core:query-stats summary). Off unless explicitly enabled.
+QUERY_INSTRUMENTATION = os.getenv('QUERY_INSTRUMENTATION', 'False').lower() == 'true'
+QUERY_INSTRUMENTATION_WINDOW = int(os.getenv('QUERY_INSTRUMENTATION_WINDOW', '200'))
+
+# Seconds the landing-page snapshot (stats, highlight, upcoming events) stays
+# cached; Event writes invalidate it earlier.
+HOME_SNAPSHOT_TTL = int(os.getenv('HOME_SNAPSHOT_TTL', '300'))
+# Seconds anonymous HomeView/AboutView responses (and the shared page bodies
+# shown to signed-in users) stay cached; Event writes invalidate them earlier.
+PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', '600'))
+# Seconds rendered event cards / forum thread rows stay cached. Keys carry the
+# object's version (updated_at, last_activity_at...), so edits never serve stale HTML.
+FRAGMENT_CACHE_TTL = int(os.getenv('FRAGMENT_CACHE_TTL', '3600'))
+# Seconds a cached events catalog page (events:json) is served before one
+# request rebuilds it; Event writes invalidate it earlier.
+CATALOG_CACHE_TTL = int(os.getenv('CATALOG_CACHE_TTL', '60'))
+# Seconds a runner's dashboard summary stays cached; history, registration
+# and event writes invalidate it earlier.
+PROFILE_SUMMARY_TTL = int(os.getenv('PROFILE_SUMMARY_TTL', '300'))
+# BIB numbers each event category is given at a time (see profiles.bibs).
+BIB_RANGE_SIZE = int(os.getenv('BIB_RANGE_SIZE', '1000'))
+# Promote waitlisted runners as soon as a slot frees up. When off, run
+# `manage.py promote_waitlist` periodically instead (see registrations.waitlist).
+WAITLIST_AUTO_PROMOTE = os.getenv('WAITLIST_AUTO_PROMOTE', 'True').lower() == 'true'
+
+# Route the read-only JSON APIs (events, event detail/availability, forum
+# threads, notifications) to their async views. Enable when serving through
+# vacathon.asgi under uvicorn; leave off for WSGI (see vacathon/asgi.py).
+ASYNC_API_VIEWS = os.getenv('ASYNC_API_VIEWS', 'False').lower() == 'true'
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 CSRF_COOKIE_SECURE = PRODUCTION
@@ -105,29 +143,28 @@ WSGI_APPLICATION = 'vacathon.wsgi.application'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 # Database configuration
-if PRODUCTION:
-    # Production: gunakan PostgreSQL dengan kredensial dari environment variables
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.postgresql',
-            'NAME': os.getenv('DB_NAME'),
-            'USER': os.getenv('DB_USER'),
-            'PASSWORD': os.getenv('DB_PASSWORD'),
-            'HOST': os.getenv('DB_HOST'),
-            'PORT': os.getenv('DB_PORT'),
-            'OPTIONS': {
-                'options': f"-c search_path={os.getenv('SCHEMA', 'public')}"
-            }
-        }
-    }
-else:
-    # Development: gunakan SQLite
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
-        }
-    }
+# Production: PostgreSQL from DB_* environment variables with persistent
+# connections (or a psycopg pool); development: SQLite in WAL mode. See
+# vacathon/db_config.py for every knob; `manage.py check --deploy` reports
+# the effective settings.
+TESTING = sys.argv[1:2] == ['test']
+DATABASES = build_databases(os.environ, BASE_DIR, production=PRODUCTION, testing=TESTING)
+
+# Read-only catalog/forum APIs read from the replica when one is configured
+# (DB_REPLICA_HOST / SQLITE_REPLICA_PATH). After a write, the client reads
+# from the primary for REPLICA_PIN_SECONDS. Tests enable routing explicitly.
+DATABASE_ROUTERS = ['core.db_routing.ReadReplicaRouter']
+READ_REPLICA_ALIAS = 'replica' if 'replica' in DATABASES and not TESTING else None
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '10'))
+
+
+# Cache
+# Backend, key prefix and version come from the environment; see
+# vacathon/cache_config.py (CACHE_BACKEND=locmem|file|db|redis|auto).
+CACHES = build_caches(os.environ, BASE_DIR)
+
+# Tests run with empty caches each; see core/test_runner.py.
+TEST_RUNNER = 'core.test_runner.CacheIsolatingRunner'
 
 
 # Password validation